@@ -17,6 +17,7 @@ except ImportError:
     __version__ = version("slash-command-manager")
 
 from .config import config
+from .prompt_cache import PromptCache
 from .prompts_loader import register_prompts
 
 
@@ -34,7 +35,8 @@ def create_app() -> FastMCP:
         return PlainTextResponse("OK")
 
     # Load prompts from the prompts directory and register them
-    register_prompts(mcp, config.prompts_dir)
+    cache = PromptCache(config.prompt_cache_dir) if config.prompt_cache_enabled else None
+    register_prompts(mcp, config.prompts_dir, cache=cache, discovery=config.prompt_discovery)
 
     @mcp.tool(name="basic-example", description="Return a static message for testing.")
     def basic_example_tool() -> str:
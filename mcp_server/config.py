@@ -2,6 +2,7 @@
 
 Provides testable defaults with environment variable overrides for:
 - Workspace paths
+- Prompt discovery and cache location
 - Transport options (STDIO/HTTP)
 - Logging configuration
 """
@@ -11,6 +12,9 @@ import os
 from pathlib import Path
 from typing import Literal
 
+from .prompt_cache import default_cache_dir
+from .prompt_discovery import DEFAULT_INCLUDE, DiscoveryOptions
+
 TransportType = Literal["stdio", "http"]
 
 
@@ -38,6 +42,13 @@ def _get_default_prompts_dir() -> Path:
     return Path(__file__).parent / "prompts"
 
 
+def _split_patterns(value: str | None) -> tuple[str, ...]:
+    """Split a comma-separated pattern list, dropping empty items."""
+    if not value:
+        return ()
+    return tuple(pattern.strip() for pattern in value.split(",") if pattern.strip())
+
+
 class Config:
     """Runtime configuration with environment overrides."""
 
@@ -49,6 +60,27 @@ class Config:
             os.getenv("SDD_PROMPTS_DIR", str(_get_default_prompts_dir()))
         ).resolve()
 
+        # Prompt discovery
+        max_depth_str = os.getenv("SDD_PROMPTS_MAX_DEPTH")
+        try:
+            max_depth = int(max_depth_str) if max_depth_str else None
+            self.prompt_discovery = DiscoveryOptions(
+                recursive=os.getenv("SDD_PROMPTS_RECURSIVE", "false").lower() == "true",
+                include=_split_patterns(os.getenv("SDD_PROMPTS_INCLUDE")) or DEFAULT_INCLUDE,
+                exclude=_split_patterns(os.getenv("SDD_PROMPTS_EXCLUDE")),
+                max_depth=max_depth,
+            )
+        except ValueError as exc:
+            raise ValueError(
+                f"Invalid SDD_PROMPTS_MAX_DEPTH value '{max_depth_str}': {exc}"
+            ) from exc
+
+        # Parsed-prompt cache
+        self.prompt_cache_enabled = os.getenv("SDD_PROMPT_CACHE", "true").lower() == "true"
+        self.prompt_cache_dir = Path(
+            os.getenv("SDD_PROMPT_CACHE_DIR", str(default_cache_dir()))
+        ).expanduser()
+
         # Transport configuration
         self.transport: TransportType = os.getenv("SDD_TRANSPORT", "stdio")  # type: ignore
         self.http_host = os.getenv("SDD_HTTP_HOST", "0.0.0.0")
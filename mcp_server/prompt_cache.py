@@ -0,0 +1,297 @@
+"""Persistent cache of parsed Markdown prompts.
+
+Parsing a prompt means reading the file, loading its YAML frontmatter and
+normalizing arguments and tags. For large catalogs most files are unchanged
+between runs, so the parsed :class:`MarkdownPrompt` records are kept on disk
+and reused.
+
+Records are addressed by the SHA-256 of the file content plus the file name
+(the name is the fallback prompt name) and whether the record is a
+:class:`LazyMarkdownPrompt`, which stores the body offset instead of the body. A per-path index remembers the size,
+mtime and digest last seen for each file so unchanged files are served
+without being read at all; a changed mtime with identical content is still
+a hit after re-hashing.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+import threading
+from dataclasses import dataclass, replace
+from pathlib import Path
+
+from .prompt_utils import (
+    LazyMarkdownPrompt,
+    MarkdownPrompt,
+    decode_prompt_bytes,
+    lazy_prompt_from_head,
+    prompt_from_content,
+)
+
+# Bump whenever MarkdownPrompt or the on-disk layout changes shape
+CACHE_FORMAT_VERSION = 5
+
+logger = logging.getLogger(__name__)
+
+CACHE_FILENAME = "prompts.pickle"
+DEFAULT_MAX_ENTRIES = 10_000
+
+
+def default_cache_dir() -> Path:
+    """Return the slash-man cache directory.
+
+    ``SLASH_MAN_CACHE_DIR`` takes precedence, then ``$XDG_CACHE_HOME/slash-man``,
+    then ``~/.cache/slash-man``.
+    """
+    override = os.getenv("SLASH_MAN_CACHE_DIR")
+    if override:
+        return Path(override).expanduser()
+
+    xdg_cache = os.getenv("XDG_CACHE_HOME")
+    base = Path(xdg_cache).expanduser() if xdg_cache else Path.home() / ".cache"
+    return base / "slash-man"
+
+
+@dataclass(frozen=True)
+class PromptCacheStats:
+    """Counters describing cache effectiveness for one cache instance."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+
+@dataclass(frozen=True)
+class _StatEntry:
+    size: int
+    mtime_ns: int
+    digest: str
+
+
+_RecordKey = tuple[str, str, bool]
+
+
+class PromptCache:
+    """On-disk cache of parsed prompts with LRU eviction.
+
+    The cache is loaded lazily on first use and written back by :meth:`save`.
+    A missing, corrupt or outdated cache file is treated as empty.
+    """
+
+    def __init__(self, cache_dir: Path, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding the cache file
+            max_entries: Maximum number of parsed prompts to keep
+        """
+        if max_entries < 1:
+            raise ValueError(f"max_entries must be at least 1, got {max_entries}")
+
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self._index: dict[str, _StatEntry] = {}
+        # Insertion-ordered, least recently used first
+        self._records: dict[_RecordKey, MarkdownPrompt | LazyMarkdownPrompt] = {}
+        # Derived from the two above so eviction only touches the evicted digest
+        self._digest_records: dict[str, int] = {}
+        self._digest_paths: dict[str, set[str]] = {}
+        self._loaded = False
+        self._dirty = False
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    @property
+    def path(self) -> Path:
+        return self.cache_dir / CACHE_FILENAME
+
+    @property
+    def stats(self) -> PromptCacheStats:
+        return PromptCacheStats(hits=self._hits, misses=self._misses, evictions=self._evictions)
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._ensure_loaded()
+            return len(self._records)
+
+    def load(self, path: Path) -> MarkdownPrompt:
+        """Return the parsed prompt for ``path``, parsing it only on a cache miss.
+
+        Safe to call from several threads; reading and parsing happen outside the lock.
+
+        Raises:
+            FileNotFoundError: If the prompt file does not exist
+        """
+        return self._load(path, lazy=False)
+
+    def load_lazy(self, path: Path) -> LazyMarkdownPrompt:
+        """Like :meth:`load`, but return a prompt that reads its body on first access.
+
+        Raises:
+            FileNotFoundError: If the prompt file does not exist
+        """
+        return self._load(path, lazy=True)
+
+    def _load(self, path: Path, lazy: bool) -> MarkdownPrompt | LazyMarkdownPrompt:
+        """Shared lookup for :meth:`load` and :meth:`load_lazy`."""
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Prompt file does not exist: {path}") from None
+
+        path_key = str(path)
+        with self._lock:
+            self._ensure_loaded()
+            entry = self._index.get(path_key)
+            if (
+                entry is not None
+                and entry.size == stat.st_size
+                and entry.mtime_ns == stat.st_mtime_ns
+            ):
+                key = (entry.digest, path.name, lazy)
+                if key in self._records:
+                    return self._hit(key, path, stat)
+
+        data = path.read_bytes()
+        digest = hashlib.sha256(data).hexdigest()
+
+        with self._lock:
+            self._set_index(path_key, _StatEntry(stat.st_size, stat.st_mtime_ns, digest))
+            self._dirty = True
+            key = (digest, path.name, lazy)
+            if key in self._records:
+                return self._hit(key, path, stat)
+
+        if lazy:
+            prompt = lazy_prompt_from_head(path, data, stat.st_size, stat.st_mtime_ns)
+        else:
+            prompt = prompt_from_content(path, decode_prompt_bytes(data))
+
+        with self._lock:
+            self._misses += 1
+            if key not in self._records:
+                self._digest_records[digest] = self._digest_records.get(digest, 0) + 1
+            self._records.pop(key, None)
+            self._records[key] = prompt
+            self._evict()
+        return prompt
+
+    def save(self) -> None:
+        """Persist the cache if it changed since it was loaded.
+
+        The cache only saves work, so a cache directory that cannot be written is
+        logged as a warning rather than raised.
+        """
+        with self._lock:
+            if not self._loaded or not self._dirty:
+                return
+            payload = {
+                "version": CACHE_FORMAT_VERSION,
+                "index": dict(self._index),
+                "records": dict(self._records),
+            }
+
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # Write to a sibling temp file and rename so readers never see a partial cache
+            fd, tmp_name = tempfile.mkstemp(dir=self.cache_dir, prefix=".prompts-", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as handle:
+                    pickle.dump(payload, handle, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_name, self.path)
+            except BaseException:
+                Path(tmp_name).unlink(missing_ok=True)
+                raise
+        except OSError as e:
+            logger.warning("Could not save the prompt cache in %s: %s", self.cache_dir, e)
+            return
+        self._dirty = False
+
+    def clear(self) -> None:
+        """Drop all cached prompts, in memory and on disk."""
+        with self._lock:
+            self._index.clear()
+            self._records.clear()
+            self._digest_records.clear()
+            self._digest_paths.clear()
+            self._loaded = True
+            self._dirty = False
+        self.path.unlink(missing_ok=True)
+
+    def _hit(
+        self, key: _RecordKey, path: Path, stat: os.stat_result
+    ) -> MarkdownPrompt | LazyMarkdownPrompt:
+        self._hits += 1
+        # Re-insert to keep the dict in least-recently-used order. Recency is
+        # persisted with the next real change; an all-hit run stays read-only
+        prompt = self._records.pop(key)
+        self._records[key] = prompt
+        if isinstance(prompt, LazyMarkdownPrompt) and (
+            prompt.path != path
+            or prompt.size != stat.st_size
+            or prompt.mtime_ns != stat.st_mtime_ns
+        ):
+            # The body is read from this file later, so point the prompt at it
+            return replace(prompt, path=path, size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+        if prompt.path != path:
+            # Same content under the same file name in another location
+            return replace(prompt, path=path)
+        return prompt
+
+    def _set_index(self, path_key: str, entry: _StatEntry) -> None:
+        previous = self._index.get(path_key)
+        if previous is not None:
+            paths = self._digest_paths[previous.digest]
+            paths.discard(path_key)
+            if not paths:
+                del self._digest_paths[previous.digest]
+        self._index[path_key] = entry
+        self._digest_paths.setdefault(entry.digest, set()).add(path_key)
+
+    def _evict(self) -> None:
+        while len(self._records) > self.max_entries:
+            digest, _name, _lazy = oldest = next(iter(self._records))
+            del self._records[oldest]
+            self._evictions += 1
+
+            self._digest_records[digest] -= 1
+            if self._digest_records[digest]:
+                continue
+            # No record left for this content, so its paths cannot be served from the index
+            del self._digest_records[digest]
+            for path_key in self._digest_paths.pop(digest, ()):
+                del self._index[path_key]
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+
+        try:
+            with self.path.open("rb") as handle:
+                payload = pickle.load(handle)
+        except FileNotFoundError:
+            return
+        except Exception:  # noqa: BLE001 - a damaged cache is simply rebuilt
+            self._dirty = True
+            return
+
+        if not isinstance(payload, dict) or payload.get("version") != CACHE_FORMAT_VERSION:
+            self._dirty = True
+            return
+
+        self._index = payload["index"]
+        self._records = payload["records"]
+        for digest, _name, _lazy in self._records:
+            self._digest_records[digest] = self._digest_records.get(digest, 0) + 1
+        for path_key, entry in self._index.items():
+            self._digest_paths.setdefault(entry.digest, set()).add(path_key)
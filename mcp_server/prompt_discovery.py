@@ -0,0 +1,114 @@
+"""Prompt file discovery shared by the MCP server and the slash command generator.
+
+Directories are walked with :func:`os.scandir`, so the file/directory checks use
+the type information returned by the directory listing instead of a ``stat``
+per entry. Entries are visited in name order, files of a directory before its
+subdirectories, which makes the result independent of filesystem order.
+
+Patterns use :mod:`fnmatch` syntax and are case-sensitive. A pattern without a
+``/`` is matched against the entry name; a pattern containing ``/`` is matched
+against the path relative to the root (``team-a/*.md``). Exclude patterns apply
+to both files and directories, and an excluded directory is not entered.
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import os
+import re
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+DEFAULT_INCLUDE = ("*.md",)
+
+
+@dataclass(frozen=True)
+class DiscoveryOptions:
+    """How to find prompt files below a prompts directory.
+
+    Attributes:
+        recursive: Descend into subdirectories
+        include: Patterns a file must match (any of them) to be discovered
+        exclude: Patterns that remove matching files and whole directories
+        max_depth: Deepest subdirectory level to enter when recursive
+            (0 is the root only); None means unlimited
+    """
+
+    recursive: bool = False
+    include: tuple[str, ...] = DEFAULT_INCLUDE
+    exclude: tuple[str, ...] = ()
+    max_depth: int | None = None
+
+    def __post_init__(self) -> None:
+        if self.max_depth is not None and self.max_depth < 0:
+            raise ValueError(f"max_depth must be at least 0, got {self.max_depth}")
+
+
+class _PatternSet:
+    """A group of fnmatch patterns compiled into one regex per match target."""
+
+    def __init__(self, patterns: tuple[str, ...]):
+        name_patterns = [pattern for pattern in patterns if "/" not in pattern]
+        path_patterns = [pattern.strip("/") for pattern in patterns if "/" in pattern]
+        self._name = _compile(name_patterns)
+        self._path = _compile(path_patterns)
+
+    def matches(self, name: str, relative_path: str) -> bool:
+        return bool(
+            (self._name is not None and self._name.match(name))
+            or (self._path is not None and self._path.match(relative_path))
+        )
+
+
+def _compile(patterns: list[str]) -> re.Pattern[str] | None:
+    if not patterns:
+        return None
+    return re.compile("|".join(f"(?:{fnmatch.translate(pattern)})" for pattern in patterns))
+
+
+def iter_prompt_files(root: Path, options: DiscoveryOptions | None = None) -> Iterator[Path]:
+    """Yield prompt files below ``root`` in a stable order.
+
+    Symlinks to files are followed; symlinked directories are not entered.
+
+    Args:
+        root: Prompts directory to search
+        options: Discovery options; defaults to the flat ``*.md`` search
+
+    Yields:
+        Paths of matching files, as ``root / <relative path>``
+    """
+    options = options or DiscoveryOptions()
+    include = _PatternSet(options.include)
+    exclude = _PatternSet(options.exclude) if options.exclude else None
+    max_depth = options.max_depth if options.recursive else 0
+
+    yield from _walk(root, "", 0, include, exclude, max_depth)
+
+
+def _walk(
+    directory: Path | str,
+    prefix: str,
+    depth: int,
+    include: _PatternSet,
+    exclude: _PatternSet | None,
+    max_depth: int | None,
+) -> Iterator[Path]:
+    with os.scandir(directory) as scanner:
+        entries = sorted(scanner, key=lambda entry: entry.name)
+
+    descend = max_depth is None or depth < max_depth
+    subdirectories: list[tuple[str, str]] = []
+    for entry in entries:
+        relative_path = prefix + entry.name
+        if exclude is not None and exclude.matches(entry.name, relative_path):
+            continue
+        if entry.is_file():
+            if include.matches(entry.name, relative_path):
+                yield Path(entry.path)
+        elif descend and entry.is_dir(follow_symlinks=False):
+            subdirectories.append((entry.path, relative_path + "/"))
+
+    for path, relative_prefix in subdirectories:
+        yield from _walk(path, relative_prefix, depth + 1, include, exclude, max_depth)
@@ -1,31 +1,68 @@
 from __future__ import annotations
 
-from collections.abc import Iterable
-from dataclasses import dataclass
+import os
+import re
+import sys
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field, fields
 from pathlib import Path
-from typing import Any
+from types import MappingProxyType
+from typing import IO, Any
 
-import yaml
+from mcp_server import yaml_backend
 
+# Prompts are slotted and tags/argument names are interned: a server may hold
+# many thousands of prompts that mostly share the same small vocabulary.
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class PromptArgumentSpec:
     name: str
     description: str | None
     required: bool
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
+class AgentOverride:
+    """A prompt's description, arguments and enabled flag with one agent's overrides applied."""
+
+    description: str | None
+    arguments: tuple[PromptArgumentSpec, ...]
+    enabled: bool
+
+
+_NO_OVERRIDES: Mapping[str, AgentOverride] = MappingProxyType({})
+
+
+@dataclass(frozen=True, slots=True)
 class MarkdownPrompt:
+    """A parsed prompt file.
+
+    ``resolved_overrides`` is derived from ``agent_overrides`` when the prompt is
+    created (see :func:`resolve_agent_overrides`) and is not pickled.
+    """
+
     path: Path
     name: str
     description: str | None
-    tags: set[str] | None
+    tags: frozenset[str] | None
     meta: dict[str, Any] | None
     enabled: bool
     arguments: list[PromptArgumentSpec]
     body: str
     agent_overrides: dict[str, Any] | None = None
+    resolved_overrides: Mapping[str, AgentOverride] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        _set_resolved_overrides(self)
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {f.name: getattr(self, f.name) for f in fields(self) if f.init}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+        _set_resolved_overrides(self)
 
     def decorator_kwargs(self) -> dict[str, Any]:
         kwargs: dict[str, Any] = {"name": self.name}
@@ -40,13 +77,221 @@ class MarkdownPrompt:
         return kwargs
 
 
+@dataclass(frozen=True, slots=True)
+class LazyMarkdownPrompt:
+    """A prompt whose body stays on disk until it is first needed.
+
+    Only the frontmatter is parsed at load time; ``body_offset`` is the byte offset
+    where the body starts in the file. The body is read and memoized on first
+    access. If the file changed since it was loaded (size or mtime differ) the
+    whole file is parsed again so the body never mixes two versions.
+    """
+
+    path: Path
+    name: str
+    description: str | None
+    tags: frozenset[str] | None
+    meta: dict[str, Any] | None
+    enabled: bool
+    arguments: list[PromptArgumentSpec]
+    agent_overrides: dict[str, Any] | None
+    body_offset: int
+    has_frontmatter: bool
+    size: int
+    mtime_ns: int
+    resolved_overrides: Mapping[str, AgentOverride] = field(init=False, repr=False, compare=False)
+    _body: str | None = field(default=None, init=False, repr=False, compare=False)
+
+    decorator_kwargs = MarkdownPrompt.decorator_kwargs
+
+    def __post_init__(self) -> None:
+        _set_resolved_overrides(self)
+
+    @property
+    def body(self) -> str:
+        body = self._body
+        if body is None:
+            body = self._read_body()
+            object.__setattr__(self, "_body", body)
+        return body
+
+    def materialize(self) -> MarkdownPrompt:
+        """Return an eager :class:`MarkdownPrompt` with the same fields."""
+        return MarkdownPrompt(
+            path=self.path,
+            name=self.name,
+            description=self.description,
+            tags=self.tags,
+            meta=self.meta,
+            enabled=self.enabled,
+            arguments=self.arguments,
+            body=self.body,
+            agent_overrides=self.agent_overrides,
+        )
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Never persist a memoized body (or derived fields) alongside the metadata
+        return {f.name: getattr(self, f.name) for f in fields(self) if f.init}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+        object.__setattr__(self, "_body", None)
+        _set_resolved_overrides(self)
+
+    def _read_body(self) -> str:
+        with self.path.open("rb") as handle:
+            stat = os.fstat(handle.fileno())
+            if stat.st_size != self.size or stat.st_mtime_ns != self.mtime_ns:
+                return parse_frontmatter(decode_prompt_bytes(handle.read()))[1]
+            handle.seek(self.body_offset)
+            content = decode_prompt_bytes(handle.read())
+
+        if not self.has_frontmatter:
+            return content
+        return _trim_body(content, 0)
+
+
+def resolve_agent_overrides(
+    agent_overrides: Any,
+    description: str | None,
+    arguments: Iterable[PromptArgumentSpec],
+    enabled: bool,
+) -> Mapping[str, AgentOverride]:
+    """Apply each agent's ``agent_overrides`` entry to the prompt's own values.
+
+    Override arguments replace base arguments of the same name, keeping the base
+    order, and new names are appended. Entries that are not mappings, and argument
+    entries that are not mappings or have no name, are ignored.
+
+    Returns:
+        A read-only table with one entry per agent key that has overrides
+    """
+    if not isinstance(agent_overrides, dict) or not agent_overrides:
+        return _NO_OVERRIDES
+
+    table: dict[str, AgentOverride] = {}
+    for agent_key, overrides in agent_overrides.items():
+        if not isinstance(overrides, dict):
+            continue
+        merged = list(arguments)
+        if "arguments" in overrides:
+            index_by_name = {arg.name: i for i, arg in enumerate(merged)}
+            for override in _override_arguments(overrides["arguments"]):
+                if override.name in index_by_name:
+                    merged[index_by_name[override.name]] = override
+                else:
+                    index_by_name[override.name] = len(merged)
+                    merged.append(override)
+        table[agent_key] = AgentOverride(
+            description=overrides.get("description", description),
+            arguments=tuple(merged),
+            enabled=overrides.get("enabled", enabled),
+        )
+    return MappingProxyType(table)
+
+
+def _override_arguments(raw: Any) -> list[PromptArgumentSpec]:
+    if not isinstance(raw, list):
+        return []
+    return [
+        PromptArgumentSpec(
+            name=entry["name"],
+            description=entry.get("description"),
+            required=entry.get("required", True),
+        )
+        for entry in raw
+        if isinstance(entry, dict) and entry.get("name")
+    ]
+
+
+def _set_resolved_overrides(prompt: MarkdownPrompt | LazyMarkdownPrompt) -> None:
+    resolved = resolve_agent_overrides(
+        prompt.agent_overrides, prompt.description, prompt.arguments, prompt.enabled
+    )
+    object.__setattr__(prompt, "resolved_overrides", resolved)
+
+
 def load_markdown_prompt(path: Path) -> MarkdownPrompt:
     if not path.exists():
         raise FileNotFoundError(f"Prompt file does not exist: {path}")
 
-    content = path.read_text(encoding="utf-8")
+    return prompt_from_content(path, path.read_text(encoding="utf-8"))
+
+
+def load_lazy_markdown_prompt(path: Path) -> LazyMarkdownPrompt:
+    """Parse only the frontmatter of ``path``, leaving the body on disk."""
+    if not path.exists():
+        raise FileNotFoundError(f"Prompt file does not exist: {path}")
+
+    with path.open("rb") as handle:
+        stat = os.fstat(handle.fileno())
+        head = _read_frontmatter_head(handle)
+    return lazy_prompt_from_head(path, head, stat.st_size, stat.st_mtime_ns)
+
+
+def prompt_from_content(path: Path, content: str) -> MarkdownPrompt:
+    """Build a prompt from already-read file content.
+
+    ``path`` is only used for the name fallback and is stored on the prompt;
+    it is not read again.
+    """
     frontmatter, body = parse_frontmatter(content)
+    return MarkdownPrompt(**_prompt_fields(path, frontmatter), body=body)
+
+
+def lazy_prompt_from_head(path: Path, head: bytes, size: int, mtime_ns: int) -> LazyMarkdownPrompt:
+    """Build a lazy prompt from the leading bytes of a file.
+
+    ``head`` must contain at least the complete frontmatter block; ``size`` and
+    ``mtime_ns`` describe the file it was read from.
+    """
+    span = scan_frontmatter(head)
+    if span is None:
+        frontmatter: dict[str, Any] = {}
+        body_offset = 0
+    else:
+        frontmatter = _load_frontmatter_yaml(
+            decode_prompt_bytes(head[span.yaml_start : span.yaml_end])
+        )
+        body_offset = span.body_start
+
+    return LazyMarkdownPrompt(
+        **_prompt_fields(path, frontmatter),
+        body_offset=body_offset,
+        has_frontmatter=span is not None,
+        size=size,
+        mtime_ns=mtime_ns,
+    )
+
+
+def decode_prompt_bytes(data: bytes) -> str:
+    """Decode prompt file bytes exactly like ``Path.read_text(encoding="utf-8")``."""
+    text = data.decode("utf-8")
+    if "\r" in text:
+        # Universal newlines, as text-mode reads apply them
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
 
+_HEAD_CHUNK_SIZE = 64 * 1024
+
+
+def _read_frontmatter_head(handle: IO[bytes]) -> bytes:
+    """Read from ``handle`` until the frontmatter block is complete (or EOF)."""
+    head = handle.read(_HEAD_CHUNK_SIZE)
+    while head.startswith(b"---"):
+        span = scan_frontmatter(head)
+        if span is not None and span.body_start < len(head):
+            break
+        chunk = handle.read(_HEAD_CHUNK_SIZE)
+        if not chunk:
+            break
+        head += chunk
+    return head
+
+
+def _prompt_fields(path: Path, frontmatter: dict[str, Any]) -> dict[str, Any]:
     name = frontmatter.get("name") or path.stem
     description = frontmatter.get("description")
     tags = _ensure_tag_set(frontmatter.get("tags"))
@@ -72,34 +317,101 @@ def load_markdown_prompt(path: Path) -> MarkdownPrompt:
     arguments = normalize_arguments(frontmatter.get("arguments"))
     agent_overrides = frontmatter.get("agent_overrides")
 
-    return MarkdownPrompt(
-        path=path,
-        name=name,
-        description=description,
-        tags=tags,
-        meta=meta,
-        enabled=bool(enabled),
-        arguments=arguments,
-        body=body,
-        agent_overrides=agent_overrides,
-    )
+    return {
+        "path": path,
+        "name": name,
+        "description": description,
+        "tags": tags,
+        "meta": meta,
+        "enabled": bool(enabled),
+        "arguments": arguments,
+        "agent_overrides": agent_overrides,
+    }
+
+
+_LEADING_WHITESPACE = re.compile(r"\s*")
+
+
+@dataclass(frozen=True)
+class FrontmatterSpan:
+    """Offsets of a frontmatter block, valid for the string or bytes that was scanned.
+
+    ``content[yaml_start:yaml_end]`` is the YAML text and ``content[body_start:]``
+    is everything after the closing delimiter line.
+    """
+
+    yaml_start: int
+    yaml_end: int
+    body_start: int
+
+
+def scan_frontmatter(content: str | bytes) -> FrontmatterSpan | None:
+    """Locate the frontmatter delimiters without copying the document.
+
+    The opening delimiter must be the first line and the closing delimiter is the
+    next line consisting solely of ``---``; both may carry trailing whitespace or
+    CRLF endings. ``---`` anywhere else (inside a value, an indented block scalar
+    or a longer ``-----`` rule) is not a delimiter.
+
+    Returns:
+        The delimiter offsets, or None if the content has no complete frontmatter block
+    """
+    if isinstance(content, str):
+        newline, delimiter, trailing = "\n", "---", " \t\r"
+    else:
+        newline, delimiter, trailing = b"\n", b"---", b" \t\r"
+
+    if not content.startswith(delimiter):
+        return None
+
+    opening_end = content.find(newline)
+    if opening_end == -1 or content[len(delimiter) : opening_end].strip(trailing):
+        return None
+
+    closing_marker = newline + delimiter
+    search_from = opening_end
+    while True:
+        marker = content.find(closing_marker, search_from)
+        if marker == -1:
+            return None
+
+        line_start = marker + 1
+        line_end = content.find(newline, line_start + len(delimiter))
+        if line_end == -1:
+            line_end = len(content)
+
+        if not content[line_start + len(delimiter) : line_end].strip(trailing):
+            return FrontmatterSpan(
+                yaml_start=opening_end + 1,
+                yaml_end=line_start,
+                body_start=min(line_end + 1, len(content)),
+            )
+        search_from = line_start
 
 
 def parse_frontmatter(content: str) -> tuple[dict[str, Any], str]:
-    if not content.startswith("---"):
+    span = scan_frontmatter(content)
+    if span is None:
         return {}, content
 
-    parts = content.split("---", 2)
-    if len(parts) < 3:
-        return {}, content
+    frontmatter = _load_frontmatter_yaml(content[span.yaml_start : span.yaml_end])
+    return frontmatter, _trim_body(content, span.body_start)
+
 
+def _load_frontmatter_yaml(text: str) -> dict[str, Any]:
     try:
-        frontmatter = yaml.safe_load(parts[1]) or {}
-    except yaml.YAMLError:
-        frontmatter = {}
+        return yaml_backend.safe_load(text) or {}
+    except yaml_backend.YAMLError:
+        return {}
 
-    body = parts[2].strip()
-    return frontmatter, body
+
+def _trim_body(content: str, start: int) -> str:
+    # Trim by offsets so the body is copied exactly once
+    start = _LEADING_WHITESPACE.match(content, start).end()
+    end = len(content)
+    while end > start and content[end - 1].isspace():
+        end -= 1
+    return content[start:end]
 
 
 def normalize_arguments(raw: Any) -> list[PromptArgumentSpec]:
@@ -112,7 +424,9 @@ def normalize_arguments(raw: Any) -> list[PromptArgumentSpec]:
     normalized: list[PromptArgumentSpec] = []
     for entry in raw:
         if isinstance(entry, str):
-            normalized.append(PromptArgumentSpec(name=entry, description=None, required=True))
+            normalized.append(
+                PromptArgumentSpec(name=sys.intern(entry), description=None, required=True)
+            )
             continue
 
         if not isinstance(entry, dict):
@@ -124,7 +438,7 @@ def normalize_arguments(raw: Any) -> list[PromptArgumentSpec]:
 
         normalized.append(
             PromptArgumentSpec(
-                name=name,
+                name=sys.intern(name),
                 description=entry.get("description"),
                 required=entry.get("required", True),
             )
@@ -133,12 +447,12 @@ def normalize_arguments(raw: Any) -> list[PromptArgumentSpec]:
     return normalized
 
 
-def _ensure_tag_set(raw: Any) -> set[str] | None:
+def _ensure_tag_set(raw: Any) -> frozenset[str] | None:
     if raw is None:
         return None
 
     if isinstance(raw, Iterable) and not isinstance(raw, str | bytes):
-        tags = {str(tag) for tag in raw}
+        tags = frozenset(sys.intern(str(tag)) for tag in raw)
         return tags or None
 
-    return {str(raw)}
+    return frozenset((sys.intern(str(raw)),))
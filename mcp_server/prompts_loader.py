@@ -1,17 +1,25 @@
 from __future__ import annotations
 
+import logging
 from pathlib import Path
 
 from fastmcp import FastMCP
 
-from .prompt_utils import MarkdownPrompt, load_markdown_prompt
+from .prompt_cache import PromptCache
+from .prompt_discovery import DiscoveryOptions, iter_prompt_files
+from .prompt_utils import LazyMarkdownPrompt, MarkdownPrompt, load_lazy_markdown_prompt
 
+logger = logging.getLogger(__name__)
 
-def _load_prompt(prompts_dir: Path, filename: str) -> MarkdownPrompt:
-    return load_markdown_prompt(prompts_dir / filename)
 
+def _load_prompt(prompt_file: Path, cache: PromptCache | None = None) -> LazyMarkdownPrompt:
+    # Listing prompts only needs the metadata; bodies are read when a prompt is used
+    if cache is not None:
+        return cache.load_lazy(prompt_file)
+    return load_lazy_markdown_prompt(prompt_file)
 
-def _register_prompt(mcp: FastMCP, prompt: MarkdownPrompt) -> None:
+
+def _register_prompt(mcp: FastMCP, prompt: MarkdownPrompt | LazyMarkdownPrompt) -> None:
     # See https://gofastmcp.com/servers/prompts#the-%40prompt-decorator
     @mcp.prompt(**prompt.decorator_kwargs())
     def prompt_handler() -> str:
@@ -20,17 +28,21 @@ def _register_prompt(mcp: FastMCP, prompt: MarkdownPrompt) -> None:
     prompt_handler.__name__ = f"{prompt.name}_prompt"
 
 
-def register_prompts(mcp: FastMCP, prompts_dir: Path) -> None:
+def register_prompts(
+    mcp: FastMCP,
+    prompts_dir: Path,
+    cache: PromptCache | None = None,
+    discovery: DiscoveryOptions | None = None,
+) -> None:
     if not prompts_dir.exists():
         raise ValueError(f"Prompts directory does not exist: {prompts_dir}")
 
-    # Get all of the prompt files
-    prompt_files = sorted(
-        (f for f in prompts_dir.iterdir() if f.is_file() and f.suffix == ".md"),
-        key=lambda file_path: file_path.name,
-    )
-
-    # Load and register each prompt
-    for prompt_file in prompt_files:
-        prompt_info = _load_prompt(prompts_dir, prompt_file.name)
+    # Load and register each prompt as it is discovered
+    for prompt_file in iter_prompt_files(prompts_dir, discovery):
+        prompt_info = _load_prompt(prompt_file, cache)
         _register_prompt(mcp, prompt_info)
+
+    if cache is not None:
+        cache.save()
+        stats = cache.stats
+        logger.info("Prompt cache: %d hit(s), %d miss(es)", stats.hits, stats.misses)
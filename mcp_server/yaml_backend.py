@@ -0,0 +1,70 @@
+"""YAML backend selection for the frontmatter hot paths.
+
+PyYAML ships optional libyaml bindings (``CSafeLoader``/``CSafeDumper``) that are
+several times faster than the pure-Python classes. They are used whenever PyYAML
+was built with them, and the pure-Python classes are used otherwise.
+
+libyaml accepts tabs as separators in places the pure-Python scanner rejects
+(``key:\tvalue``, ``[1,\t2]``, a tab before a comment), so :func:`safe_load`
+parses documents containing a tab with the pure-Python loader; everything else
+loads to identical Python objects with either backend. The libyaml emitter,
+however, folds escaped double-quoted scalars and escapes characters
+outside the Basic Multilingual Plane differently from the pure-Python emitter,
+so :func:`safe_dump` only hands documents to it when every string can be
+emitted without escapes. Everything else goes through the pure-Python dumper,
+which keeps generated files byte-identical regardless of the backend.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+import yaml
+
+try:
+    from yaml import CSafeDumper as SafeDumper
+    from yaml import CSafeLoader as SafeLoader
+
+    HAS_LIBYAML = True
+except ImportError:  # pragma: no cover - depends on how PyYAML was built
+    from yaml import SafeDumper, SafeLoader
+
+    HAS_LIBYAML = False
+
+YAMLError = yaml.YAMLError
+
+_MAX_BMP = "\uffff"
+
+
+def safe_load(stream: str | bytes) -> Any:
+    """Parse a YAML document with the fastest safe loader that gives the pure-Python result."""
+    tab = "\t" if isinstance(stream, str) else b"\t"
+    loader = yaml.SafeLoader if tab in stream else SafeLoader
+    return yaml.load(stream, Loader=loader)  # noqa: S506 - always a safe loader
+
+
+def safe_dump(data: Any, **kwargs: Any) -> str:
+    """Serialize ``data`` like :func:`yaml.safe_dump`, using libyaml when output is identical."""
+    limit = _MAX_BMP if kwargs.get("allow_unicode") else "\x7f"
+    dumper = SafeDumper if HAS_LIBYAML and _emits_identically(data, limit) else yaml.SafeDumper
+    return yaml.dump(data, Dumper=dumper, **kwargs)
+
+
+def _emits_identically(data: Any, limit: str = _MAX_BMP) -> bool:
+    """Return True if both emitters are known to produce the same bytes for ``data``.
+
+    Printable strings no wider than ``limit`` are written plain or single-quoted,
+    where the two emitters agree; anything that needs escapes is left to the
+    pure-Python dumper. Mapping keys must also be ASCII because the emitters
+    measure the simple-key length limit in characters and bytes respectively.
+    """
+    if isinstance(data, str):
+        return data.isprintable() and (not data or max(data) <= limit)
+    if isinstance(data, dict):
+        return all(
+            _emits_identically(key, "\x7f") and _emits_identically(value, limit)
+            for key, value in data.items()
+        )
+    if isinstance(data, list | tuple | set | frozenset):
+        return all(_emits_identically(item, limit) for item in data)
+    return True
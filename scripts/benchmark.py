@@ -0,0 +1,484 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.12"
+# ///
+"""Micro-benchmarks for the prompt loading and rendering hot paths.
+
+Each benchmark compares the current implementation against the approach it
+replaced (or against an alternative backend) and prints the best-of-N timing.
+
+Usage (from the repository root):
+    python scripts/benchmark.py                 # run every benchmark
+    python scripts/benchmark.py frontmatter     # run selected benchmarks
+    python scripts/benchmark.py --list
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import timeit
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+
+# Allow running the script directly from a source checkout
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import tomli_w  # noqa: E402
+import yaml  # noqa: E402
+
+from mcp_server import yaml_backend  # noqa: E402
+from mcp_server.prompt_utils import (  # noqa: E402
+    load_lazy_markdown_prompt,
+    load_markdown_prompt,
+    parse_frontmatter,
+    prompt_from_content,
+)
+from slash_commands.config import SUPPORTED_AGENTS  # noqa: E402
+from slash_commands.emitters import emit_toml, emit_yaml  # noqa: E402
+from slash_commands.generators import (  # noqa: E402
+    CommandGenerator,
+    _normalize_output,
+    _PromptRenderer,
+    plan_renders,
+)
+from slash_commands.placeholders import PLACEHOLDERS, arguments_section_markdown  # noqa: E402
+from slash_commands.run_context import RunContext  # noqa: E402
+from slash_commands.writer import fsync_files, write_chunks  # noqa: E402
+
+BENCHMARKS: dict[str, Callable[[argparse.Namespace], None]] = {}
+
+
+def benchmark(name: str) -> Callable[[Callable[[argparse.Namespace], None]], Callable]:
+    """Register a benchmark function under ``name``."""
+
+    def decorator(func: Callable[[argparse.Namespace], None]) -> Callable:
+        BENCHMARKS[name] = func
+        return func
+
+    return decorator
+
+
+def best_of(func: Callable[[], object], repeat: int, number: int = 1) -> float:
+    """Return the best per-call time in seconds over ``repeat`` runs."""
+    return min(timeit.repeat(func, repeat=repeat, number=number)) / number
+
+
+def report(label: str, seconds: float, baseline: float | None = None) -> None:
+    """Print one timing line, with the speedup relative to ``baseline`` if given."""
+    line = f"  {label:<40} {seconds * 1000:10.3f} ms"
+    if baseline is not None and seconds > 0:
+        line += f"   ({baseline / seconds:5.2f}x)"
+    print(line)
+
+
+def _legacy_parse_frontmatter(content: str) -> tuple[dict, str]:
+    """The split-based parser used before the line-anchored scanner."""
+    import yaml
+
+    if not content.startswith("---"):
+        return {}, content
+    parts = content.split("---", 2)
+    if len(parts) < 3:
+        return {}, content
+    try:
+        frontmatter = yaml.safe_load(parts[1]) or {}
+    except yaml.YAMLError:
+        frontmatter = {}
+    return frontmatter, parts[2].strip()
+
+
+@benchmark("frontmatter")
+def bench_frontmatter(args: argparse.Namespace) -> None:
+    """Frontmatter parsing on a multi-megabyte prompt."""
+    body = "Line of prompt text with `code` and {{args}} placeholders.\n" * 80_000
+    content = f"---\nname: large\ndescription: Large prompt\ntags: [a, b]\n---\n\n{body}"
+    print(f"frontmatter: {len(content) / 1_000_000:.1f} MB prompt")
+
+    legacy = best_of(lambda: _legacy_parse_frontmatter(content), args.repeat)
+    current = best_of(lambda: parse_frontmatter(content), args.repeat)
+    report("content.split('---', 2)", legacy)
+    report("scan_frontmatter", current, legacy)
+
+
+@benchmark("yaml")
+def bench_yaml(args: argparse.Namespace) -> None:
+    """Frontmatter load/dump over a 10k-prompt corpus, pure Python vs libyaml."""
+    frontmatters = [
+        {
+            "name": f"prompt-{index}",
+            "description": f"Synthetic prompt number {index} used for benchmarking",
+            "tags": ["benchmark", f"group-{index % 10}"],
+            "arguments": [{"name": "target", "description": "What to act on", "required": False}],
+            "meta": {"category": "benchmark", "version": "1.0.0"},
+        }
+        for index in range(10_000)
+    ]
+    documents = [yaml.safe_dump(data, sort_keys=False) for data in frontmatters]
+    print(f"yaml: {len(documents)} prompts (libyaml available: {yaml_backend.HAS_LIBYAML})")
+
+    pure_load = best_of(
+        lambda: [yaml.load(doc, Loader=yaml.SafeLoader) for doc in documents], args.repeat
+    )
+    fast_load = best_of(lambda: [yaml_backend.safe_load(doc) for doc in documents], args.repeat)
+    report("load: yaml.SafeLoader", pure_load)
+    report("load: yaml_backend.safe_load", fast_load, pure_load)
+
+    options = {"allow_unicode": True, "sort_keys": False}
+    pure_dump = best_of(
+        lambda: [yaml.dump(data, Dumper=yaml.SafeDumper, **options) for data in frontmatters],
+        args.repeat,
+    )
+    fast_dump = best_of(
+        lambda: [yaml_backend.safe_dump(data, **options) for data in frontmatters], args.repeat
+    )
+    report("dump: yaml.SafeDumper", pure_dump)
+    report("dump: yaml_backend.safe_dump", fast_dump, pure_dump)
+
+
+@benchmark("lazy")
+def bench_lazy(args: argparse.Namespace) -> None:
+    """Catalog loading with eager bodies vs lazy (frontmatter-only) prompts."""
+    body = "Prompt body line with enough text to matter for memory use.\n" * 2_000
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for index in range(500):
+            path = Path(tmp) / f"prompt-{index}.md"
+            path.write_text(f"---\nname: prompt-{index}\ntags: [a]\n---\n{body}", encoding="utf-8")
+            paths.append(path)
+        print(f"lazy: {len(paths)} prompts of {len(body) / 1000:.0f} KB")
+
+        for label, loader in (
+            ("load_markdown_prompt", load_markdown_prompt),
+            ("load_lazy_markdown_prompt", load_lazy_markdown_prompt),
+        ):
+            tracemalloc.start()
+            prompts = [loader(path) for path in paths]
+            retained, _peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            del prompts
+            print(f"  {label:<40} {retained / 1_000_000:10.1f} MB retained")
+
+        eager = best_of(lambda: [load_markdown_prompt(path) for path in paths], args.repeat)
+        lazy = best_of(lambda: [load_lazy_markdown_prompt(path) for path in paths], args.repeat)
+        report("load_markdown_prompt", eager)
+        report("load_lazy_markdown_prompt", lazy, eager)
+
+
+@benchmark("render")
+def bench_render(args: argparse.Namespace) -> None:
+    """Rendering 200 prompts for every agent, per agent vs per render group."""
+    body = "Use $ARGUMENTS to decide what to work on, then report back.\n" * 200
+    prompts = [
+        prompt_from_content(
+            Path(f"prompt-{index}.md"),
+            f"---\nname: prompt-{index}\ndescription: Prompt {index}\ntags: [a, b]\n"
+            f"arguments:\n  - name: target\n    description: What to act on\n---\n{body}",
+        )
+        for index in range(200)
+    ]
+    all_agents = list(SUPPORTED_AGENTS)
+    markdown_agents = [agent for agent in all_agents if agent.command_format.value == "markdown"]
+    print(f"render: {len(prompts)} prompts")
+
+    def per_agent(agents: list) -> None:
+        for prompt in prompts:
+            for agent in agents:
+                CommandGenerator.create(agent.command_format).generate(prompt, agent)
+
+    def per_group(agents: list) -> None:
+        for prompt in prompts:
+            for group in plan_renders(prompt, agents):
+                CommandGenerator.create(group.command_format).generate_many(prompt, group.agents)
+
+    for label, agents in (("all", all_agents), ("markdown", markdown_agents)):
+        baseline = best_of(lambda agents=agents: per_agent(agents), args.repeat)
+        grouped = best_of(lambda agents=agents: per_group(agents), args.repeat)
+        report(f"{label} ({len(agents)}): generate() per agent", baseline)
+        report(f"{label} ({len(agents)}): generate_many() per group", grouped, baseline)
+
+
+@benchmark("batch")
+def bench_batch(args: argparse.Namespace) -> None:
+    """Rendering 2,000 prompts for every agent, generate() loop vs render_many()."""
+    body = "Use $ARGUMENTS to decide what to work on, then report back.\n" * 200
+    prompts = [
+        prompt_from_content(
+            Path(f"prompt-{index}.md"),
+            f"---\nname: prompt-{index}\ndescription: Prompt {index}\ntags: [a, b]\n"
+            f"arguments:\n  - name: target\n    description: What to act on\n---\n{body}",
+        )
+        for index in range(2_000)
+    ]
+    agents = list(SUPPORTED_AGENTS)
+    context = RunContext.create("0")
+    print(f"batch: {len(prompts)} prompts x {len(agents)} agents")
+
+    def loop() -> None:
+        for prompt in prompts:
+            for agent in agents:
+                CommandGenerator.create(agent.command_format).generate(
+                    prompt, agent, context=context
+                )
+
+    baseline = best_of(loop, args.repeat)
+    report("generate() per prompt and agent", baseline)
+    for workers in (1, 4):
+        seconds = best_of(
+            lambda workers=workers: sum(
+                1
+                for _ in CommandGenerator.render_many(
+                    prompts, agents, context=context, workers=workers
+                )
+            ),
+            args.repeat,
+        )
+        report(f"render_many(workers={workers})", seconds, baseline)
+
+
+@benchmark("write")
+def bench_write(args: argparse.Namespace) -> None:
+    """Rendering and writing 20 large prompts for every agent, str + write_text vs bytes chunks."""
+    body = "Prompt body line with `code` and enough text to matter for the write path.\n" * 20_000
+    prompts = [
+        prompt_from_content(
+            Path(f"prompt-{index}.md"),
+            f"---\nname: prompt-{index}\ndescription: Prompt {index}\n---\n{body}",
+        )
+        for index in range(20)
+    ]
+    agents = list(SUPPORTED_AGENTS)
+    renderer = _PromptRenderer(agents, None, RunContext.create("0"))
+    size = len(body.encode()) // 1024
+    print(f"write: {len(prompts)} prompts of {size} KiB x {len(agents)} agents")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {agent.key: Path(tmp) / f"{agent.key}.md" for agent in agents}
+
+        def as_text() -> None:
+            for prompt in prompts:
+                for key, content in renderer.render(prompt).items():
+                    paths[key].write_text(content, encoding="utf-8")
+
+        def as_bytes() -> None:
+            for prompt in prompts:
+                for key, chunks in renderer.render_bytes(prompt).items():
+                    write_chunks(paths[key], chunks)
+
+        baseline = best_of(as_text, args.repeat)
+        chunked = best_of(as_bytes, args.repeat)
+        report("render() + write_text()", baseline)
+        report("render_bytes() + write_chunks()", chunked, baseline)
+
+
+def _durability_dirs(args: argparse.Namespace) -> list[Path]:
+    if args.dir:
+        return [Path(directory) for directory in args.dir]
+    # tmpfs where available, and the default temp directory (usually a disk)
+    candidates = [Path("/dev/shm"), Path(tempfile.gettempdir())]
+    return [directory for directory in candidates if directory.is_dir()]
+
+
+@benchmark("durability")
+def bench_durability(args: argparse.Namespace) -> None:
+    """Writing 200 command files in place vs atomically with each durability policy."""
+    content = (b"---\nname: prompt\ndescription: A prompt\n---\n\n", b"Body line\n" * 200)
+    names = [f"{agent}/prompt-{index}.md" for agent in range(4) for index in range(50)]
+    print(f"durability: {len(names)} files of {sum(map(len, content))} bytes in 4 directories")
+    for base in _durability_dirs(args):
+        print(f" {base}")
+        with tempfile.TemporaryDirectory(dir=base) as tmp:
+            _bench_durability_in(Path(tmp), names, content, args.repeat)
+
+
+def _bench_durability_in(
+    tmp: Path, names: list[str], content: tuple[bytes, ...], repeat: int
+) -> None:
+    paths = [tmp / name for name in names]
+    for directory in {path.parent for path in paths}:
+        directory.mkdir()
+
+    def in_place() -> None:
+        for path in paths:
+            with path.open("wb") as handle:
+                handle.writelines(content)
+
+    def atomic(fsync: bool = False) -> None:
+        for path in paths:
+            write_chunks(path, content, fsync=fsync)
+
+    def batch() -> None:
+        atomic()
+        fsync_files(paths)
+
+    baseline = best_of(in_place, repeat)
+    report("in place (not atomic)", baseline)
+    report("atomic, durability=none", best_of(atomic, repeat), baseline)
+    report("atomic, durability=batch", best_of(batch, repeat), baseline)
+    report("atomic, durability=file", best_of(lambda: atomic(fsync=True), repeat), baseline)
+
+
+def _legacy_normalize_output(content: str) -> str:
+    """Two replaces, splitlines() and a join on every call, as before the fast path."""
+    content = content.replace("\r\n", "\n").replace("\r", "\n")
+    result = "\n".join(line.rstrip() for line in content.splitlines())
+    if result and not result.endswith("\n"):
+        result += "\n"
+    return result
+
+
+@benchmark("normalize")
+def bench_normalize(args: argparse.Namespace) -> None:
+    """Output normalization of rendered files, line by line vs clean-content fast path."""
+    body = "Prompt body line with `code` and enough text to matter.\n" * 2_000
+    prompts = [
+        prompt_from_content(
+            Path(f"prompt-{index}.md"),
+            f"---\nname: prompt-{index}\ndescription: Prompt\n---\n{body}",
+        )
+        for index in range(50)
+    ]
+    renderer = _PromptRenderer(list(SUPPORTED_AGENTS), None, RunContext.create("0"))
+    clean = [content for prompt in prompts for content in renderer.render(prompt).values()]
+    dirty = [content.replace("\n", " \r\n") for content in clean]
+    print(f"normalize: {len(clean)} rendered files")
+
+    for label, contents in (("clean", clean), ("CRLF", dirty)):
+        baseline = best_of(lambda c=contents: [_legacy_normalize_output(x) for x in c], args.repeat)
+        fast = best_of(lambda c=contents: [_normalize_output(x) for x in c], args.repeat)
+        report(f"{label}: line by line", baseline)
+        report(f"{label}: _normalize_output", fast, baseline)
+
+
+def _legacy_replace_placeholders(body: str, arguments: list) -> str:
+    """One full-body str.replace per token, as before the placeholder engine."""
+    if "$ARGUMENTS" in body:
+        section = arguments_section_markdown(arguments)
+        body = body.replace("`$ARGUMENTS`", section).replace("$ARGUMENTS", section)
+    if "{{args}}" in body:
+        body = body.replace("{{args}}", ", ".join(arg.name for arg in arguments))
+    return body
+
+
+@benchmark("placeholders")
+def bench_placeholders(args: argparse.Namespace) -> None:
+    """Placeholder substitution on 1,000 bodies, chained str.replace vs one pass."""
+    prompt = prompt_from_content(
+        Path("prompt.md"),
+        "---\narguments:\n  - name: target\n  - name: mode\n    required: false\n---\n",
+    )
+    filler = "Plain prompt line with `code` and {braces} in it.\n" * 200
+    bodies = {
+        "with tokens": [
+            f"$ARGUMENTS\n{filler}`$ARGUMENTS` {{{{args}}}} {index}" for index in range(1_000)
+        ],
+        "without tokens": [f"{filler}{index}" for index in range(1_000)],
+    }
+    placeholders = PLACEHOLDERS.compile(["`$ARGUMENTS`", "$ARGUMENTS", "{{args}}"])
+    print(f"placeholders: {len(filler) / 1000:.0f} KB bodies")
+
+    for label, corpus in bodies.items():
+        legacy = best_of(
+            lambda corpus=corpus: [
+                _legacy_replace_placeholders(body, prompt.arguments) for body in corpus
+            ],
+            args.repeat,
+        )
+        current = best_of(
+            lambda corpus=corpus: [
+                placeholders.substitute(body, prompt.arguments) for body in corpus
+            ],
+            args.repeat,
+        )
+        report(f"{label}: str.replace per token", legacy)
+        report(f"{label}: PlaceholderSet.substitute", current, legacy)
+
+
+@benchmark("emit")
+def bench_emit(args: argparse.Namespace) -> None:
+    """Serializing 1,000 generated frontmatters and TOML files, general vs specialised."""
+    frontmatters = [
+        {
+            "name": f"sdd-{index}-generate-spec",
+            "description": "Generate a specification for a feature from a short description "
+            f"provided by the user, number {index}",
+            "tags": ["planning", "specification"],
+            "enabled": True,
+            "arguments": [
+                {"name": "feature", "description": "Feature to specify", "required": True},
+                {"name": "scope", "description": None, "required": False},
+            ],
+            "meta": {
+                "category": "sdd",
+                "agent": "claude-code",
+                "agent_display_name": "Claude Code",
+                "command_dir": ".claude/commands",
+                "command_format": "markdown",
+                "command_file_extension": ".md",
+                "source_prompt": f"sdd-{index}-generate-spec",
+                "source_path": f"sdd-{index}-generate-spec.md",
+                "version": "1.0.0",
+                "updated_at": "2025-01-02T03:04:05.678901+00:00",
+            },
+        }
+        for index in range(1_000)
+    ]
+    body = 'Write the spec to "docs/specs/" and ask before overwriting.\n' * 50
+    toml_documents = [
+        {
+            "prompt": f"{body}{index}",
+            "description": f"Generate spec {index}",
+            "meta": {"version": "1.0.0", "source_prompt": f"spec-{index}", "agent": "gemini-cli"},
+        }
+        for index in range(1_000)
+    ]
+    print(f"emit: {len(frontmatters)} frontmatters, {len(toml_documents)} TOML documents")
+
+    general = best_of(
+        lambda: [
+            yaml_backend.safe_dump(data, allow_unicode=True, sort_keys=False)
+            for data in frontmatters
+        ],
+        args.repeat,
+    )
+    fast = best_of(lambda: [emit_yaml(data) for data in frontmatters], args.repeat)
+    report("yaml: yaml_backend.safe_dump", general)
+    report("yaml: emit_yaml", fast, general)
+
+    general = best_of(lambda: [tomli_w.dumps(data) for data in toml_documents], args.repeat)
+    fast = best_of(lambda: [emit_toml(data) for data in toml_documents], args.repeat)
+    report("toml: tomli_w.dumps", general)
+    report("toml: emit_toml", fast, general)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("names", nargs="*", help="Benchmarks to run (default: all)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions per case")
+    parser.add_argument("--list", action="store_true", help="List available benchmarks")
+    parser.add_argument(
+        "--dir",
+        action="append",
+        help="Directory for the durability benchmark (repeatable; default: tmpfs and the temp dir)",
+    )
+    args = parser.parse_args()
+
+    if args.list:
+        for name, func in BENCHMARKS.items():
+            print(f"{name:<16} {func.__doc__}")
+        return 0
+
+    unknown = [name for name in args.names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+
+    for name in args.names or BENCHMARKS:
+        BENCHMARKS[name](args)
+        print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,6 +2,7 @@
 
 from .config import SUPPORTED_AGENTS, AgentConfig, CommandFormat, get_agent_config, list_agent_keys
 from .detection import detect_agents
+from .run_context import RunContext
 from .writer import NoPromptsDiscoveredError, SlashCommandWriter
 
 __all__ = [
@@ -10,6 +11,7 @@ __all__ = [
     "CommandFormat",
     "SlashCommandWriter",
     "NoPromptsDiscoveredError",
+    "RunContext",
     "app",
     "detect_agents",
     "get_agent_config",
@@ -17,6 +17,8 @@ from rich.text import Text
 from rich.tree import Tree
 
 from mcp_server import create_app
+from mcp_server.prompt_cache import PromptCache, default_cache_dir
+from mcp_server.prompt_discovery import DEFAULT_INCLUDE, DiscoveryOptions
 from slash_commands import (
     NoPromptsDiscoveredError,
     SlashCommandWriter,
@@ -26,12 +28,24 @@ from slash_commands import (
 )
 from slash_commands.__version__ import __version_with_commit__
 from slash_commands.github_utils import validate_github_repo
+from slash_commands.object_store import ObjectStore
+from slash_commands.render_cache import RenderCache
+from slash_commands.run_context import RunContext
+from slash_commands.validator import PromptValidator, ValidationCache
+from slash_commands.writer import Durability
 
 app = typer.Typer(
     name="slash-man",
     help="Manage slash commands for the spec-driven workflow in your AI assistants",
     rich_markup_mode="rich",
 )
+cache_app = typer.Typer(help="Inspect and maintain the slash-man cache directory")
+app.add_typer(cache_app, name="cache")
+
+
+def _default_object_store() -> ObjectStore:
+    """Return the prompt object store inside the slash-man cache directory."""
+    return ObjectStore(default_cache_dir() / "store")
 
 
 def version_callback_impl(value: bool) -> None:
@@ -130,7 +144,10 @@ def _build_summary_data(
 ) -> dict[str, Any]:
     """Build structured data describing generation results."""
     prompts_loaded = result["prompts_loaded"] if result else 0
+    prompt_cache = result.get("prompt_cache") if result else None
+    render_cache = result.get("render_cache") if result else None
     files_written = result["files_written"] if result else 0
+    files_unchanged = result.get("files_unchanged", 0) if result else 0
     planned_files = len(result["files"]) if result else 0
     files_by_agent: dict[str, dict[str, Any]] = {}
     prompt_entries: list[dict[str, str]] = []
@@ -197,7 +214,10 @@ def _build_summary_data(
         "safe_mode": safe_mode,
         "prompts_loaded": prompts_loaded,
         "files_written": files_written,
+        "files_unchanged": files_unchanged,
         "files_planned": planned_files,
+        "prompt_cache": prompt_cache,
+        "render_cache": render_cache,
         "agents": {
             "detected": detected_agents,
             "selected": selected_agents,
@@ -229,6 +249,17 @@ def _render_rich_summary(summary: dict[str, Any], *, record: bool = False) -> st
     counts.add(f"Prompts loaded: {summary['prompts_loaded']}")
     counts.add(f"Files planned: {summary['files_planned']}")
     counts.add(f"Files written: {summary['files_written']}")
+    if summary.get("files_unchanged"):
+        counts.add(f"Files unchanged: {summary['files_unchanged']}")
+    if summary.get("prompt_cache"):
+        cache_stats = summary["prompt_cache"]
+        counts.add(f"Prompt cache: {cache_stats['hits']} hit(s), {cache_stats['misses']} miss(es)")
+    render_stats = summary.get("render_cache")
+    # Only runs with a pinned timestamp use the render cache
+    if render_stats and (render_stats["hits"] or render_stats["misses"]):
+        counts.add(
+            f"Render cache: {render_stats['hits']} hit(s), {render_stats['misses']} miss(es)"
+        )
 
     agents_branch = root.add("Agents")
     detected = agents_branch.add("Detected")
@@ -299,6 +330,8 @@ def _print_generation_complete(summary: dict[str, Any]) -> None:
     console.print(f"{mode_label}:")
     console.print(f"  Prompts loaded: {summary['prompts_loaded']}")
     console.print(f"  Files written: {summary['files_written']}")
+    if summary.get("files_unchanged"):
+        console.print(f"  Files unchanged: {summary['files_unchanged']}")
 
 
 def _prompt_agent_selection(detected_agents: list) -> list:
@@ -412,8 +445,94 @@ def generate(  # noqa: PLR0913 PLR0912 PLR0915
             ),
         ),
     ] = None,
+    use_cache: Annotated[
+        bool,
+        typer.Option(
+            "--cache/--no-cache",
+            help=(
+                "Reuse parsed and downloaded prompts, and rendered files when the timestamp "
+                "is pinned, from the slash-man cache directory (default: True)"
+            ),
+        ),
+    ] = True,
+    load_workers: Annotated[
+        int | None,
+        typer.Option(
+            "--load-workers",
+            min=1,
+            help="Number of threads used to read and parse prompt files (default: automatic)",
+        ),
+    ] = None,
+    recursive: Annotated[
+        bool,
+        typer.Option(
+            "--recursive",
+            "-r",
+            help="Also discover prompts in subdirectories of the prompts directory",
+        ),
+    ] = False,
+    include: Annotated[
+        list[str] | None,
+        typer.Option(
+            "--include",
+            help="Glob a prompt file must match (can be specified multiple times, default: *.md)",
+        ),
+    ] = None,
+    exclude: Annotated[
+        list[str] | None,
+        typer.Option(
+            "--exclude",
+            help="Glob for files or directories to skip (can be specified multiple times)",
+        ),
+    ] = None,
+    max_depth: Annotated[
+        int | None,
+        typer.Option(
+            "--max-depth",
+            min=0,
+            help="Deepest subdirectory level to search; implies --recursive (0 = top level only)",
+        ),
+    ] = None,
+    timestamp: Annotated[
+        str | None,
+        typer.Option(
+            "--timestamp",
+            help=(
+                "Timestamp recorded in generated files, as seconds since the epoch or "
+                "ISO 8601, for reproducible output (default: SOURCE_DATE_EPOCH or now)"
+            ),
+        ),
+    ] = None,
+    durability: Annotated[
+        Durability,
+        typer.Option(
+            "--durability",
+            help=(
+                "When written files are flushed to disk: none (left to the OS), file "
+                "(each file as it is written) or batch (all files at the end of the run)"
+            ),
+        ),
+    ] = "none",
+    jobs: Annotated[
+        int,
+        typer.Option(
+            "--jobs",
+            "-j",
+            min=1,
+            help=(
+                "Number of threads that back up and write command files; raise it for "
+                "network file systems (default: 1)"
+            ),
+        ),
+    ] = 1,
 ) -> None:
     """Generate slash commands for AI code assistants."""
+    try:
+        run_context = RunContext.create(timestamp)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        raise typer.Exit(code=2) from None  # Validation error
+
     # Validate GitHub flags
     github_flags_provided = [
         flag for flag in [github_repo, github_branch, github_path] if flag is not None
@@ -573,6 +692,19 @@ def generate(  # noqa: PLR0913 PLR0912 PLR0915
         github_repo=github_repo,
         github_branch=github_branch,
         github_path=github_path,
+        prompt_cache=PromptCache(default_cache_dir()) if use_cache else None,
+        object_store=_default_object_store() if use_cache else None,
+        render_cache=RenderCache(default_cache_dir()) if use_cache else None,
+        load_workers=load_workers,
+        discovery=DiscoveryOptions(
+            recursive=recursive or max_depth is not None,
+            include=tuple(include) if include else DEFAULT_INCLUDE,
+            exclude=tuple(exclude or ()),
+            max_depth=max_depth,
+        ),
+        run_context=run_context,
+        durability=durability,
+        max_workers=jobs,
     )
 
     if github_repo and github_branch and github_path:
@@ -825,6 +957,154 @@ def cleanup(
     )
 
 
+@app.command()
+def status(
+    agents: Annotated[
+        list[str] | None,
+        typer.Option(
+            "--agent",
+            "-a",
+            help=(
+                "Agent keys to report (can be specified multiple times). "
+                "If not specified, reports all agents."
+            ),
+        ),
+    ] = None,
+    target_path: Annotated[
+        Path | None,
+        typer.Option(
+            "--target-path",
+            "-t",
+            help="Target directory generated files were written to (defaults to home directory)",
+        ),
+    ] = None,
+) -> None:
+    """Show the generated files recorded in the target's manifest."""
+    actual_target_path = target_path if target_path is not None else Path.home()
+
+    writer = SlashCommandWriter(
+        prompts_dir=Path("prompts"),  # Not used for status
+        agents=[],
+        base_path=actual_target_path,
+    )
+    statuses = writer.manifest_status(agents=agents)
+
+    if not statuses:
+        console.print("[green]No generated files recorded.[/green]")
+        return
+
+    table = Table(title=f"{len(statuses)} generated file(s)")
+    table.add_column("File Path", style="cyan", no_wrap=False)
+    table.add_column("Agent", style="magenta")
+    table.add_column("Source Prompt")
+    table.add_column("State", justify="center")
+
+    for file_status in sorted(statuses, key=lambda item: (item["agent"], item["path"])):
+        state_display = {
+            "ok": "[green]ok[/green]",
+            "modified": "[yellow]modified[/yellow]",
+            "missing": "[red]missing[/red]",
+        }[file_status["state"]]
+        table.add_row(
+            file_status["path"],
+            file_status["agent"],
+            file_status["source_prompt"],
+            state_display,
+        )
+
+    console.print()
+    console.print(table)
+
+
+@app.command()
+def validate(
+    prompts_dir: Annotated[
+        Path,
+        typer.Option(
+            "--prompts-dir",
+            "-p",
+            help="Directory containing prompt files",
+        ),
+    ] = Path("prompts"),
+    recursive: Annotated[
+        bool,
+        typer.Option(
+            "--recursive",
+            "-r",
+            help="Also validate prompts in subdirectories of the prompts directory",
+        ),
+    ] = False,
+    include: Annotated[
+        list[str] | None,
+        typer.Option(
+            "--include",
+            help="Glob a prompt file must match (can be specified multiple times, default: *.md)",
+        ),
+    ] = None,
+    exclude: Annotated[
+        list[str] | None,
+        typer.Option(
+            "--exclude",
+            help="Glob for files or directories to skip (can be specified multiple times)",
+        ),
+    ] = None,
+    max_depth: Annotated[
+        int | None,
+        typer.Option(
+            "--max-depth",
+            min=0,
+            help="Deepest subdirectory level to search; implies --recursive (0 = top level only)",
+        ),
+    ] = None,
+    use_cache: Annotated[
+        bool,
+        typer.Option(
+            "--cache/--no-cache",
+            help="Skip prompts that passed or failed unchanged in an earlier run (default: True)",
+        ),
+    ] = True,
+    jobs: Annotated[
+        int | None,
+        typer.Option(
+            "--jobs",
+            "-j",
+            min=1,
+            help="Number of worker processes (default: number of CPUs)",
+        ),
+    ] = None,
+) -> None:
+    """Check every prompt for frontmatter, argument, override and rendering errors."""
+    validator = PromptValidator(
+        prompts_dir,
+        discovery=DiscoveryOptions(
+            recursive=recursive or max_depth is not None,
+            include=tuple(include) if include else DEFAULT_INCLUDE,
+            exclude=tuple(exclude or ()),
+            max_depth=max_depth,
+        ),
+        cache=ValidationCache(default_cache_dir()) if use_cache else None,
+        workers=jobs,
+    )
+    try:
+        report = validator.validate()
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        raise typer.Exit(code=3) from None  # I/O error (prompts directory doesn't exist)
+
+    for diagnostic in report.diagnostics:
+        print(diagnostic)
+
+    summary = (
+        f"Validated {report.checked} prompt(s): {report.failed} failed "
+        f"({report.cached} unchanged since the last run)"
+    )
+    if report.ok:
+        console.print(f"[green]{summary}[/green]")
+        return
+    console.print(f"[red]{summary}[/red]")
+    raise typer.Exit(code=1)
+
+
 @app.command()
 def mcp(
     config_file: Annotated[
@@ -884,6 +1164,34 @@ def mcp(
         raise typer.Exit(code=3) from None
 
 
+@cache_app.command("gc")
+def cache_gc() -> None:
+    """Delete stored prompt objects that no recorded source refers to."""
+    store = _default_object_store()
+    result = store.gc()
+    store.save()
+    console.print(
+        f"Removed {result.objects_removed} object(s) ({result.bytes_freed} bytes) "
+        f"and {result.checkouts_removed} checkout(s) from {store.root}"
+    )
+
+
+@cache_app.command("stats")
+def cache_stats() -> None:
+    """Show the size of the caches in the slash-man cache directory."""
+    cache_dir = default_cache_dir()
+    prompt_cache = PromptCache(cache_dir)
+    render_cache = RenderCache(cache_dir)
+    store = _default_object_store()
+    console.print(f"Cache directory: {cache_dir}")
+    console.print(f"Parsed prompts: {len(prompt_cache)} cached")
+    console.print(
+        f"Rendered files: {len(render_cache)} cached "
+        f"({render_cache.size} of {render_cache.max_bytes} bytes)"
+    )
+    console.print(f"Prompt store: {store.size()} of {store.max_bytes} bytes")
+
+
 def main() -> None:
     """Entry point for the CLI."""
     app()
@@ -0,0 +1,271 @@
+"""Serializers specialised for the generated command file schemas.
+
+Generated frontmatter is a block mapping of strings, booleans, integers, lists
+of strings, the ``arguments`` list of small mappings and a flat ``meta``
+mapping, and generated TOML is a few strings plus a flat ``[meta]`` table.
+General-purpose serializers spend most of their time on cases these documents
+never hit: PyYAML builds a node graph and an event stream, and tomli_w escapes
+strings one character at a time.
+
+:func:`emit_yaml` and :func:`emit_toml` write that subset directly and produce
+the same text as ``yaml_backend.safe_dump(data, allow_unicode=True,
+sort_keys=False)`` and ``tomli_w.dumps(data)``. Style decisions for YAML strings
+are taken from PyYAML's own scalar analysis and resolver, so only the layout is
+reimplemented. Any value outside the subset (floats, quoted or escaped
+multi-line strings, nested sequences, shared containers, unusual key types)
+makes the whole document fall back to the general serializer.
+"""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Any
+
+import yaml
+
+from mcp_server import yaml_backend
+
+# PyYAML's default line width and indentation
+_BEST_WIDTH = 80
+_INDENT = 2
+
+# PyYAML writes longer keys in the explicit "? key" form; stay well below its limit
+_MAX_KEY_LENGTH = 100
+
+_STR_TAG = "tag:yaml.org,2002:str"
+_RESOLVER = yaml.resolver.Resolver()
+# Only used for analyze_scalar(), which reads nothing but the allow_unicode setting
+_ANALYZER = yaml.emitter.Emitter(None, allow_unicode=True)
+
+_SPACE_RUNS = re.compile(r" +|[^ ]+")
+
+_TOML_BARE_KEY = re.compile(r"[A-Za-z0-9_-]+")
+_TOML_ESCAPED = re.compile(r'[\x00-\x08\x0a-\x1f\x7f"\\]')
+_TOML_ESCAPES = {
+    **{chr(code): f"\\u{code:04x}" for code in (*range(32), 127) if code != ord("\t")},
+    "\b": "\\b",
+    "\n": "\\n",
+    "\f": "\\f",
+    "\r": "\\r",
+    '"': '\\"',
+    "\\": "\\\\",
+}
+
+
+class _Unsupported(Exception):
+    """Raised when a value needs the general serializer."""
+
+
+def emit_yaml(data: dict[str, Any]) -> str:
+    """Serialize a mapping like ``yaml_backend.safe_dump(data, allow_unicode=True, sort_keys=False)``."""
+    if type(data) is dict:
+        if not data:
+            return "{}\n"
+        out: list[str] = []
+        try:
+            _emit_mapping(data, 0, out, set(), inline=False)
+        except _Unsupported:
+            pass
+        else:
+            return "".join(out)
+    return yaml_backend.safe_dump(data, allow_unicode=True, sort_keys=False)
+
+
+def emit_toml(data: dict[str, Any]) -> str:
+    """Serialize a mapping like ``tomli_w.dumps(data)``."""
+    if type(data) is dict:
+        try:
+            return _emit_toml_document(data)
+        except _Unsupported:
+            pass
+    # Only needed for the fallback, so runs without unusual TOML values never import it
+    import tomli_w
+
+    return tomli_w.dumps(data)
+
+
+# YAML
+
+
+def _emit_mapping(
+    mapping: dict[Any, Any], indent: int, out: list[str], seen: set[int], inline: bool
+) -> None:
+    """Write a non-empty block mapping whose keys start at ``indent``.
+
+    With ``inline`` the first key continues the current line (after ``- ``).
+    """
+    _visit(mapping, seen)
+    for key, value in mapping.items():
+        key_text = _yaml_key(key)
+        if inline:
+            inline = False
+        else:
+            out.append(" " * indent)
+        out.append(key_text)
+        out.append(":")
+        _emit_value(value, indent, indent + len(key_text) + 1, out, seen)
+
+
+def _emit_sequence(sequence: list[Any], indent: int, out: list[str], seen: set[int]) -> None:
+    """Write a non-empty block sequence whose dashes start at ``indent``."""
+    _visit(sequence, seen)
+    for item in sequence:
+        out.append(" " * indent)
+        out.append("-")
+        if type(item) is dict and item:
+            out.append(" ")
+            _emit_mapping(item, indent + _INDENT, out, seen, inline=True)
+        elif type(item) is list and item:
+            raise _Unsupported
+        else:
+            _emit_value(item, indent, indent + 1, out, seen)
+
+
+def _emit_value(value: Any, indent: int, column: int, out: list[str], seen: set[int]) -> None:
+    """Write the value of a mapping entry or sequence item; ``column`` is where it starts."""
+    kind = type(value)
+    if kind is dict:
+        if value:
+            out.append("\n")
+            _emit_mapping(value, indent + _INDENT, out, seen, inline=False)
+            return
+        _visit(value, seen)
+        out.append(" {}\n")
+    elif kind is list:
+        if value:
+            # Sequences in a block mapping are not indented
+            out.append("\n")
+            _emit_sequence(value, indent, out, seen)
+            return
+        _visit(value, seen)
+        out.append(" []\n")
+    else:
+        out.append(" ")
+        out.append(_yaml_scalar(value, column + 1, indent + _INDENT))
+        out.append("\n")
+
+
+def _visit(container: dict[Any, Any] | list[Any], seen: set[int]) -> None:
+    # A container reached twice is written as an anchor and an alias
+    if id(container) in seen:
+        raise _Unsupported
+    seen.add(id(container))
+
+
+def _yaml_key(key: Any) -> str:
+    if type(key) is not str or not key or len(key) > _MAX_KEY_LENGTH:
+        raise _Unsupported
+    style = _string_style(key)
+    if style == "plain":
+        return key
+    if style == "single":
+        return _single_quoted(key)
+    raise _Unsupported
+
+
+def _yaml_scalar(value: Any, column: int, indent: int) -> str:
+    """Return a scalar as written at ``column``, wrapping continuation lines to ``indent``."""
+    kind = type(value)
+    if kind is str:
+        style = _string_style(value)
+        if style == "plain":
+            if column + len(value) <= _BEST_WIDTH:
+                return value
+            return _wrap_plain(value, column, indent)
+        if style == "single":
+            return _single_quoted(value)
+        raise _Unsupported
+    if kind is bool:
+        return "true" if value else "false"
+    if kind is int:
+        return str(value)
+    if value is None:
+        return "null"
+    raise _Unsupported
+
+
+@lru_cache(maxsize=4096)
+def _string_style(text: str) -> str | None:
+    """Return ``"plain"`` or ``"single"`` as PyYAML would choose for a block-context string.
+
+    None means the string needs a style this module does not write (double quotes,
+    or single quotes that may be folded across lines).
+    """
+    analysis = _ANALYZER.analyze_scalar(text)
+    if analysis.multiline:
+        return None
+    implicit = _RESOLVER.resolve(yaml.ScalarNode, text, (True, False)) == _STR_TAG
+    if implicit and analysis.allow_block_plain and not analysis.empty:
+        return "plain"
+    if analysis.allow_single_quoted and " " not in text:
+        return "single"
+    return None
+
+
+def _single_quoted(text: str) -> str:
+    return "'" + text.replace("'", "''") + "'"
+
+
+def _wrap_plain(text: str, column: int, indent: int) -> str:
+    """Fold a plain scalar like PyYAML: break at a single space once past the line width."""
+    pieces: list[str] = []
+    for run in _SPACE_RUNS.findall(text):
+        if run == " " and column > _BEST_WIDTH:
+            pieces.append("\n" + " " * indent)
+            column = indent
+        else:
+            pieces.append(run)
+            column += len(run)
+    return "".join(pieces)
+
+
+# TOML
+
+
+def _emit_toml_document(data: dict[str, Any]) -> str:
+    """Write top-level values followed by flat tables, as tomli_w orders them."""
+    out: list[str] = []
+    tables: list[tuple[str, dict[str, Any]]] = []
+    for key, value in data.items():
+        if type(value) is dict:
+            tables.append((key, value))
+        else:
+            out.append(f"{_toml_key(key)} = {_toml_literal(value)}\n")
+
+    for key, table in tables:
+        if out:
+            out.append("\n")
+        out.append(f"[{_toml_key(key)}]\n")
+        for name, value in table.items():
+            if type(value) is dict:
+                raise _Unsupported
+            out.append(f"{_toml_key(name)} = {_toml_literal(value)}\n")
+    return "".join(out)
+
+
+def _toml_key(key: Any) -> str:
+    if type(key) is not str:
+        raise _Unsupported
+    if _TOML_BARE_KEY.fullmatch(key):
+        return key
+    return _toml_string(key)
+
+
+def _toml_literal(value: Any) -> str:
+    kind = type(value)
+    if kind is str:
+        return _toml_string(value)
+    if kind is bool:
+        return "true" if value else "false"
+    if kind is int or kind is float:
+        return str(value)
+    raise _Unsupported
+
+
+def _toml_string(text: str) -> str:
+    return '"' + _TOML_ESCAPED.sub(_toml_escape, text) + '"'
+
+
+def _toml_escape(match: re.Match[str]) -> str:
+    return _TOML_ESCAPES[match.group()]
@@ -0,0 +1,6 @@
+"""Built-in command file formats.
+
+Each module holds the generator for one family of formats and is imported the
+first time a command in that format is generated; see
+:class:`slash_commands.generators.GeneratorRegistry`.
+"""
@@ -0,0 +1,161 @@
+"""Kiro CLI prompts and Kiro IDE steering files."""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Sequence
+from typing import Any
+
+from mcp_server.prompt_utils import MarkdownPrompt
+from slash_commands.config import AgentConfig
+from slash_commands.emitters import emit_yaml
+from slash_commands.generators import (
+    __version__,
+    _apply_agent_overrides,
+    _normalize_output,
+    _replace_placeholders,
+)
+from slash_commands.run_context import RunContext
+
+
+def _strip_ordering_prefix(name: str) -> str:
+    """Strip ordering prefixes like 'SDD-1-' from a prompt name."""
+    return re.sub(r"^[A-Z]+-\d+-", "", name)
+
+
+class KiroCommandGenerator:
+    """Generator for Kiro CLI prompts.
+
+    Kiro CLI expects simple markdown files with no frontmatter.
+    The prompt content is injected directly when the user invokes @prompt-name.
+    Tracking metadata is appended as a trailing HTML comment so it does not
+    interfere with the prompt instructions the model sees first.
+    """
+
+    def generate(
+        self,
+        prompt: MarkdownPrompt,
+        agent: AgentConfig,
+        source_metadata: dict[str, Any] | None = None,
+        context: RunContext | None = None,
+    ) -> str:
+        """Generate a Kiro CLI prompt file.
+
+        Args:
+            prompt: The source prompt to generate from
+            agent: The agent configuration
+            source_metadata: Optional source metadata (local or GitHub)
+            context: Run context supplying the timestamp; captured now if None
+
+        Returns:
+            Simple markdown content for Kiro CLI
+        """
+        _description, arguments, _enabled = _apply_agent_overrides(prompt, agent)
+
+        # Replace placeholders in body
+        body = _replace_placeholders(prompt.body, arguments, replace_double_braces=True)
+
+        # Output the prompt body directly — no extra headers or preamble.
+        # The body already contains its own structure (headings, sections, etc.)
+        output = body + "\n"
+
+        # Append tracking metadata as a trailing HTML comment.
+        # Placed at the end so it doesn't pollute the instructions the model sees first.
+        meta_lines = [
+            f"source: {prompt.name}",
+            f"version: {__version__}",
+            f"updated: {(context or RunContext.create()).updated_date}",
+        ]
+        if source_metadata:
+            if "source_repo" in source_metadata:
+                meta_lines.append(f"repo: {source_metadata['source_repo']}")
+
+        output += "\n<!-- slash-command-manager: " + " | ".join(meta_lines) + " -->\n"
+
+        return _normalize_output(output)
+
+    def generate_many(
+        self,
+        prompt: MarkdownPrompt,
+        agents: Sequence[AgentConfig],
+        source_metadata: dict[str, Any] | None = None,
+        context: RunContext | None = None,
+    ) -> list[str]:
+        """Generate the files for agents from one :class:`RenderGroup`.
+
+        The output only depends on the agent through its overrides, which are the
+        same across a group, so it is rendered once.
+        """
+        return [self.generate(prompt, agents[0], source_metadata, context)] * len(agents)
+
+
+class KiroIdeCommandGenerator:
+    """Generator for Kiro IDE steering files.
+
+    Kiro IDE expects markdown files with YAML frontmatter containing
+    inclusion mode. Files are stored at ~/.kiro/steering/*.md and
+    are manually included via / command markers in chat.
+    """
+
+    def generate(
+        self,
+        prompt: MarkdownPrompt,
+        agent: AgentConfig,
+        source_metadata: dict[str, Any] | None = None,
+        context: RunContext | None = None,
+    ) -> str:
+        """Generate a Kiro IDE steering file.
+
+        Args:
+            prompt: The source prompt to generate from
+            agent: The agent configuration
+            source_metadata: Optional source metadata (local or GitHub)
+            context: Run context supplying the timestamp; captured now if None
+
+        Returns:
+            Markdown with Kiro IDE steering frontmatter
+        """
+        description, arguments, _enabled = _apply_agent_overrides(prompt, agent)
+
+        # Build Kiro IDE steering frontmatter with inclusion first, then name, description, tools
+        frontmatter: dict[str, Any] = {
+            "inclusion": "manual",
+            "name": prompt.name,
+            "description": description,
+            "tools": ["*"],
+        }
+
+        # Replace placeholders and rewrite command references (/ prefix for steering files)
+        body = _replace_placeholders(prompt.body, arguments, replace_double_braces=True)
+
+        # Format as YAML frontmatter + body
+        yaml_content = emit_yaml(frontmatter)
+        output = f"---\n{yaml_content}---\n\n{body}\n"
+
+        # Append tracking metadata as a trailing HTML comment
+        meta_lines = [
+            f"source: {prompt.name}",
+            f"version: {__version__}",
+            f"updated: {(context or RunContext.create()).updated_date}",
+        ]
+        if source_metadata:
+            if "source_repo" in source_metadata:
+                meta_lines.append(f"repo: {source_metadata['source_repo']}")
+
+        output += "\n<!-- slash-command-manager: " + " | ".join(meta_lines) + " -->\n"
+
+        return _normalize_output(output)
+
+    def generate_many(
+        self,
+        prompt: MarkdownPrompt,
+        agents: Sequence[AgentConfig],
+        source_metadata: dict[str, Any] | None = None,
+        context: RunContext | None = None,
+    ) -> list[str]:
+        """Generate the files for agents from one :class:`RenderGroup`.
+
+        The output only depends on the agent through its overrides, which are the
+        same across a group, so it is rendered once.
+        """
+        return [self.generate(prompt, agents[0], source_metadata, context)] * len(agents)
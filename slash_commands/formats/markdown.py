@@ -0,0 +1,215 @@
+"""Markdown command files with YAML frontmatter."""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import Any
+
+from mcp_server.prompt_utils import MarkdownPrompt
+from slash_commands.config import AgentConfig
+from slash_commands.emitters import emit_yaml
+from slash_commands.generators import (
+    CommandChunks,
+    __version__,
+    _apply_agent_overrides,
+    _encode_parts,
+    _is_scalar,
+    _normalize_output,
+    _normalize_split_output,
+    _replace_placeholders,
+)
+from slash_commands.run_context import RunContext
+
+# Keys of the Markdown ``meta`` block that differ between agents of one render group
+_AGENT_META_KEYS = (
+    "agent",
+    "agent_display_name",
+    "command_dir",
+    "command_format",
+    "command_file_extension",
+)
+
+
+def _dump_yaml(data: dict[str, Any]) -> str:
+    return emit_yaml(data)
+
+
+def _dump_nested_entries(entries: dict[str, Any]) -> str:
+    """Dump ``entries`` as they appear indented under a top-level key."""
+    if not entries:
+        return ""
+    return _dump_yaml({"meta": entries}).partition("\n")[2]
+
+
+class MarkdownCommandGenerator:
+    """Generator for Markdown-format slash commands."""
+
+    def generate(
+        self,
+        prompt: MarkdownPrompt,
+        agent: AgentConfig,
+        source_metadata: dict[str, Any] | None = None,
+        context: RunContext | None = None,
+    ) -> str:
+        """Generate a Markdown-formatted command file.
+
+        Args:
+            prompt: The source prompt to generate from
+            agent: The agent configuration
+            source_metadata: Optional source metadata (local or GitHub)
+            context: Run context supplying the timestamp; captured now if None
+
+        Returns:
+            Complete markdown file content
+        """
+        return self.generate_many(prompt, [agent], source_metadata, context)[0]
+
+    def generate_many(
+        self,
+        prompt: MarkdownPrompt,
+        agents: Sequence[AgentConfig],
+        source_metadata: dict[str, Any] | None = None,
+        context: RunContext | None = None,
+    ) -> list[str]:
+        """Generate the command files for agents from one :class:`RenderGroup`.
+
+        The frontmatter above ``meta`` and the body are the same for every agent in
+        a group, so they are dumped and normalized once; only the ``meta`` block is
+        rendered per agent.
+
+        Returns:
+            Complete markdown file content for each agent, in order
+        """
+        return [
+            "".join(parts) for parts in self._render_parts(prompt, agents, source_metadata, context)
+        ]
+
+    def generate_many_bytes(
+        self,
+        prompt: MarkdownPrompt,
+        agents: Sequence[AgentConfig],
+        source_metadata: dict[str, Any] | None = None,
+        context: RunContext | None = None,
+    ) -> list[CommandChunks]:
+        """Like :meth:`generate_many`, as UTF-8 chunks with the body encoded once per group."""
+        return _encode_parts(self._render_parts(prompt, agents, source_metadata, context))
+
+    def _render_parts(
+        self,
+        prompt: MarkdownPrompt,
+        agents: Sequence[AgentConfig],
+        source_metadata: dict[str, Any] | None,
+        context: RunContext | None,
+    ) -> list[tuple[str, ...]]:
+        """Render each agent's file as parts; the normalized body part is shared."""
+        description, arguments, enabled = _apply_agent_overrides(prompt, agents[0])
+
+        # Build frontmatter
+        frontmatter = {
+            "name": self._get_command_name(prompt, agents[0]),
+            "description": description,
+            "tags": sorted(prompt.tags) if prompt.tags else [],
+            "enabled": enabled,
+            "arguments": [
+                {
+                    "name": arg.name,
+                    "description": arg.description,
+                    "required": arg.required,
+                }
+                for arg in arguments
+            ],
+        }
+        updated_at = (context or RunContext.create()).updated_at
+        metas = [self._build_meta(prompt, agent, source_metadata, updated_at) for agent in agents]
+
+        # Replace placeholders in body
+        body = _replace_placeholders(prompt.body, arguments, replace_double_braces=False)
+        tail = f"---\n\n{body}\n"
+
+        if not all(
+            _is_scalar(value)
+            for value in (
+                description,
+                enabled,
+                *(arg.description for arg in arguments),
+                *(arg.required for arg in arguments),
+            )
+        ):
+            # Containers may be shared with meta and emitted as YAML aliases, which
+            # only happens when the frontmatter is dumped as one document
+            return [(self._render(frontmatter | {"meta": meta}, tail),) for meta in metas]
+
+        # Block mapping entries are emitted independently, so dumping the shared keys
+        # and ``meta`` separately gives the same YAML as one dump
+        shared = "---\n" + _dump_yaml(frontmatter)
+        normalized_tail = _normalize_output(tail)
+        return [
+            _normalize_split_output(shared + meta_yaml, tail, normalized_tail)
+            for meta_yaml in self._dump_metas(metas)
+        ]
+
+    def _dump_metas(self, metas: list[dict[str, Any]]) -> list[str]:
+        """Dump each agent's ``meta`` block, dumping the entries they share only once.
+
+        Falls back to one dump per agent unless the agent-specific keys are adjacent
+        (``prompt.meta`` did not already define one of them) and every entry from
+        them on is a scalar that cannot be emitted as an alias.
+        """
+        keys = list(metas[0])
+        start = keys.index(_AGENT_META_KEYS[0])
+        end = start + len(_AGENT_META_KEYS)
+        if (
+            len(metas) == 1
+            or tuple(keys[start:end]) != _AGENT_META_KEYS
+            or not all(_is_scalar(metas[0][key]) for key in keys[start:])
+        ):
+            return [_dump_yaml({"meta": meta}) for meta in metas]
+
+        before = _dump_nested_entries({key: metas[0][key] for key in keys[:start]})
+        after = _dump_nested_entries({key: metas[0][key] for key in keys[end:]})
+        return [
+            "meta:\n"
+            + before
+            + _dump_nested_entries({key: meta[key] for key in _AGENT_META_KEYS})
+            + after
+            for meta in metas
+        ]
+
+    def _render(self, frontmatter: dict[str, Any], tail: str) -> str:
+        # Format as YAML frontmatter + body
+        return _normalize_output(f"---\n{_dump_yaml(frontmatter)}{tail}")
+
+    def _get_command_name(self, prompt: MarkdownPrompt, agent: AgentConfig) -> str:
+        """Get the command name with optional prefix."""
+        prefix = prompt.meta.get("command_prefix", "") if prompt.meta else ""
+        return f"{prefix}{prompt.name}"
+
+    def _build_meta(
+        self,
+        prompt: MarkdownPrompt,
+        agent: AgentConfig,
+        source_metadata: dict[str, Any] | None = None,
+        updated_at: str | None = None,
+    ) -> dict:
+        """Build metadata section for the command."""
+        meta = prompt.meta.copy() if prompt.meta else {}
+        meta.update(
+            {
+                "agent": agent.key,
+                "agent_display_name": agent.display_name,
+                "command_dir": agent.get_command_dir(),
+                "command_format": agent.command_format.value,
+                "command_file_extension": agent.command_file_extension,
+                "source_prompt": prompt.name,
+                # Store only basename to avoid leaking absolute paths
+                "source_path": prompt.path.name,
+                "version": __version__,
+                "updated_at": updated_at or RunContext.create().updated_at,
+            }
+        )
+
+        # Add source tracking metadata if provided
+        if source_metadata:
+            meta.update(source_metadata)
+
+        return meta
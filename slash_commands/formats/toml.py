@@ -0,0 +1,139 @@
+"""TOML command files (Gemini CLI custom commands)."""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import Any
+
+from mcp_server.prompt_utils import MarkdownPrompt
+from slash_commands.config import AgentConfig
+from slash_commands.emitters import emit_toml
+from slash_commands.generators import (
+    CommandChunks,
+    __version__,
+    _apply_agent_overrides,
+    _encode_parts,
+    _is_scalar,
+    _normalize_output,
+    _normalizes_separately,
+    _replace_placeholders,
+)
+from slash_commands.run_context import RunContext
+
+
+class TomlCommandGenerator:
+    """Generator for TOML-format slash commands (Gemini CLI spec)."""
+
+    def generate(
+        self,
+        prompt: MarkdownPrompt,
+        agent: AgentConfig,
+        source_metadata: dict[str, Any] | None = None,
+        context: RunContext | None = None,
+    ) -> str:
+        """Generate a TOML-formatted command file following Gemini CLI spec.
+
+        According to https://geminicli.com/docs/cli/custom-commands/:
+        - Required field: `prompt` (String)
+        - Optional field: `description` (String)
+        - {{args}} placeholder is preserved (not replaced)
+
+        Args:
+            prompt: The source prompt to generate from
+            agent: The agent configuration
+            source_metadata: Optional source metadata (local or GitHub)
+            context: Run context supplying the timestamp; captured now if None
+
+        Returns:
+            Complete TOML file content
+        """
+        return self.generate_many(prompt, [agent], source_metadata, context)[0]
+
+    def generate_many(
+        self,
+        prompt: MarkdownPrompt,
+        agents: Sequence[AgentConfig],
+        source_metadata: dict[str, Any] | None = None,
+        context: RunContext | None = None,
+    ) -> list[str]:
+        """Generate the command files for agents from one :class:`RenderGroup`.
+
+        The ``prompt`` and ``description`` keys are serialized once; only the
+        ``[meta]`` table is serialized per agent.
+
+        Returns:
+            Complete TOML file content for each agent, in order
+        """
+        return [
+            "".join(parts) for parts in self._render_parts(prompt, agents, source_metadata, context)
+        ]
+
+    def generate_many_bytes(
+        self,
+        prompt: MarkdownPrompt,
+        agents: Sequence[AgentConfig],
+        source_metadata: dict[str, Any] | None = None,
+        context: RunContext | None = None,
+    ) -> list[CommandChunks]:
+        """Like :meth:`generate_many`, as UTF-8 chunks with the prompt encoded once per group."""
+        return _encode_parts(self._render_parts(prompt, agents, source_metadata, context))
+
+    def _render_parts(
+        self,
+        prompt: MarkdownPrompt,
+        agents: Sequence[AgentConfig],
+        source_metadata: dict[str, Any] | None,
+        context: RunContext | None,
+    ) -> list[tuple[str, ...]]:
+        """Render each agent's file as parts; the normalized top-level keys are shared."""
+        description, arguments, _enabled = _apply_agent_overrides(prompt, agents[0])
+
+        # Replace $ARGUMENTS with markdown-formatted arguments
+        # But preserve {{args}} placeholder for Gemini CLI context-aware injection
+        prompt_text = _replace_placeholders(prompt.body, arguments, replace_double_braces=False)
+
+        # Build TOML structure following official Gemini CLI spec
+        # Only include 'description' if it exists, 'prompt' is always required
+        toml_data = {"prompt": prompt_text}
+        if description:
+            toml_data["description"] = description
+
+        # Add metadata fields (version tracking for our tooling)
+        # These are ignored by Gemini CLI but preserved for bookkeeping
+        updated_at = (context or RunContext.create()).updated_at
+        metas = []
+        for agent in agents:
+            meta = {
+                "version": __version__,
+                "updated_at": updated_at,
+                "source_prompt": prompt.name,
+                "agent": agent.key,
+            }
+            # Add source tracking metadata if provided
+            if source_metadata:
+                meta.update(source_metadata)
+            metas.append(meta)
+
+        if not _is_scalar(description):
+            # A table-valued description is emitted after the top-level keys
+            return [
+                (_normalize_output(self._dict_to_toml(toml_data | {"meta": m})),) for m in metas
+            ]
+
+        # Top-level keys come first and [meta] follows after a blank line, so the
+        # shared keys and the table can be serialized separately
+        shared = self._dict_to_toml(toml_data)
+        if not _normalizes_separately(shared):
+            return [
+                (_normalize_output(shared + "\n" + self._dict_to_toml({"meta": meta})),)
+                for meta in metas
+            ]
+        normalized_shared = _normalize_output(shared)
+        return [
+            (normalized_shared, _normalize_output("\n" + self._dict_to_toml({"meta": meta})))
+            for meta in metas
+        ]
+
+    def _dict_to_toml(self, data: dict) -> str:
+        """Convert a dict to TOML format."""
+        return emit_toml(data)
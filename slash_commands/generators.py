@@ -1,14 +1,29 @@
-"""Generators for producing agent-specific slash commands."""
+"""Generators for producing agent-specific slash commands.
+
+Generators are looked up by command format in :data:`GENERATORS`. The built-in
+formats live in :mod:`slash_commands.formats`, and other packages can add or
+replace formats through the ``slash_command_manager.generators`` entry point
+group. A format's module is imported only when the first command in that
+format is generated.
+
+A generator may also implement ``generate_many_bytes()``, returning each file as
+UTF-8 byte chunks. Parts shared by the files of a render group (the prompt body,
+usually) are then encoded once, and the writer hands the chunks to the file
+without joining them. Generators without it are encoded from ``generate_many()``.
+"""
 
 from __future__ import annotations
 
+import importlib
+import os
 import re
-from datetime import UTC, datetime
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
 from typing import Any, Protocol
 
-import tomli_w
-import yaml
-
 try:
     from slash_commands.__version__ import __version__
 except ImportError:
@@ -22,6 +37,8 @@ except ImportError:
 
 from mcp_server.prompt_utils import MarkdownPrompt, PromptArgumentSpec
 from slash_commands.config import AgentConfig, CommandFormat
+from slash_commands.placeholders import PLACEHOLDERS
+from slash_commands.run_context import RunContext
 
 
 class CommandGeneratorProtocol(Protocol):
@@ -30,61 +47,89 @@ class CommandGeneratorProtocol(Protocol):
         prompt: MarkdownPrompt,
         agent: AgentConfig,
         source_metadata: dict[str, Any] | None = None,
+        context: RunContext | None = None,
     ) -> str:  # pragma: no cover - stub
         ...
 
+    def generate_many(
+        self,
+        prompt: MarkdownPrompt,
+        agents: Sequence[AgentConfig],
+        source_metadata: dict[str, Any] | None = None,
+        context: RunContext | None = None,
+    ) -> list[str]:  # pragma: no cover - stub
+        ...
+
+
+# A command file as UTF-8 chunks, written in order
+CommandChunks = tuple[bytes, ...]
+
+
+@dataclass(frozen=True)
+class RenderGroup:
+    """Agents whose command files for one prompt differ only in agent-specific fields."""
+
+    command_format: CommandFormat
+    agents: tuple[AgentConfig, ...]
+
+
+def plan_renders(prompt: MarkdownPrompt, agents: Iterable[AgentConfig]) -> list[RenderGroup]:
+    """Group agents so each group can be rendered with one ``generate_many`` call.
+
+    Agents are grouped by command format and by the override set that applies to
+    them: agents without an entry in ``agent_overrides`` share the prompt's base
+    description and arguments, while an agent with its own entry gets a group of
+    its own. Groups are ordered by their first agent.
+    """
+    overrides = prompt.resolved_overrides
+    groups: dict[tuple[CommandFormat, str | None], list[AgentConfig]] = {}
+    for agent in agents:
+        override_key = agent.key if agent.key in overrides else None
+        groups.setdefault((agent.command_format, override_key), []).append(agent)
+
+    return [
+        RenderGroup(command_format=command_format, agents=tuple(members))
+        for (command_format, _override_key), members in groups.items()
+    ]
+
 
 def _apply_agent_overrides(
     prompt: MarkdownPrompt, agent: AgentConfig
-) -> tuple[str, list[PromptArgumentSpec], bool]:
+) -> tuple[str, Sequence[PromptArgumentSpec], bool]:
     """Apply agent-specific overrides to a prompt.
 
+    Overrides are resolved when the prompt is loaded, so this is a table lookup.
+
     Returns:
         Tuple of (description, arguments, enabled)
     """
-    description = prompt.description
-    arguments = prompt.arguments
-    enabled = prompt.enabled
-
-    if prompt.agent_overrides and agent.key in prompt.agent_overrides:
-        overrides = prompt.agent_overrides[agent.key]
-        if isinstance(overrides, dict):
-            if "description" in overrides:
-                description = overrides["description"]
-            if "arguments" in overrides:
-                # Merge base arguments with override arguments
-                override_args = _normalize_override_arguments(overrides["arguments"])
-                # Override by name (override precedence), preserving base order
-                base_list = list(arguments)
-                idx_by_name = {arg.name: i for i, arg in enumerate(base_list)}
-                for oarg in override_args:
-                    if oarg.name in idx_by_name:
-                        base_list[idx_by_name[oarg.name]] = oarg
-                    else:
-                        idx_by_name[oarg.name] = len(base_list)
-                        base_list.append(oarg)
-                arguments = base_list
-            if "enabled" in overrides:
-                enabled = overrides["enabled"]
-
-    return description, arguments, enabled
-
-
-def _normalize_override_arguments(raw: list[dict[str, Any]]) -> list[PromptArgumentSpec]:
-    """Normalize argument overrides to PromptArgumentSpec objects."""
-    normalized = []
-    for entry in raw:
-        if isinstance(entry, dict):
-            name = entry.get("name")
-            if name:
-                normalized.append(
-                    PromptArgumentSpec(
-                        name=name,
-                        description=entry.get("description"),
-                        required=entry.get("required", True),
-                    )
-                )
-    return normalized
+    resolved = prompt.resolved_overrides.get(agent.key)
+    if resolved is None:
+        return prompt.description, prompt.arguments, prompt.enabled
+    return resolved.description, resolved.arguments, resolved.enabled
+
+
+# Characters str.splitlines() treats as line boundaries
+_BREAK_CHARS = "\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029"
+_LINE_BREAKS = re.compile(f"[{_BREAK_CHARS}]")
+
+# Whitespace at the end of a line. Starting the pattern with the LF lets the regex
+# engine skip ahead to each line end instead of testing a class at every character.
+_TRAILING_WHITESPACE = re.compile("\n(?<=[^\\S\n]\n)")
+
+
+def _is_normalized(content: str) -> bool:
+    """Return True if ``_normalize_output(content)`` would return ``content`` unchanged."""
+    if not content:
+        return True
+    # One LF at the end, after a non-empty last line
+    if content[-1] != "\n" or content[-2:-1] in ("", "\n"):
+        return False
+    # Single-character membership tests are memchr scans, far cheaper than a class
+    for char in _BREAK_CHARS[1:]:
+        if char in content:
+            return False
+    return _TRAILING_WHITESPACE.search(content) is None
 
 
 def _normalize_output(content: str) -> str:
@@ -95,35 +140,76 @@ def _normalize_output(content: str) -> str:
     - Ensures UTF-8 encoding
     - Preserves intentional blank lines
 
+    Content that is already normalized, the usual case, is returned as is.
+
     Args:
         content: The generated content to normalize
 
     Returns:
         Normalized content string
     """
-    # Normalize line endings to LF
-    content = content.replace("\r\n", "\n").replace("\r", "\n")
+    if _is_normalized(content):
+        return content
 
-    # Remove trailing whitespace from each line, preserve intentional blank lines
-    result = "\n".join(line.rstrip() for line in content.splitlines())
+    # splitlines() splits at CRLF, CR and every other boundary in one pass
+    result = "\n".join(map(str.rstrip, content.splitlines()))
     if result and not result.endswith("\n"):
         result += "\n"
 
     return result
 
 
-def _build_arguments_section_markdown(arguments: list[PromptArgumentSpec]) -> str:
-    """Build a markdown-formatted arguments section."""
-    if not arguments:
-        return ""
+def _normalizes_separately(head: str) -> bool:
+    """Return True if ``_normalize_output(head + tail)`` equals
+    ``_normalize_output(head) + _normalize_output(tail)`` for every ``tail``.
+
+    Lines are normalized independently, so this holds when ``head`` ends with a line
+    break, its last line is not blank and no ``\\r`` can pair with the tail.
+    """
+    content = head.rstrip()
+    trailing = head[len(content) :]
+    return (
+        bool(content)
+        and head.endswith("\n")
+        and "\r" not in head
+        and len(_LINE_BREAKS.findall(trailing)) == 1
+    )
+
+
+def _normalize_split_output(head: str, tail: str, normalized_tail: str) -> tuple[str, ...]:
+    """Return ``_normalize_output(head + tail)`` as parts, reusing the normalized tail if possible."""
+    if _normalizes_separately(head):
+        return (_normalize_output(head), normalized_tail)
+    return (_normalize_output(head + tail),)
+
+
+def _encode_parts(files: Iterable[tuple[str, ...]]) -> list[CommandChunks]:
+    """Encode files given as string parts, encoding each distinct part once.
+
+    Parts shared between files (the same body under different per-agent headers)
+    become the same ``bytes`` object. Empty parts are dropped.
+    """
+    encoded: dict[str, bytes] = {}
+    result = []
+    for parts in files:
+        chunks = []
+        for part in parts:
+            if part:
+                chunk = encoded.get(part)
+                if chunk is None:
+                    chunk = encoded[part] = part.encode("utf-8")
+                chunks.append(chunk)
+        result.append(tuple(chunks))
+    return result
+
+
+def _is_scalar(value: Any) -> bool:
+    return value is None or isinstance(value, str | bool | int | float)
+
 
-    lines = []
-    for arg in arguments:
-        if arg.required:
-            lines.append(f"- `<{arg.name}>` (required): {arg.description or ''}")
-        else:
-            lines.append(f"- `[{arg.name}]` (optional): {arg.description or ''}")
-    return "\n".join(lines)
+# Placeholder sets used by the built-in formats; see slash_commands.placeholders
+ARGUMENT_PLACEHOLDERS = frozenset({"`$ARGUMENTS`", "$ARGUMENTS"})
+ALL_ARGUMENT_PLACEHOLDERS = ARGUMENT_PLACEHOLDERS | {"{{args}}"}
 
 
 def _replace_placeholders(
@@ -136,271 +222,180 @@ def _replace_placeholders(
         arguments: List of argument specs
         replace_double_braces: If True, replace {{args}} with comma-separated names
     """
-    result = body
+    tokens = ALL_ARGUMENT_PLACEHOLDERS if replace_double_braces else ARGUMENT_PLACEHOLDERS
+    return PLACEHOLDERS.compile(tokens).substitute(body, arguments)
 
-    # Replace $ARGUMENTS with markdown-formatted arguments
-    if "$ARGUMENTS" in result:
-        args_section = _build_arguments_section_markdown(arguments)
-        # Replace `$ARGUMENTS` first (with backticks), then $ARGUMENTS (without backticks)
-        result = result.replace("`$ARGUMENTS`", args_section)
-        result = result.replace("$ARGUMENTS", args_section)
 
-    # Replace {{args}} with argument names (only if flag is True)
-    if replace_double_braces and "{{args}}" in result:
-        arg_names = [arg.name for arg in arguments]
-        result = result.replace("{{args}}", ", ".join(arg_names))
+@dataclass(frozen=True)
+class RenderedCommand:
+    """One command file produced by :meth:`CommandGenerator.render_many`."""
 
-    return result
+    prompt: MarkdownPrompt
+    agent: AgentConfig
+    content: str
 
 
-class MarkdownCommandGenerator:
-    """Generator for Markdown-format slash commands."""
+# Prompts sent to a worker process at a time by CommandGenerator.render_many
+_RENDER_CHUNK_SIZE = 64
 
-    def generate(
-        self,
-        prompt: MarkdownPrompt,
-        agent: AgentConfig,
-        source_metadata: dict[str, Any] | None = None,
-    ) -> str:
-        """Generate a Markdown-formatted command file.
 
-        Args:
-            prompt: The source prompt to generate from
-            agent: The agent configuration
-            source_metadata: Optional source metadata (local or GitHub)
+class _PromptRenderer:
+    """Render prompts for a fixed list of agents, one ``generate_many`` call per render group.
 
-        Returns:
-            Complete markdown file content
-        """
-        description, arguments, enabled = _apply_agent_overrides(prompt, agent)
-
-        # Build frontmatter
-        frontmatter = {
-            "name": self._get_command_name(prompt, agent),
-            "description": description,
-            "tags": sorted(prompt.tags) if prompt.tags else [],
-            "enabled": enabled,
-            "arguments": [
-                {
-                    "name": arg.name,
-                    "description": arg.description,
-                    "required": arg.required,
-                }
-                for arg in arguments
-            ],
-            "meta": self._build_meta(prompt, agent, source_metadata),
-        }
-
-        # Replace placeholders in body
-        body = _replace_placeholders(prompt.body, arguments, replace_double_braces=False)
-
-        # Format as YAML frontmatter + body
-        yaml_content = yaml.safe_dump(frontmatter, allow_unicode=True, sort_keys=False)
-        output = f"---\n{yaml_content}---\n\n{body}\n"
-        return _normalize_output(output)
-
-    def _get_command_name(self, prompt: MarkdownPrompt, agent: AgentConfig) -> str:
-        """Get the command name with optional prefix."""
-        prefix = prompt.meta.get("command_prefix", "") if prompt.meta else ""
-        return f"{prefix}{prompt.name}"
-
-    def _build_meta(
-        self,
-        prompt: MarkdownPrompt,
-        agent: AgentConfig,
-        source_metadata: dict[str, Any] | None = None,
-    ) -> dict:
-        """Build metadata section for the command."""
-        meta = prompt.meta.copy() if prompt.meta else {}
-        meta.update(
-            {
-                "agent": agent.key,
-                "agent_display_name": agent.display_name,
-                "command_dir": agent.get_command_dir(),
-                "command_format": agent.command_format.value,
-                "command_file_extension": agent.command_file_extension,
-                "source_prompt": prompt.name,
-                # Store only basename to avoid leaking absolute paths
-                "source_path": prompt.path.name,
-                "version": __version__,
-                "updated_at": datetime.now(UTC).isoformat(),
-            }
-        )
-
-        # Add source tracking metadata if provided
-        if source_metadata:
-            meta.update(source_metadata)
-
-        return meta
-
-
-class TomlCommandGenerator:
-    """Generator for TOML-format slash commands (Gemini CLI spec)."""
+    One generator per command format is created and reused for every prompt.
+    """
 
-    def generate(
+    def __init__(
         self,
-        prompt: MarkdownPrompt,
-        agent: AgentConfig,
-        source_metadata: dict[str, Any] | None = None,
-    ) -> str:
-        """Generate a TOML-formatted command file following Gemini CLI spec.
-
-        According to https://geminicli.com/docs/cli/custom-commands/:
-        - Required field: `prompt` (String)
-        - Optional field: `description` (String)
-        - {{args}} placeholder is preserved (not replaced)
-
-        Args:
-            prompt: The source prompt to generate from
-            agent: The agent configuration
-            source_metadata: Optional source metadata (local or GitHub)
-
-        Returns:
-            Complete TOML file content
-        """
-        description, arguments, _enabled = _apply_agent_overrides(prompt, agent)
-
-        # Replace $ARGUMENTS with markdown-formatted arguments
-        # But preserve {{args}} placeholder for Gemini CLI context-aware injection
-        prompt_text = _replace_placeholders(prompt.body, arguments, replace_double_braces=False)
+        agents: Sequence[AgentConfig],
+        source_metadata: dict[str, Any] | None,
+        context: RunContext,
+    ):
+        self.agents = tuple(agents)
+        self.source_metadata = source_metadata
+        self.context = context
+        self._generators: dict[CommandFormat, CommandGeneratorProtocol] = {}
+
+    def render(self, prompt: MarkdownPrompt) -> dict[str, str]:
+        """Return the command file content for every agent, by agent key."""
+        contents: dict[str, str] = {}
+        for group in plan_renders(prompt, self.agents):
+            rendered = self.generator(group.command_format).generate_many(
+                prompt, group.agents, self.source_metadata, self.context
+            )
+            contents.update(
+                (agent.key, content) for agent, content in zip(group.agents, rendered, strict=True)
+            )
+        return contents
+
+    def render_bytes(
+        self, prompt: MarkdownPrompt, agents: Sequence[AgentConfig] | None = None
+    ) -> dict[str, CommandChunks]:
+        """Return the command file for every agent (or ``agents``) as UTF-8 chunks, by agent key."""
+        contents: dict[str, CommandChunks] = {}
+        for group in plan_renders(prompt, self.agents if agents is None else agents):
+            generator = self.generator(group.command_format)
+            generate_bytes = getattr(generator, "generate_many_bytes", None)
+            if generate_bytes is not None:
+                rendered = generate_bytes(prompt, group.agents, self.source_metadata, self.context)
+            else:
+                rendered = _encode_parts(
+                    (content,)
+                    for content in generator.generate_many(
+                        prompt, group.agents, self.source_metadata, self.context
+                    )
+                )
+            contents.update(
+                (agent.key, chunks) for agent, chunks in zip(group.agents, rendered, strict=True)
+            )
+        return contents
 
-        # Build TOML structure following official Gemini CLI spec
-        # Only include 'description' if it exists, 'prompt' is always required
-        toml_data = {"prompt": prompt_text}
-        if description:
-            toml_data["description"] = description
+    def generator(self, command_format: CommandFormat) -> CommandGeneratorProtocol:
+        """The generator this renderer uses for ``command_format``, created on first use."""
+        generator = self._generators.get(command_format)
+        if generator is None:
+            generator = self._generators[command_format] = CommandGenerator.create(command_format)
+        return generator
 
-        # Add metadata fields (version tracking for our tooling)
-        # These are ignored by Gemini CLI but preserved for bookkeeping
-        toml_data["meta"] = {
-            "version": __version__,
-            "updated_at": datetime.now(UTC).isoformat(),
-            "source_prompt": prompt.name,
-            "agent": agent.key,
-        }
 
-        # Add source tracking metadata if provided
-        if source_metadata:
-            toml_data["meta"].update(source_metadata)
+def _render_chunk(renderer: _PromptRenderer, prompts: list[MarkdownPrompt]) -> list[list[str]]:
+    """Worker-process entry point: contents per prompt, in agent order."""
+    return [
+        [contents[agent.key] for agent in renderer.agents]
+        for contents in map(renderer.render, prompts)
+    ]
 
-        # Convert to TOML format
-        output = self._dict_to_toml(toml_data)
-        return _normalize_output(output)
 
-    def _dict_to_toml(self, data: dict) -> str:
-        """Convert a dict to TOML format."""
-        return tomli_w.dumps(data)
+ENTRY_POINT_GROUP = "slash_command_manager.generators"
 
+GeneratorFactory = Callable[[], CommandGeneratorProtocol]
 
-def _strip_ordering_prefix(name: str) -> str:
-    """Strip ordering prefixes like 'SDD-1-' from a prompt name."""
-    return re.sub(r"^[A-Z]+-\d+-", "", name)
+# "module:attribute" of the generator class for each built-in format
+_BUILTIN_GENERATORS = {
+    CommandFormat.MARKDOWN: "slash_commands.formats.markdown:MarkdownCommandGenerator",
+    CommandFormat.TOML: "slash_commands.formats.toml:TomlCommandGenerator",
+    CommandFormat.KIRO: "slash_commands.formats.kiro:KiroCommandGenerator",
+    CommandFormat.KIRO_IDE: "slash_commands.formats.kiro:KiroIdeCommandGenerator",
+}
 
 
-class KiroCommandGenerator:
-    """Generator for Kiro CLI prompts.
+class GeneratorRegistry:
+    """Generator factories keyed by command format, imported on first use.
 
-    Kiro CLI expects simple markdown files with no frontmatter.
-    The prompt content is injected directly when the user invokes @prompt-name.
-    Tracking metadata is appended as a trailing HTML comment so it does not
-    interfere with the prompt instructions the model sees first.
+    A factory is a callable returning a generator, or a ``"module:attribute"``
+    reference to one. References are only imported when a generator for that
+    format is first created. Lookup order is: :meth:`register`, then entry points
+    in :data:`ENTRY_POINT_GROUP` (named after the format value, e.g. ``toml``),
+    then the built-in formats.
     """
 
-    def generate(
+    def __init__(
         self,
-        prompt: MarkdownPrompt,
-        agent: AgentConfig,
-        source_metadata: dict[str, Any] | None = None,
-    ) -> str:
-        """Generate a Kiro CLI prompt file.
-
-        Args:
-            prompt: The source prompt to generate from
-            agent: The agent configuration
-            source_metadata: Optional source metadata (local or GitHub)
-
-        Returns:
-            Simple markdown content for Kiro CLI
+        builtins: dict[CommandFormat, str] | None = None,
+        entry_point_group: str | None = ENTRY_POINT_GROUP,
+    ):
+        self._builtins = dict(_BUILTIN_GENERATORS if builtins is None else builtins)
+        self._entry_point_group = entry_point_group
+        self._registered: dict[CommandFormat, GeneratorFactory | str] = {}
+        self._entry_points: dict[str, Any] | None = None
+        self._factories: dict[CommandFormat, GeneratorFactory] = {}
+
+    def register(self, format: CommandFormat, factory: GeneratorFactory | str) -> None:
+        """Use ``factory`` for ``format``, replacing any earlier choice."""
+        self._registered[format] = factory
+        self._factories.pop(format, None)
+
+    def create(self, format: CommandFormat) -> CommandGeneratorProtocol:
+        """Create a generator for ``format``.
+
+        Raises:
+            ValueError: If no generator is available for the format
         """
-        _description, arguments, _enabled = _apply_agent_overrides(prompt, agent)
-
-        # Replace placeholders in body
-        body = _replace_placeholders(prompt.body, arguments, replace_double_braces=True)
-
-        # Output the prompt body directly — no extra headers or preamble.
-        # The body already contains its own structure (headings, sections, etc.)
-        output = body + "\n"
-
-        # Append tracking metadata as a trailing HTML comment.
-        # Placed at the end so it doesn't pollute the instructions the model sees first.
-        meta_lines = [
-            f"source: {prompt.name}",
-            f"version: {__version__}",
-            f"updated: {datetime.now(UTC).strftime('%Y-%m-%d')}",
+        factory = self._factories.get(format)
+        if factory is None:
+            factory = self._factories[format] = self._load(format)
+        return factory()
+
+    def formats(self) -> list[CommandFormat]:
+        """Formats a generator is available for, without importing any of them."""
+        names = self._discover_entry_points()
+        return [
+            format
+            for format in CommandFormat
+            if format in self._registered or format.value in names or format in self._builtins
         ]
-        if source_metadata:
-            if "source_repo" in source_metadata:
-                meta_lines.append(f"repo: {source_metadata['source_repo']}")
 
-        output += "\n<!-- slash-command-manager: " + " | ".join(meta_lines) + " -->\n"
+    def _load(self, format: CommandFormat) -> GeneratorFactory:
+        factory: GeneratorFactory | str | None = self._registered.get(format)
+        if factory is None:
+            entry_point = self._discover_entry_points().get(format.value)
+            if entry_point is not None:
+                return entry_point.load()
+            factory = self._builtins.get(format)
+        if factory is None:
+            raise ValueError(f"Unsupported command format: {format}")
+        if isinstance(factory, str):
+            module_name, _, attribute = factory.partition(":")
+            return getattr(importlib.import_module(module_name), attribute)
+        return factory
 
-        return _normalize_output(output)
+    def _discover_entry_points(self) -> dict[str, Any]:
+        if self._entry_points is None:
+            self._entry_points = {}
+            if self._entry_point_group:
+                from importlib.metadata import entry_points
 
+                for entry_point in entry_points(group=self._entry_point_group):
+                    self._entry_points.setdefault(entry_point.name, entry_point)
+        return self._entry_points
 
-class KiroIdeCommandGenerator:
-    """Generator for Kiro IDE steering files.
 
-    Kiro IDE expects markdown files with YAML frontmatter containing
-    inclusion mode. Files are stored at ~/.kiro/steering/*.md and
-    are manually included via / command markers in chat.
-    """
+GENERATORS = GeneratorRegistry()
 
-    def generate(
-        self,
-        prompt: MarkdownPrompt,
-        agent: AgentConfig,
-        source_metadata: dict[str, Any] | None = None,
-    ) -> str:
-        """Generate a Kiro IDE steering file.
-
-        Args:
-            prompt: The source prompt to generate from
-            agent: The agent configuration
-            source_metadata: Optional source metadata (local or GitHub)
 
-        Returns:
-            Markdown with Kiro IDE steering frontmatter
-        """
-        description, arguments, _enabled = _apply_agent_overrides(prompt, agent)
-
-        # Build Kiro IDE steering frontmatter with inclusion first, then name, description, tools
-        frontmatter: dict[str, Any] = {
-            "inclusion": "manual",
-            "name": prompt.name,
-            "description": description,
-            "tools": ["*"],
-        }
-
-        # Replace placeholders and rewrite command references (/ prefix for steering files)
-        body = _replace_placeholders(prompt.body, arguments, replace_double_braces=True)
-
-        # Format as YAML frontmatter + body
-        yaml_content = yaml.safe_dump(frontmatter, allow_unicode=True, sort_keys=False)
-        output = f"---\n{yaml_content}---\n\n{body}\n"
-
-        # Append tracking metadata as a trailing HTML comment
-        meta_lines = [
-            f"source: {prompt.name}",
-            f"version: {__version__}",
-            f"updated: {datetime.now(UTC).strftime('%Y-%m-%d')}",
-        ]
-        if source_metadata:
-            if "source_repo" in source_metadata:
-                meta_lines.append(f"repo: {source_metadata['source_repo']}")
-
-        output += "\n<!-- slash-command-manager: " + " | ".join(meta_lines) + " -->\n"
-
-        return _normalize_output(output)
+def register_generator(format: CommandFormat, factory: GeneratorFactory | str) -> None:
+    """Register a generator for ``format`` on the default registry."""
+    GENERATORS.register(format, factory)
 
 
 class CommandGenerator:
@@ -409,13 +404,81 @@ class CommandGenerator:
     @staticmethod
     def create(format: CommandFormat) -> CommandGeneratorProtocol:
         """Factory method to create a generator for the specified format."""
-        if format == CommandFormat.MARKDOWN:
-            return MarkdownCommandGenerator()
-        elif format == CommandFormat.TOML:
-            return TomlCommandGenerator()
-        elif format == CommandFormat.KIRO:
-            return KiroCommandGenerator()
-        elif format == CommandFormat.KIRO_IDE:
-            return KiroIdeCommandGenerator()
-        else:
-            raise ValueError(f"Unsupported command format: {format}")
+        return GENERATORS.create(format)
+
+    @staticmethod
+    def render_many(
+        prompts: Iterable[MarkdownPrompt],
+        agents: Sequence[AgentConfig],
+        source_metadata: dict[str, Any] | None = None,
+        context: RunContext | None = None,
+        workers: int | None = None,
+    ) -> Iterator[RenderedCommand]:
+        """Render every prompt for every agent.
+
+        Work shared across the matrix is done once: agent overrides, the argument
+        section and the frontmatter and body shared by a :class:`RenderGroup` are
+        rendered once per group, and one generator per format serves the whole batch.
+        All files carry the timestamp of a single run context. Disabled prompts are
+        rendered like any other.
+
+        Args:
+            prompts: Prompts to render; consumed lazily
+            agents: Agents to render each prompt for
+            source_metadata: Optional source metadata (local or GitHub)
+            context: Run context supplying the timestamp; captured once if None
+            workers: Number of worker processes, capped at the CPU count. None or 1
+                renders in this process; prompts and results are pickled, so a pool
+                pays off only for large catalogs.
+
+        Yields:
+            Rendered files, prompt by prompt and in ``agents`` order within a prompt
+        """
+        if workers is not None and workers < 1:
+            raise ValueError(f"workers must be at least 1, got {workers}")
+
+        renderer = _PromptRenderer(agents, source_metadata, context or RunContext.create())
+        # More processes than CPUs only adds pickling and scheduling overhead
+        workers = min(workers or 1, os.cpu_count() or 1)
+        if workers == 1:
+            for prompt in prompts:
+                contents = renderer.render(prompt)
+                for agent in renderer.agents:
+                    yield RenderedCommand(prompt, agent, contents[agent.key])
+            return
+
+        remaining = iter(prompts)
+        # Keep a bounded window of chunks in flight so results stream in order
+        pending: deque[tuple[list[MarkdownPrompt], Future[list[list[str]]]]] = deque()
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+
+            def submit_next() -> None:
+                chunk = list(islice(remaining, _RENDER_CHUNK_SIZE))
+                if chunk:
+                    pending.append((chunk, executor.submit(_render_chunk, renderer, chunk)))
+
+            for _ in range(workers * 2):
+                submit_next()
+            while pending:
+                chunk, future = pending.popleft()
+                results = future.result()
+                submit_next()
+                for prompt, contents in zip(chunk, results, strict=True):
+                    for agent, content in zip(renderer.agents, contents, strict=True):
+                        yield RenderedCommand(prompt, agent, content)
+
+
+_FORMAT_CLASSES = {
+    "MarkdownCommandGenerator": "slash_commands.formats.markdown",
+    "TomlCommandGenerator": "slash_commands.formats.toml",
+    "KiroCommandGenerator": "slash_commands.formats.kiro",
+    "KiroIdeCommandGenerator": "slash_commands.formats.kiro",
+}
+
+
+def __getattr__(name: str) -> Any:
+    # The generator classes used to be defined here; import them on first access
+    module_name = _FORMAT_CLASSES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module_name), name)
@@ -6,10 +6,14 @@ import base64
 import logging
 import re
 from pathlib import Path, PurePosixPath
+from typing import TYPE_CHECKING
 from urllib.parse import urljoin, urlparse
 
 import requests
 
+if TYPE_CHECKING:
+    from slash_commands.object_store import ObjectStore
+
 # GitHub allows alphanumeric, hyphens, underscores, and dots in owner/repo names
 # This regex matches valid GitHub repository identifiers (no slashes)
 _GITHUB_REPO_PATTERN = re.compile(r"^[a-zA-Z0-9._-]+$")
@@ -131,7 +135,7 @@ def validate_github_repo(repo: str) -> tuple[str, str]:
 
 
 def download_prompts_from_github(
-    owner: str, repo: str, branch: str, path: str
+    owner: str, repo: str, branch: str, path: str, store: ObjectStore | None = None
 ) -> list[tuple[str, str]]:
     """Download markdown prompt files from a GitHub repository.
 
@@ -140,6 +144,8 @@ def download_prompts_from_github(
         repo: Repository name
         branch: Branch name (e.g., 'main', 'refactor/improve-workflow')
         path: Path to directory or single file within repository
+        store: Object store consulted by blob SHA before downloading a file, and
+            updated with every file that is downloaded (optional)
 
     Returns:
         List of (filename, content) tuples for markdown files
@@ -213,6 +219,8 @@ def download_prompts_from_github(
             except Exception as e:
                 raise ValueError(f"Failed to decode file content: {e}") from e
 
+            if store is not None:
+                store.put(content.encode("utf-8"), blob_sha=data.get("sha"))
             prompts.append((filename, content))
 
         elif isinstance(data, list):
@@ -222,7 +230,11 @@ def download_prompts_from_github(
                     filename = item["name"]
                     content_encoded = item.get("content", "")
 
-                    if content_encoded:
+                    stored = _lookup_stored_blob(store, item.get("sha"))
+                    if stored is not None:
+                        # Unchanged upstream since it was last downloaded
+                        prompts.append((filename, stored))
+                    elif content_encoded:
                         # Single file requests include base64-encoded content
                         try:
                             content = base64.b64decode(content_encoded).decode("utf-8")
@@ -230,6 +242,8 @@ def download_prompts_from_github(
                         except Exception:
                             # Skip files that can't be decoded
                             continue
+                        if store is not None:
+                            store.put(content.encode("utf-8"), blob_sha=item.get("sha"))
                     else:
                         # Directory listings don't include content, use download_url
                         download_url = item.get("download_url")
@@ -280,6 +294,8 @@ def download_prompts_from_github(
                         except requests.exceptions.RequestException:
                             # Skip files that can't be downloaded
                             continue
+                        if store is not None:
+                            store.put(content.encode("utf-8"), blob_sha=item.get("sha"))
                 # Skip subdirectories (do not recursively process)
 
         return prompts
@@ -307,6 +323,47 @@ def download_prompts_from_github(
         ) from e
 
 
+def _lookup_stored_blob(store: ObjectStore | None, blob_sha: str | None) -> str | None:
+    """Return the stored content of a GitHub blob, or None if it must be downloaded."""
+    if store is None or not blob_sha:
+        return None
+    digest = store.lookup_blob(blob_sha)
+    if digest is None:
+        return None
+    return store.get(digest).decode("utf-8")
+
+
+def fetch_github_prompts_to_store(
+    owner: str, repo: str, branch: str, path: str, store: ObjectStore
+) -> str:
+    """Resolve a GitHub prompt source into the object store.
+
+    Only files whose blob SHA is not already stored are downloaded. The source is
+    recorded in the store as the list of object digests it currently contains.
+
+    Args:
+        owner: Repository owner
+        repo: Repository name
+        branch: Branch name
+        path: Path to directory or single file within repository
+        store: Object store to read from and write into
+
+    Returns:
+        The store key of the source, for :meth:`ObjectStore.checkout`
+
+    Raises:
+        requests.exceptions.HTTPError: For GitHub API errors
+        requests.exceptions.RequestException: For network errors
+        ValueError: If path points to a non-markdown file
+    """
+    prompts = download_prompts_from_github(owner, repo, branch, path, store=store)
+    source_key = f"github:{owner}/{repo}@{branch}:{path}"
+    store.record_source(
+        source_key, {filename: store.put(content.encode("utf-8")) for filename, content in prompts}
+    )
+    return source_key
+
+
 def _validate_raw_github_download_url(download_url: str) -> None:
     """Ensure download URLs only target raw.githubusercontent.com over HTTPS."""
     parsed = urlparse(download_url)
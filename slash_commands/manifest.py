@@ -0,0 +1,167 @@
+"""Record of the command files ``slash-man generate`` wrote into a target directory.
+
+The manifest lives at ``<target>/.slash-man-manifest.json`` and lists, for every
+generated file, the agent and source prompt it belongs to and the SHA-256,
+size and modification time it had when it was written. ``cleanup`` and
+``status`` read it instead of opening and parsing every file in every agent
+directory, and ``generate`` uses it to recognize unchanged files without
+reading them. It is rewritten atomically at the end of each run.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from collections.abc import Iterator
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from slash_commands.object_store import _write_atomically
+
+MANIFEST_FILENAME = ".slash-man-manifest.json"
+MANIFEST_FORMAT_VERSION = 1
+
+
+@dataclass(frozen=True)
+class ManifestEntry:
+    """One generated file; ``path`` is relative to the target directory, with ``/``."""
+
+    path: str
+    agent: str
+    source_prompt: str
+    sha256: str
+    size: int
+    mtime_ns: int
+
+    def matches(self, stat: os.stat_result) -> bool:
+        """Return True if a file with ``stat`` is still the file that was recorded."""
+        return self.size == stat.st_size and self.mtime_ns == stat.st_mtime_ns
+
+
+class Manifest:
+    """The generated-file index of one target directory.
+
+    Loaded lazily on first use and written back by :meth:`save`. A missing,
+    corrupt or outdated manifest is treated as empty.
+    """
+
+    def __init__(self, base_path: Path):
+        self.base_path = base_path
+        self._entries: dict[str, ManifestEntry] = {}
+        self._loaded = False
+        self._dirty = False
+        self._exists = False
+
+    @property
+    def path(self) -> Path:
+        return self.base_path / MANIFEST_FILENAME
+
+    @property
+    def exists(self) -> bool:
+        """True if a readable manifest was found on disk."""
+        self._ensure_loaded()
+        return self._exists
+
+    def __len__(self) -> int:
+        self._ensure_loaded()
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[ManifestEntry]:
+        self._ensure_loaded()
+        return iter(list(self._entries.values()))
+
+    def load(self) -> None:
+        """Read the manifest now instead of on first use."""
+        self._ensure_loaded()
+
+    def key(self, file_path: Path) -> str:
+        """Manifest key of a file under the target directory."""
+        return file_path.relative_to(self.base_path).as_posix()
+
+    def get(self, file_path: Path) -> ManifestEntry | None:
+        self._ensure_loaded()
+        return self._entries.get(self.key(file_path))
+
+    def record(
+        self,
+        file_path: Path,
+        agent: str,
+        source_prompt: str,
+        sha256: str,
+        stat: os.stat_result,
+    ) -> None:
+        """Remember a file as written (or confirmed unchanged) by this run."""
+        self._ensure_loaded()
+        entry = ManifestEntry(
+            path=self.key(file_path),
+            agent=agent,
+            source_prompt=source_prompt,
+            sha256=sha256,
+            size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+        )
+        if self._entries.get(entry.path) != entry:
+            self._entries[entry.path] = entry
+            self._dirty = True
+
+    def remove(self, file_path: Path) -> None:
+        self._ensure_loaded()
+        if self._entries.pop(self.key(file_path), None) is not None:
+            self._dirty = True
+
+    def resolve(self, entry: ManifestEntry) -> Path:
+        """Absolute path of a recorded file."""
+        return self.base_path / entry.path
+
+    def save(self) -> None:
+        """Write the manifest if it changed; an empty manifest is deleted."""
+        if not self._loaded or not self._dirty:
+            return
+
+        if not self._entries:
+            self.path.unlink(missing_ok=True)
+            self._exists = False
+        else:
+            payload = {
+                "version": MANIFEST_FORMAT_VERSION,
+                "files": {
+                    key: _entry_fields(entry) for key, entry in sorted(self._entries.items())
+                },
+            }
+            _write_atomically(self.path, (json.dumps(payload, indent=2) + "\n").encode("utf-8"))
+            self._exists = True
+        self._dirty = False
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+
+        try:
+            payload = json.loads(self.path.read_bytes())
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError):
+            # A damaged manifest only loses the index; the files themselves are intact
+            self._dirty = True
+            return
+
+        if not isinstance(payload, dict) or payload.get("version") != MANIFEST_FORMAT_VERSION:
+            self._dirty = True
+            return
+
+        try:
+            self._entries = {
+                key: ManifestEntry(path=key, **fields) for key, fields in payload["files"].items()
+            }
+        except (KeyError, TypeError, AttributeError):
+            self._entries = {}
+            self._dirty = True
+            return
+        self._exists = True
+
+
+def _entry_fields(entry: ManifestEntry) -> dict[str, object]:
+    fields = asdict(entry)
+    del fields["path"]
+    return fields
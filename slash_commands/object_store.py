@@ -0,0 +1,301 @@
+"""Content-addressed store for downloaded prompt files.
+
+Every prompt file is stored once under the SHA-256 of its bytes
+(``objects/ab/cdef...``), however many sources contain it. A small JSON index
+maps each source (for example a GitHub repository path at a branch) to the
+``{filename: digest}`` list it last resolved to, and maps GitHub blob SHAs to
+digests so files that did not change upstream are not downloaded again.
+
+Sources are materialized into stable checkout directories made of hard links to
+the objects, so the parsed-prompt cache sees the same paths and the same files
+on every run.
+
+The store is bounded: :meth:`ObjectStore.save` drops the least recently used
+sources until the objects fit in ``max_bytes`` and :meth:`ObjectStore.gc`
+deletes objects that no source refers to.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+STORE_FORMAT_VERSION = 1
+INDEX_FILENAME = "index.json"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class GarbageCollectionResult:
+    """What a garbage collection pass removed."""
+
+    objects_removed: int = 0
+    bytes_freed: int = 0
+    checkouts_removed: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return {
+            "objects_removed": self.objects_removed,
+            "bytes_freed": self.bytes_freed,
+            "checkouts_removed": self.checkouts_removed,
+        }
+
+
+class ObjectStore:
+    """Hash-named prompt objects plus an index of the sources that use them."""
+
+    def __init__(self, root: Path, max_bytes: int = DEFAULT_MAX_BYTES):
+        """Initialize the store.
+
+        Args:
+            root: Directory holding objects, checkouts and the index
+            max_bytes: Object size above which least recently used sources are dropped
+        """
+        if max_bytes < 1:
+            raise ValueError(f"max_bytes must be at least 1, got {max_bytes}")
+
+        self.root = root
+        self.max_bytes = max_bytes
+        self._sources: dict[str, dict[str, Any]] = {}
+        self._blobs: dict[str, str] = {}
+        self._clock = 0
+        self._loaded = False
+        self._dirty = False
+
+    @property
+    def objects_dir(self) -> Path:
+        return self.root / "objects"
+
+    @property
+    def checkouts_dir(self) -> Path:
+        return self.root / "checkouts"
+
+    @property
+    def index_path(self) -> Path:
+        return self.root / INDEX_FILENAME
+
+    def object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / digest[2:]
+
+    def put(self, data: bytes, blob_sha: str | None = None) -> str:
+        """Store ``data`` if it is not stored yet and return its digest.
+
+        Args:
+            data: File content
+            blob_sha: Upstream identifier of the same content (a GitHub blob SHA)
+        """
+        self._ensure_loaded()
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.object_path(digest)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            _write_atomically(path, data)
+        if blob_sha and self._blobs.get(blob_sha) != digest:
+            self._blobs[blob_sha] = digest
+            self._dirty = True
+        return digest
+
+    def get(self, digest: str) -> bytes:
+        """Return the content stored under ``digest``.
+
+        Raises:
+            KeyError: If no such object is stored
+        """
+        try:
+            return self.object_path(digest).read_bytes()
+        except FileNotFoundError:
+            raise KeyError(f"Object not in store: {digest}") from None
+
+    def lookup_blob(self, blob_sha: str) -> str | None:
+        """Return the digest previously stored for an upstream blob, if still present."""
+        self._ensure_loaded()
+        digest = self._blobs.get(blob_sha)
+        if digest is None or not self.object_path(digest).exists():
+            return None
+        return digest
+
+    def resolve(self, source_key: str) -> dict[str, str] | None:
+        """Return the ``{filename: digest}`` list last recorded for a source."""
+        self._ensure_loaded()
+        source = self._sources.get(source_key)
+        return dict(source["files"]) if source is not None else None
+
+    def record_source(self, source_key: str, files: dict[str, str]) -> None:
+        """Remember which objects a source currently resolves to."""
+        self._ensure_loaded()
+        self._clock += 1
+        self._sources[source_key] = {"files": dict(files), "used": self._clock}
+        self._dirty = True
+
+    def checkout(self, source_key: str) -> Path:
+        """Materialize a recorded source as a directory of its files.
+
+        The directory path is stable for a given source, and files are hard links to
+        the stored objects (copies where hard links are unsupported). Files that are
+        no longer part of the source are removed.
+
+        Raises:
+            KeyError: If the source has not been recorded
+        """
+        files = self.resolve(source_key)
+        if files is None:
+            raise KeyError(f"Source not in store: {source_key}")
+
+        directory = self._checkout_path(source_key)
+        directory.mkdir(parents=True, exist_ok=True)
+        with os.scandir(directory) as entries:
+            stale = [entry.path for entry in entries if entry.name not in files]
+        for path in stale:
+            os.unlink(path)
+
+        for filename, digest in files.items():
+            target = directory / filename
+            source = self.object_path(digest)
+            try:
+                if os.path.samefile(target, source):
+                    continue
+                target.unlink()
+            except FileNotFoundError:
+                pass
+            try:
+                os.link(source, target)
+            except OSError:
+                shutil.copy2(source, target)
+        return directory
+
+    def gc(self) -> GarbageCollectionResult:
+        """Delete objects, checkouts and blob mappings that no recorded source uses."""
+        self._ensure_loaded()
+        live = self._live_digests()
+
+        objects_removed = 0
+        bytes_freed = 0
+        for digest, path, size in self._iter_objects():
+            if digest not in live:
+                path.unlink()
+                objects_removed += 1
+                bytes_freed += size
+
+        blobs = {sha: digest for sha, digest in self._blobs.items() if digest in live}
+        if blobs != self._blobs:
+            self._blobs = blobs
+            self._dirty = True
+
+        live_checkouts = {self._checkout_path(key).name for key in self._sources}
+        checkouts_removed = 0
+        if self.checkouts_dir.exists():
+            with os.scandir(self.checkouts_dir) as entries:
+                stale = [entry.path for entry in entries if entry.name not in live_checkouts]
+            for path in stale:
+                shutil.rmtree(path, ignore_errors=True)
+                checkouts_removed += 1
+
+        return GarbageCollectionResult(objects_removed, bytes_freed, checkouts_removed)
+
+    def size(self) -> int:
+        """Total bytes of stored objects."""
+        return sum(size for _digest, _path, size in self._iter_objects())
+
+    def save(self) -> GarbageCollectionResult | None:
+        """Enforce the size cap and persist the index.
+
+        The store only saves downloads, so a store directory that cannot be written
+        is logged as a warning rather than raised.
+
+        Returns:
+            The garbage collection result if the size cap forced one, else None
+        """
+        self._ensure_loaded()
+        try:
+            return self._save()
+        except OSError as e:
+            logger.warning("Could not save the prompt store in %s: %s", self.root, e)
+            return None
+
+    def _save(self) -> GarbageCollectionResult | None:
+        result = None
+        sizes = {digest: size for digest, _path, size in self._iter_objects()}
+        if sum(sizes.values()) > self.max_bytes:
+            # Keep the most recently used source even if it alone exceeds the cap
+            by_age = sorted(self._sources, key=lambda key: self._sources[key]["used"])
+            for key in by_age[:-1]:
+                if sum(sizes.get(digest, 0) for digest in self._live_digests()) <= self.max_bytes:
+                    break
+                del self._sources[key]
+                self._dirty = True
+            result = self.gc()
+
+        if self._dirty:
+            self.root.mkdir(parents=True, exist_ok=True)
+            payload = {
+                "version": STORE_FORMAT_VERSION,
+                "clock": self._clock,
+                "sources": self._sources,
+                "blobs": self._blobs,
+            }
+            _write_atomically(self.index_path, json.dumps(payload, sort_keys=True).encode())
+            self._dirty = False
+        return result
+
+    def _live_digests(self) -> set[str]:
+        return {digest for source in self._sources.values() for digest in source["files"].values()}
+
+    def _checkout_path(self, source_key: str) -> Path:
+        return self.checkouts_dir / hashlib.sha256(source_key.encode("utf-8")).hexdigest()[:16]
+
+    def _iter_objects(self) -> Iterator[tuple[str, Path, int]]:
+        if not self.objects_dir.exists():
+            return
+        with os.scandir(self.objects_dir) as fanouts:
+            fanout_dirs = [(entry.name, entry.path) for entry in fanouts if entry.is_dir()]
+        for prefix, fanout_path in fanout_dirs:
+            with os.scandir(fanout_path) as entries:
+                for entry in entries:
+                    # Skip in-progress temp files
+                    if entry.is_file() and not entry.name.startswith("."):
+                        yield prefix + entry.name, Path(entry.path), entry.stat().st_size
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+
+        try:
+            payload = json.loads(self.index_path.read_bytes())
+        except OSError:
+            # Missing or unreadable; start empty and let save() report write problems
+            return
+        except ValueError:
+            # A damaged index only loses source resolutions; objects are still valid
+            self._dirty = True
+            return
+
+        if not isinstance(payload, dict) or payload.get("version") != STORE_FORMAT_VERSION:
+            self._dirty = True
+            return
+
+        self._clock = payload["clock"]
+        self._sources = payload["sources"]
+        self._blobs = payload["blobs"]
+
+
+def _write_atomically(path: Path, data: bytes) -> None:
+    """Write ``data`` to a sibling temp file and rename it into place."""
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
@@ -0,0 +1,177 @@
+"""Placeholder substitution for generated command bodies.
+
+Placeholder tokens (``$ARGUMENTS``, ``{{args}}``, ...) are registered on a
+:class:`PlaceholderEngine` together with a function that renders the
+replacement text from the prompt's argument list. A set of tokens is compiled
+once into a :class:`PlaceholderSet`, which substitutes all of them in a single
+pass: occurrences are located with ``str.find`` and the output is joined once,
+instead of copying the whole body for every token.
+
+A token that contains another registered token (`` `$ARGUMENTS` `` contains
+``$ARGUMENTS``) is found through the shorter one, and the longest token wins
+where several match at the same place. Replacement text is inserted as is and
+is never scanned for further tokens.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from types import MappingProxyType
+
+from mcp_server.prompt_utils import PromptArgumentSpec
+
+PlaceholderRenderer = Callable[[Sequence[PromptArgumentSpec]], str]
+
+# Distinct argument lists whose replacements are kept per placeholder set
+_MAX_CACHED_ARGUMENT_LISTS = 256
+
+
+class PlaceholderSet:
+    """A compiled group of placeholder tokens."""
+
+    def __init__(self, renderers: dict[str, PlaceholderRenderer]):
+        self.tokens = frozenset(renderers)
+        self._renderers = renderers
+        self._variants = _compile_variants(self.tokens)
+        self._replacements: dict[tuple[PromptArgumentSpec, ...], dict[str, str]] = {}
+
+    def substitute(self, body: str, arguments: Sequence[PromptArgumentSpec]) -> str:
+        """Replace every token in ``body`` using replacements rendered from ``arguments``."""
+        matches: list[tuple[int, int, str]] = []
+        for anchor, variants in self._variants.items():
+            position = body.find(anchor)
+            while position != -1:
+                for token, offset in variants:
+                    start = position - offset
+                    if start >= 0 and body.startswith(token, start):
+                        matches.append((start, -len(token), token))
+                        break
+                position = body.find(anchor, position + 1)
+
+        if not matches:
+            return body
+
+        replacements = self._replacements_for(arguments)
+        matches.sort()
+        pieces: list[str] = []
+        end = 0
+        for start, negative_length, token in matches:
+            if start < end:
+                # Overlaps a longer or earlier match
+                continue
+            pieces.append(body[end:start])
+            pieces.append(replacements[token])
+            end = start - negative_length
+        pieces.append(body[end:])
+        return "".join(pieces)
+
+    def _replacements_for(self, arguments: Sequence[PromptArgumentSpec]) -> dict[str, str]:
+        key = tuple(arguments)
+        try:
+            cached = self._replacements.get(key)
+        except TypeError:
+            # An unhashable argument description from the frontmatter
+            return self._render(arguments)
+
+        if cached is None:
+            if len(self._replacements) >= _MAX_CACHED_ARGUMENT_LISTS:
+                self._replacements.clear()
+            cached = self._replacements[key] = self._render(arguments)
+        return cached
+
+    def _render(self, arguments: Sequence[PromptArgumentSpec]) -> dict[str, str]:
+        return {token: render(arguments) for token, render in self._renderers.items()}
+
+
+class PlaceholderEngine:
+    """Registry of placeholder tokens and the placeholder sets compiled from it."""
+
+    def __init__(self) -> None:
+        self._renderers: dict[str, PlaceholderRenderer] = {}
+        self._compiled: dict[frozenset[str], PlaceholderSet] = {}
+
+    def register(self, token: str, render: PlaceholderRenderer) -> None:
+        """Register a token and the function that renders its replacement.
+
+        Raises:
+            ValueError: If the token is empty or already registered
+        """
+        if not token:
+            raise ValueError("Placeholder token must not be empty")
+        if token in self._renderers:
+            raise ValueError(f"Placeholder already registered: {token}")
+        self._renderers[token] = render
+        self._compiled.clear()
+
+    @property
+    def renderers(self) -> Mapping[str, PlaceholderRenderer]:
+        """Registered tokens and their renderers, in registration order."""
+        return MappingProxyType(self._renderers)
+
+    def compile(self, tokens: Iterable[str]) -> PlaceholderSet:
+        """Return the (cached) placeholder set for ``tokens``.
+
+        Raises:
+            KeyError: If a token has not been registered
+        """
+        key = frozenset(tokens)
+        compiled = self._compiled.get(key)
+        if compiled is None:
+            unknown = sorted(key - self._renderers.keys())
+            if unknown:
+                raise KeyError(f"Unknown placeholder token(s): {', '.join(unknown)}")
+            compiled = self._compiled[key] = PlaceholderSet(
+                {token: self._renderers[token] for token in key}
+            )
+        return compiled
+
+
+def _compile_variants(tokens: frozenset[str]) -> dict[str, list[tuple[str, int]]]:
+    """Map each anchor to the tokens found through it, longest first.
+
+    A token's anchor is the shortest other token it contains, or the token itself.
+    Each variant records the offset of the anchor within the token.
+    """
+    variants: dict[str, list[tuple[str, int]]] = {}
+    for token in tokens:
+        contained = [other for other in tokens if other != token and other in token]
+        anchor = min(contained, key=len) if contained else token
+        offset = token.find(anchor)
+        while offset != -1:
+            variants.setdefault(anchor, []).append((token, offset))
+            offset = token.find(anchor, offset + 1)
+
+    for entries in variants.values():
+        entries.sort(key=lambda entry: (-len(entry[0]), entry[0]))
+    # A fixed scan order keeps the output independent of set iteration order
+    return dict(sorted(variants.items()))
+
+
+def arguments_section_markdown(arguments: Sequence[PromptArgumentSpec]) -> str:
+    """Build a markdown-formatted arguments section."""
+    if not arguments:
+        return ""
+
+    lines = []
+    for arg in arguments:
+        if arg.required:
+            lines.append(f"- `<{arg.name}>` (required): {arg.description or ''}")
+        else:
+            lines.append(f"- `[{arg.name}]` (optional): {arg.description or ''}")
+    return "\n".join(lines)
+
+
+def argument_names(arguments: Sequence[PromptArgumentSpec]) -> str:
+    """Comma-separated argument names."""
+    return ", ".join(arg.name for arg in arguments)
+
+
+PLACEHOLDERS = PlaceholderEngine()
+PLACEHOLDERS.register("`$ARGUMENTS`", arguments_section_markdown)
+PLACEHOLDERS.register("$ARGUMENTS", arguments_section_markdown)
+PLACEHOLDERS.register("{{args}}", argument_names)
+
+
+def register_placeholder(token: str, render: PlaceholderRenderer) -> None:
+    """Register a placeholder token on the default engine used by the generators."""
+    PLACEHOLDERS.register(token, render)
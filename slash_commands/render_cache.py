@@ -0,0 +1,296 @@
+"""Persistent cache of rendered command files.
+
+Rendering a prompt for an agent substitutes placeholders, serializes the
+frontmatter and normalizes the output. When neither the prompt nor the run
+changed, the result is the same as last time, so rendered files are kept on
+disk and reused.
+
+Entries are addressed by the SHA-256 of everything in the prompt that reaches
+the output, the agent key and command format, the source metadata, the package
+version, the code doing the rendering (the generator class and the registered
+placeholder renderers, so plugins invalidate entries) and the run timestamp. Generated files record the time they were
+generated, so entries are only reused by runs with a pinned timestamp
+(``--timestamp`` or ``SOURCE_DATE_EPOCH``). A cache written by another package
+version is discarded when loaded.
+
+The cache is bounded by the size of the stored output; the least recently used
+entries are dropped first.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import sys
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from mcp_server.prompt_utils import LazyMarkdownPrompt, MarkdownPrompt
+from slash_commands.config import AgentConfig
+from slash_commands.generators import CommandChunks, CommandGeneratorProtocol, __version__
+from slash_commands.placeholders import PLACEHOLDERS
+from slash_commands.run_context import RunContext
+
+# Bump whenever the key or the on-disk layout changes shape
+RENDER_CACHE_FORMAT_VERSION = 2
+
+CACHE_FILENAME = "renders.pickle"
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+RenderKey = tuple[str, str, str, str, str, str, str]
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RenderCacheStats:
+    """Counters describing cache effectiveness for one cache instance."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+
+def prompt_digest(prompt: MarkdownPrompt | LazyMarkdownPrompt) -> str:
+    """SHA-256 of the prompt fields that generated files are rendered from."""
+    fields = [
+        prompt.name,
+        prompt.path.name,
+        prompt.description,
+        sorted(prompt.tags) if prompt.tags else None,
+        prompt.meta,
+        prompt.enabled,
+        [[arg.name, arg.description, arg.required] for arg in prompt.arguments],
+        prompt.agent_overrides,
+        prompt.body,
+    ]
+    return hashlib.sha256(_encode(fields)).hexdigest()
+
+
+def render_key(
+    digest: str,
+    agent: AgentConfig,
+    source_metadata: dict[str, Any] | None,
+    context: RunContext,
+    generator: CommandGeneratorProtocol,
+) -> RenderKey:
+    """Key of one rendered file.
+
+    Args:
+        digest: The prompt's :func:`prompt_digest`
+        agent: Agent the file is rendered for
+        source_metadata: Source metadata passed to the generator
+        context: Run context supplying the timestamp
+        generator: Generator that renders ``agent.command_format``
+    """
+    return (
+        digest,
+        agent.key,
+        agent.command_format.value,
+        _encode(source_metadata).decode("utf-8"),
+        __version__,
+        renderer_identity(generator),
+        context.updated_at,
+    )
+
+
+def renderer_identity(generator: CommandGeneratorProtocol) -> str:
+    """Identify the code rendering a file: the generator class and all placeholder renderers."""
+    parts = [_code_identity(type(generator))]
+    parts.extend(
+        f"{token}={_code_identity(render)}" for token, render in PLACEHOLDERS.renderers.items()
+    )
+    return json.dumps(parts, ensure_ascii=False)
+
+
+def _code_identity(obj: Any) -> str:
+    """``module:qualname@version`` of a class or function.
+
+    The version is the ``__version__`` of the defining module or, failing that, of
+    its top-level package; it is empty when neither has one.
+    """
+    module_name = getattr(obj, "__module__", None) or ""
+    qualname = getattr(obj, "__qualname__", None) or type(obj).__qualname__
+    version = ""
+    for name in (module_name, module_name.partition(".")[0]):
+        candidate = getattr(sys.modules.get(name), "__version__", None)
+        if isinstance(candidate, str):
+            version = candidate
+            break
+    return f"{module_name}:{qualname}@{version}"
+
+
+def _encode(value: Any) -> bytes:
+    return json.dumps(_tagged(value), ensure_ascii=False).encode("utf-8")
+
+
+def _tagged(value: Any) -> Any:
+    """JSON-encodable form of ``value`` that keeps apart values JSON would merge.
+
+    Containers are tagged with their type, so a list never reads as a mapping, and
+    mapping keys keep their own type (``1`` and ``"1"`` differ) and their order,
+    which is the order in the output. Values JSON has no type for (YAML dates) are
+    tagged with their type name and encoded by repr().
+    """
+    if value is None or isinstance(value, str | bool | int | float):
+        return value
+    if isinstance(value, dict):
+        return ["dict", [[_tagged(key), _tagged(item)] for key, item in value.items()]]
+    if isinstance(value, list | tuple):
+        return ["list", [_tagged(item) for item in value]]
+    return [type(value).__qualname__, repr(value)]
+
+
+class RenderCache:
+    """On-disk cache of rendered command files with size-bounded LRU eviction.
+
+    The cache is loaded lazily on first use and written back by :meth:`save`.
+    A missing, corrupt, outdated or other-version cache file is treated as empty.
+    """
+
+    def __init__(self, cache_dir: Path, max_bytes: int = DEFAULT_MAX_BYTES):
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding the cache file
+            max_bytes: Maximum total size of the cached output
+        """
+        if max_bytes < 1:
+            raise ValueError(f"max_bytes must be at least 1, got {max_bytes}")
+
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        # Ordered from least to most recently used
+        self._entries: dict[RenderKey, CommandChunks] = {}
+        self._size = 0
+        self._loaded = False
+        self._dirty = False
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def path(self) -> Path:
+        return self.cache_dir / CACHE_FILENAME
+
+    @property
+    def stats(self) -> RenderCacheStats:
+        return RenderCacheStats(hits=self._hits, misses=self._misses, evictions=self._evictions)
+
+    @property
+    def size(self) -> int:
+        """Total bytes of cached output."""
+        self._ensure_loaded()
+        return self._size
+
+    def __len__(self) -> int:
+        self._ensure_loaded()
+        return len(self._entries)
+
+    def get(self, key: RenderKey) -> CommandChunks | None:
+        """Return the cached file for ``key``, or None on a miss."""
+        self._ensure_loaded()
+        chunks = self._entries.pop(key, None)
+        if chunks is None:
+            self._misses += 1
+            return None
+        # Re-insert to keep the dict in least-recently-used order; recency is
+        # persisted with the next real change, so an all-hit run stays read-only
+        self._entries[key] = chunks
+        self._hits += 1
+        return chunks
+
+    def put(self, key: RenderKey, chunks: CommandChunks) -> None:
+        """Store a rendered file, evicting the least recently used ones over the size cap."""
+        self._ensure_loaded()
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._size -= _chunks_size(previous)
+        self._entries[key] = chunks
+        self._size += _chunks_size(chunks)
+        self._dirty = True
+        self._evict()
+
+    def save(self) -> None:
+        """Persist the cache if it changed since it was loaded.
+
+        The cache only saves work, so a cache directory that cannot be written is
+        logged as a warning rather than raised.
+        """
+        if not self._loaded or not self._dirty:
+            return
+
+        payload = {
+            "version": RENDER_CACHE_FORMAT_VERSION,
+            "package_version": __version__,
+            "entries": self._entries,
+        }
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # Write to a sibling temp file and rename so readers never see a partial cache
+            fd, tmp_name = tempfile.mkstemp(dir=self.cache_dir, prefix=".renders-", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as handle:
+                    pickle.dump(payload, handle, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_name, self.path)
+            except BaseException:
+                Path(tmp_name).unlink(missing_ok=True)
+                raise
+        except OSError as e:
+            logger.warning("Could not save the render cache in %s: %s", self.cache_dir, e)
+            return
+        self._dirty = False
+
+    def clear(self) -> None:
+        """Drop all cached files, in memory and on disk."""
+        self._entries.clear()
+        self._size = 0
+        self._loaded = True
+        self._dirty = False
+        self.path.unlink(missing_ok=True)
+
+    def _evict(self) -> None:
+        # Keep the newest entry even if it alone exceeds the cap
+        while self._size > self.max_bytes and len(self._entries) > 1:
+            oldest = next(iter(self._entries))
+            self._size -= _chunks_size(self._entries.pop(oldest))
+            self._evictions += 1
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+
+        try:
+            with self.path.open("rb") as handle:
+                payload = pickle.load(handle)
+        except FileNotFoundError:
+            return
+        except Exception:  # noqa: BLE001 - a damaged cache is simply rebuilt
+            self._dirty = True
+            return
+
+        if (
+            not isinstance(payload, dict)
+            or payload.get("version") != RENDER_CACHE_FORMAT_VERSION
+            or payload.get("package_version") != __version__
+        ):
+            # Output from another version is never reused; rewrite the file to free it
+            self._dirty = True
+            return
+
+        self._entries = payload["entries"]
+        self._size = sum(_chunks_size(chunks) for chunks in self._entries.values())
+
+
+def _chunks_size(chunks: CommandChunks) -> int:
+    # Chunks shared between entries are counted once per entry
+    return sum(len(chunk) for chunk in chunks)
@@ -0,0 +1,95 @@
+"""State shared by every command file generated in one run.
+
+Generated files record when they were generated (``updated_at`` in Markdown and
+TOML metadata, ``updated:`` in the Kiro tracking comment). A :class:`RunContext`
+captures that timestamp once, so every file from one run carries the same value.
+
+The timestamp can be pinned with ``--timestamp`` or the ``SOURCE_DATE_EPOCH``
+environment variable (https://reproducible-builds.org/specs/source-date-epoch/).
+Generating the same prompts with the same pinned timestamp then produces
+byte-identical files.
+"""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Mapping
+from dataclasses import dataclass
+from datetime import UTC, datetime
+
+SOURCE_DATE_EPOCH = "SOURCE_DATE_EPOCH"
+
+
+@dataclass(frozen=True)
+class RunContext:
+    """Values fixed for the duration of one generation run.
+
+    Attributes:
+        timestamp: Time recorded in generated files, in UTC
+        reproducible: True if the timestamp was pinned rather than taken from the clock
+    """
+
+    timestamp: datetime
+    reproducible: bool = False
+
+    @classmethod
+    def create(
+        cls, timestamp: str | None = None, environ: Mapping[str, str] | None = None
+    ) -> RunContext:
+        """Capture the run timestamp.
+
+        ``timestamp`` wins over ``SOURCE_DATE_EPOCH``; without either, the current
+        time is used.
+
+        Args:
+            timestamp: Pinned timestamp, as accepted by :func:`parse_timestamp`
+            environ: Environment to read ``SOURCE_DATE_EPOCH`` from; defaults to ``os.environ``
+
+        Raises:
+            ValueError: If the pinned timestamp cannot be parsed
+        """
+        if timestamp is None:
+            timestamp = (os.environ if environ is None else environ).get(SOURCE_DATE_EPOCH)
+            if timestamp is not None and not timestamp.strip().isdigit():
+                raise ValueError(
+                    f"{SOURCE_DATE_EPOCH} must be an integer number of seconds, got {timestamp!r}"
+                )
+        if timestamp is None:
+            return cls(datetime.now(UTC))
+        return cls(parse_timestamp(timestamp), reproducible=True)
+
+    @property
+    def updated_at(self) -> str:
+        """ISO 8601 timestamp used for ``updated_at`` metadata."""
+        return self.timestamp.isoformat()
+
+    @property
+    def updated_date(self) -> str:
+        """Calendar date used for the Kiro ``updated:`` field."""
+        return self.timestamp.strftime("%Y-%m-%d")
+
+
+def parse_timestamp(value: str) -> datetime:
+    """Parse seconds since the Unix epoch or an ISO 8601 date-time as a UTC datetime.
+
+    Date-times without a UTC offset are taken to be in UTC.
+
+    Raises:
+        ValueError: If ``value`` is neither
+    """
+    text = value.strip()
+    if text.lstrip("-").isdigit():
+        try:
+            return datetime.fromtimestamp(int(text), UTC)
+        except (OverflowError, OSError) as e:
+            raise ValueError(f"Timestamp out of range: {value!r}") from e
+
+    try:
+        parsed = datetime.fromisoformat(text)
+    except ValueError:
+        raise ValueError(
+            f"Invalid timestamp {value!r}: expected seconds since the epoch or ISO 8601"
+        ) from None
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=UTC)
+    return parsed.astimezone(UTC)
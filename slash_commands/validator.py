@@ -0,0 +1,413 @@
+"""Catalog-wide prompt validation.
+
+Every prompt file is checked the way ``generate`` would use it: the frontmatter
+must be valid YAML, ``arguments`` and ``agent_overrides`` must be well formed,
+and the prompt must render, and parse back, for every supported agent. All
+problems are collected instead of stopping at the first one.
+
+Files are validated on a process pool because parsing and rendering are
+CPU-bound. Results are cached by the SHA-256 of the file content, so a repeat
+run only re-checks files that changed. The cache is discarded when the package
+version, the set of supported agents, a generator or placeholder plugin, or the
+YAML backend changes.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import tomllib
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+from mcp_server import yaml_backend
+from mcp_server.prompt_discovery import DiscoveryOptions, iter_prompt_files
+from mcp_server.prompt_utils import (
+    decode_prompt_bytes,
+    normalize_arguments,
+    prompt_from_content,
+    scan_frontmatter,
+)
+from slash_commands.config import CommandFormat, get_agent_config, list_agent_keys
+from slash_commands.generators import CommandGenerator, __version__
+from slash_commands.render_cache import renderer_identity
+
+VALIDATION_FORMAT_VERSION = 1
+CACHE_FILENAME = "validation.json"
+DEFAULT_MAX_ENTRIES = 50_000
+
+# Below this many files the process pool costs more than it saves
+_MIN_PARALLEL_FILES = 32
+
+# (check, agent key or None, message), the cached form of a diagnostic
+_Finding = tuple[str, str | None, str]
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Diagnostic:
+    """One problem found in a prompt file.
+
+    Attributes:
+        path: Prompt file the problem was found in
+        check: Which check failed (``read``, ``frontmatter``, ``arguments``,
+            ``agent_overrides``, ``prompt`` or ``render``)
+        message: Human-readable description of the problem
+        agent: Agent key for render and override problems
+    """
+
+    path: Path
+    check: str
+    message: str
+    agent: str | None = None
+
+    def __str__(self) -> str:
+        where = f"{self.check}:{self.agent}" if self.agent else self.check
+        return f"{self.path}: [{where}] {self.message}"
+
+
+@dataclass(frozen=True)
+class ValidationReport:
+    """Outcome of validating a prompt catalog."""
+
+    checked: int
+    cached: int
+    diagnostics: list[Diagnostic]
+
+    @property
+    def failed(self) -> int:
+        """Number of prompt files with at least one diagnostic."""
+        return len({diagnostic.path for diagnostic in self.diagnostics})
+
+    @property
+    def ok(self) -> bool:
+        return not self.diagnostics
+
+
+class ValidationCache:
+    """On-disk pass/fail results keyed by prompt content hash.
+
+    Loaded lazily on first use and written back by :meth:`save`. A missing,
+    corrupt or outdated cache file is treated as empty.
+    """
+
+    def __init__(self, cache_dir: Path, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding the cache file
+            max_entries: Maximum number of results to keep, least recently used dropped first
+        """
+        if max_entries < 1:
+            raise ValueError(f"max_entries must be at least 1, got {max_entries}")
+
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self._results: dict[str, list[_Finding]] = {}
+        self._loaded = False
+        self._dirty = False
+
+    @property
+    def path(self) -> Path:
+        return self.cache_dir / CACHE_FILENAME
+
+    def get(self, digest: str) -> list[_Finding] | None:
+        """Return the cached findings for a content digest (empty when it passed)."""
+        self._ensure_loaded()
+        findings = self._results.pop(digest, None)
+        if findings is not None:
+            # Re-insert to keep the dict in least-recently-used order
+            self._results[digest] = findings
+        return findings
+
+    def put(self, digest: str, findings: list[_Finding]) -> None:
+        self._ensure_loaded()
+        self._results.pop(digest, None)
+        self._results[digest] = findings
+        self._dirty = True
+
+    def save(self) -> None:
+        """Persist the cache if it changed since it was loaded.
+
+        The cache only saves work, so a cache directory that cannot be written is
+        logged as a warning rather than raised.
+        """
+        if not self._loaded or not self._dirty:
+            return
+
+        overflow = len(self._results) - self.max_entries
+        if overflow > 0:
+            for digest in list(self._results)[:overflow]:
+                del self._results[digest]
+
+        payload = {
+            "version": VALIDATION_FORMAT_VERSION,
+            "fingerprint": _fingerprint(),
+            "results": self._results,
+        }
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(
+                dir=self.cache_dir, prefix=".validation-", suffix=".tmp"
+            )
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                    json.dump(payload, handle)
+                os.replace(tmp_name, self.path)
+            except BaseException:
+                Path(tmp_name).unlink(missing_ok=True)
+                raise
+        except OSError as e:
+            logger.warning("Could not save the validation cache in %s: %s", self.cache_dir, e)
+            return
+        self._dirty = False
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+
+        try:
+            payload = json.loads(self.path.read_bytes())
+        except OSError:
+            # Missing or unreadable; save() reports a directory it cannot write
+            return
+        except ValueError:
+            self._dirty = True
+            return
+
+        if (
+            not isinstance(payload, dict)
+            or payload.get("version") != VALIDATION_FORMAT_VERSION
+            or payload.get("fingerprint") != _fingerprint()
+        ):
+            self._dirty = True
+            return
+
+        try:
+            self._results = {
+                digest: [tuple(finding) for finding in findings]
+                for digest, findings in payload["results"].items()
+            }
+        except (KeyError, TypeError, AttributeError):
+            self._results = {}
+            self._dirty = True
+
+
+class PromptValidator:
+    """Validate every prompt file below a prompts directory."""
+
+    def __init__(
+        self,
+        prompts_dir: Path,
+        discovery: DiscoveryOptions | None = None,
+        cache: ValidationCache | None = None,
+        workers: int | None = None,
+    ):
+        """Initialize the validator.
+
+        Args:
+            prompts_dir: Directory containing prompt files
+            discovery: How to find prompt files; defaults to the flat ``*.md`` search
+            cache: Cache of earlier results; None checks every file
+            workers: Number of worker processes; defaults to the CPU count, 1 disables the pool
+        """
+        if workers is not None and workers < 1:
+            raise ValueError(f"workers must be at least 1, got {workers}")
+
+        self.prompts_dir = prompts_dir
+        self.discovery = discovery
+        self.cache = cache
+        self.workers = workers or min(32, os.cpu_count() or 1)
+
+    def validate(self) -> ValidationReport:
+        """Check all prompt files and collect their diagnostics.
+
+        Raises:
+            ValueError: If the prompts directory does not exist
+        """
+        if not self.prompts_dir.is_dir():
+            raise ValueError(f"Prompts directory does not exist: {self.prompts_dir}")
+
+        findings: dict[Path, list[_Finding]] = {}
+        pending: list[tuple[Path, bytes, str]] = []
+        cached = 0
+        for path in iter_prompt_files(self.prompts_dir, self.discovery):
+            try:
+                data = path.read_bytes()
+            except OSError as e:
+                findings[path] = [("read", None, str(e))]
+                continue
+
+            digest = hashlib.sha256(data).hexdigest()
+            result = self.cache.get(digest) if self.cache is not None else None
+            if result is None:
+                pending.append((path, data, digest))
+            else:
+                findings[path] = result
+                cached += 1
+
+        for (path, _data, digest), result in zip(pending, self._check_all(pending), strict=True):
+            findings[path] = result
+            if self.cache is not None:
+                self.cache.put(digest, result)
+
+        if self.cache is not None:
+            self.cache.save()
+
+        diagnostics = [
+            Diagnostic(path=path, check=check, message=message, agent=agent)
+            for path in sorted(findings)
+            for check, agent, message in findings[path]
+        ]
+        return ValidationReport(checked=len(findings), cached=cached, diagnostics=diagnostics)
+
+    def _check_all(self, pending: list[tuple[Path, bytes, str]]) -> list[list[_Finding]]:
+        items = [(path, data) for path, data, _digest in pending]
+        if self.workers == 1 or len(items) < _MIN_PARALLEL_FILES:
+            return [_check_item(item) for item in items]
+
+        chunksize = max(1, len(items) // (self.workers * 4))
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            return list(executor.map(_check_item, items, chunksize=chunksize))
+
+
+def check_prompt(path: Path, data: bytes) -> list[Diagnostic]:
+    """Return the diagnostics for one prompt file's content."""
+    return [
+        Diagnostic(path=path, check=check, message=message, agent=agent)
+        for check, agent, message in _check_item((path, data))
+    ]
+
+
+def _check_item(item: tuple[Path, bytes]) -> list[_Finding]:
+    path, data = item
+    try:
+        content = decode_prompt_bytes(data)
+    except UnicodeDecodeError as e:
+        return [("read", None, f"File is not valid UTF-8: {e}")]
+
+    frontmatter, findings = _check_frontmatter(content)
+    if frontmatter is None:
+        return findings
+
+    try:
+        normalize_arguments(frontmatter.get("arguments"))
+    except ValueError as e:
+        findings.append(("arguments", None, str(e)))
+    findings.extend(_check_agent_overrides(frontmatter.get("agent_overrides")))
+    if findings:
+        # Rendering would only repeat the problems above
+        return findings
+
+    try:
+        prompt = prompt_from_content(path, content)
+    except Exception as e:  # noqa: BLE001 - every failure is a diagnostic
+        return [("prompt", None, f"{type(e).__name__}: {e}")]
+
+    for agent_key in list_agent_keys():
+        agent = get_agent_config(agent_key)
+        try:
+            output = CommandGenerator.create(agent.command_format).generate(prompt, agent)
+            _parse_output(output, agent.command_format)
+        except Exception as e:  # noqa: BLE001 - every failure is a diagnostic
+            findings.append(("render", agent_key, f"{type(e).__name__}: {e}"))
+    return findings
+
+
+def _check_frontmatter(content: str) -> tuple[dict[str, Any] | None, list[_Finding]]:
+    """Load the frontmatter strictly; None means later checks cannot run."""
+    span = scan_frontmatter(content)
+    if span is None:
+        if content.partition("\n")[0].rstrip() == "---":
+            return None, [("frontmatter", None, "Frontmatter block is not closed with '---'")]
+        return {}, []
+
+    try:
+        frontmatter = yaml_backend.safe_load(content[span.yaml_start : span.yaml_end])
+    except yaml_backend.YAMLError as e:
+        return None, [("frontmatter", None, _describe_yaml_error(e))]
+
+    if frontmatter is None:
+        return {}, []
+    if not isinstance(frontmatter, dict):
+        kind = type(frontmatter).__name__
+        return None, [("frontmatter", None, f"Frontmatter must be a mapping, got {kind}")]
+
+    findings: list[_Finding] = []
+    if "meta" in frontmatter and not isinstance(frontmatter["meta"], dict | None):
+        findings.append(("frontmatter", None, "'meta' must be a mapping"))
+    return frontmatter, findings
+
+
+def _describe_yaml_error(error: Exception) -> str:
+    mark = getattr(error, "problem_mark", None)
+    problem = getattr(error, "problem", None)
+    if mark is None or problem is None:
+        return f"Invalid YAML: {error}"
+    # Marks are relative to the YAML text; +2 for 1-based lines and the opening delimiter
+    return f"Invalid YAML at line {mark.line + 2}, column {mark.column + 1}: {problem}"
+
+
+def _check_agent_overrides(raw: Any) -> list[_Finding]:
+    if raw is None:
+        return []
+    if not isinstance(raw, dict):
+        return [("agent_overrides", None, "agent_overrides must be a mapping of agent keys")]
+
+    known_agents = set(list_agent_keys())
+    findings: list[_Finding] = []
+    for agent_key, overrides in raw.items():
+        agent = str(agent_key)
+        if agent_key not in known_agents:
+            findings.append(("agent_overrides", agent, f"Unknown agent key: {agent_key}"))
+            continue
+        if not isinstance(overrides, dict):
+            findings.append(("agent_overrides", agent, "Overrides must be a mapping"))
+            continue
+        if "enabled" in overrides and not isinstance(overrides["enabled"], bool):
+            findings.append(("agent_overrides", agent, "'enabled' must be true or false"))
+        if "arguments" in overrides:
+            try:
+                normalize_arguments(overrides["arguments"])
+            except ValueError as e:
+                findings.append(("agent_overrides", agent, str(e)))
+    return findings
+
+
+def _parse_output(output: str, command_format: CommandFormat) -> None:
+    """Raise if generated output does not parse back in its own format."""
+    if command_format == CommandFormat.TOML:
+        tomllib.loads(output)
+        return
+
+    span = scan_frontmatter(output)
+    if span is not None:
+        yaml_backend.safe_load(output[span.yaml_start : span.yaml_end])
+
+
+def _fingerprint() -> str:
+    """Identify the checks in effect; cached results from other checks are discarded.
+
+    Covers the agents, the code that renders each of their formats (plugin
+    generators and placeholders included) and the YAML backend.
+    """
+    agent_keys = list_agent_keys()
+    formats = sorted({get_agent_config(key).command_format for key in agent_keys})
+    return json.dumps(
+        [
+            __version__,
+            agent_keys,
+            [renderer_identity(CommandGenerator.create(format)) for format in formats],
+            [yaml.__version__, yaml_backend.HAS_LIBYAML],
+        ],
+        ensure_ascii=False,
+    )
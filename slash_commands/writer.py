@@ -2,23 +2,50 @@
 
 from __future__ import annotations
 
+import hashlib
 import importlib.resources
+import logging
 import os
 import re
 import shutil
 import tempfile
+import threading
 import tomllib
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
 from datetime import UTC, datetime
+from functools import partial
 from pathlib import Path
 from typing import Any, Literal
 
 import questionary
-import yaml
-
-from mcp_server.prompt_utils import MarkdownPrompt, load_markdown_prompt
+import requests
+
+from mcp_server import yaml_backend
+from mcp_server.prompt_cache import PromptCache
+from mcp_server.prompt_discovery import DiscoveryOptions, iter_prompt_files
+from mcp_server.prompt_utils import (
+    LazyMarkdownPrompt,
+    MarkdownPrompt,
+    load_lazy_markdown_prompt,
+    load_markdown_prompt,
+    scan_frontmatter,
+)
 from slash_commands.config import AgentConfig, get_agent_config, list_agent_keys
-from slash_commands.generators import CommandGenerator
-from slash_commands.github_utils import _download_github_prompts_to_temp_dir
+from slash_commands.generators import CommandChunks, _PromptRenderer
+from slash_commands.github_utils import (
+    _download_github_prompts_to_temp_dir,
+    fetch_github_prompts_to_store,
+)
+from slash_commands.manifest import Manifest, ManifestEntry
+from slash_commands.object_store import ObjectStore
+from slash_commands.render_cache import RenderCache, prompt_digest, render_key
+from slash_commands.run_context import RunContext
+
+logger = logging.getLogger(__name__)
 
 
 class NoPromptsDiscoveredError(RuntimeError):
@@ -63,6 +90,153 @@ def _find_package_prompts_dir() -> Path | None:
     return None
 
 
+def _iter_prompt_files_loaded(
+    prompt_files: Sequence[Path],
+    loader: Callable[[Path], MarkdownPrompt],
+    max_workers: int | None = None,
+) -> Iterator[MarkdownPrompt]:
+    """Load prompt files on a bounded thread pool, yielding them in order.
+
+    At most twice the worker count of prompts are loaded ahead of the consumer, so
+    memory stays bounded however many files there are. If several files fail, the
+    error for the earliest one in ``prompt_files`` is raised, exactly as a
+    sequential loop would.
+
+    Args:
+        prompt_files: Prompt file paths, in output order
+        loader: Function that reads and parses a single prompt file
+        max_workers: Thread count; ``None`` uses the ThreadPoolExecutor default and
+            ``1`` loads sequentially on the calling thread
+    """
+    if max_workers == 1 or len(prompt_files) <= 1:
+        for prompt_file in prompt_files:
+            yield loader(prompt_file)
+        return
+
+    # Same default as ThreadPoolExecutor
+    workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+    remaining = iter(prompt_files)
+    pending: deque[Future[MarkdownPrompt]] = deque()
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="prompt-loader")
+    try:
+        for prompt_file in remaining:
+            pending.append(executor.submit(loader, prompt_file))
+            if len(pending) >= workers * 2:
+                break
+        while pending:
+            prompt = pending.popleft().result()
+            next_file = next(remaining, None)
+            if next_file is not None:
+                pending.append(executor.submit(loader, next_file))
+            yield prompt
+    finally:
+        # Don't start files queued behind a failure or an abandoned stream
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+class _DirectoryListing:
+    """Names in the command directories of a run, each listed once with ``os.scandir``.
+
+    Answers the existence checks for the files a run writes without a system call
+    per file. Files written and directories created during the run are added as
+    they happen, so later checks see them. Safe to share between write workers.
+    """
+
+    def __init__(self) -> None:
+        # None for a directory that does not exist
+        self._names: dict[Path, set[str] | None] = {}
+        self._folded: dict[Path, set[str]] = {}
+        self._lock = threading.Lock()
+
+    def scan(self, directory: Path) -> set[str] | None:
+        """Return the names in ``directory``, listing it on first use."""
+        with self._lock:
+            names = self._scan(directory)
+            return set(names) if names is not None else None
+
+    def exists(self, path: Path) -> bool:
+        with self._lock:
+            names = self._scan(path.parent)
+            if names is None:
+                return False
+            if path.name in names:
+                return True
+            folded = path.name.casefold() in self._folded[path.parent]
+        # On a case-insensitive file system, "Name.md" is the existing "name.md"
+        return folded and path.exists()
+
+    def add(self, path: Path) -> None:
+        """Record a file written during the run."""
+        with self._lock:
+            names = self._scan(path.parent)
+            if names is None:
+                names = self._names[path.parent] = set()
+                self._folded[path.parent] = set()
+            names.add(path.name)
+            self._folded[path.parent].add(path.name.casefold())
+
+    def ensure_directory(self, directory: Path) -> None:
+        """Create ``directory`` unless it is known to exist."""
+        # Held across mkdir so a concurrent add() is never reset to an empty listing
+        with self._lock:
+            if self._scan(directory) is None:
+                directory.mkdir(parents=True, exist_ok=True)
+                self._names[directory] = set()
+                self._folded[directory] = set()
+
+    def _scan(self, directory: Path) -> set[str] | None:
+        try:
+            return self._names[directory]
+        except KeyError:
+            pass
+        try:
+            with os.scandir(directory) as entries:
+                names: set[str] | None = {entry.name for entry in entries}
+        except (FileNotFoundError, NotADirectoryError):
+            names = None
+        self._names[directory] = names
+        if names is not None:
+            self._folded[directory] = {name.casefold() for name in names}
+        return names
+
+
+@dataclass
+class _FileWrite:
+    """What writing one command file did, for the run's bookkeeping."""
+
+    file_info: dict[str, Any]
+    # Backup created, or in a dry run the file that would be backed up
+    backup: str | None = None
+    # Source prompt, SHA-256 and stat to record in the manifest
+    record: tuple[str, str, os.stat_result] | None = None
+    written: bool = False
+
+
+def _iter_writes_in_order(
+    tasks: Iterable[tuple[Path, Callable[[], _FileWrite]]], max_workers: int
+) -> Iterator[_FileWrite]:
+    """Run file writes on a thread pool and yield their results in task order.
+
+    At most twice the worker count of writes are in flight. A write to a path that
+    is still being written waits for the earlier one, so the last one wins as it
+    does sequentially. The first failure in task order is raised, and writes queued
+    behind it are not started.
+    """
+    pending: deque[tuple[Path, Future[_FileWrite]]] = deque()
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="command-writer")
+    try:
+        for path, task in tasks:
+            while pending and (
+                len(pending) >= max_workers * 2 or any(path == queued for queued, _ in pending)
+            ):
+                yield pending.popleft()[1].result()
+            pending.append((path, executor.submit(task)))
+        while pending:
+            yield pending.popleft()[1].result()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
 OverwriteAction = Literal["cancel", "overwrite", "backup", "overwrite-all", "skip-backups"]
 
 
@@ -110,6 +284,180 @@ def create_backup(file_path: Path) -> Path:
     return backup_path
 
 
+# Generation timestamps, matched only inside the metadata the generators write:
+# ``updated_at`` in the frontmatter ``meta:`` block and in the TOML ``[meta]``
+# table, and the ``updated:`` date in the trailing Kiro tracking comment
+_FRONTMATTER_META = re.compile(rb"^meta:[ \t]*\r?\n(?:[ \t][^\n]*\n)*", re.MULTILINE)
+_FRONTMATTER_TIMESTAMP = re.compile(rb"^  updated_at: '?[0-9T:.+-]+'?$", re.MULTILINE)
+_TOML_META_TABLE = re.compile(rb"(?:^|\n)\[meta\]\n((?:[A-Za-z0-9_-]+ = [^\n]*\n)*)\Z")
+_TOML_TIMESTAMP = re.compile(rb'^updated_at = "[0-9T:.+-]+"$', re.MULTILINE)
+_TRACKING_COMMENT = re.compile(rb"\n<!-- slash-command-manager: [^\n]* -->\n?\Z")
+_TRACKING_DATE = re.compile(rb"(?<=\| updated: )\d{4}-\d{2}-\d{2}(?= (?:\||-->))")
+
+
+def _mask_timestamps(content: bytes) -> bytes:
+    """Blank out the generation timestamps in a command file's metadata."""
+    regions: list[tuple[int, int, re.Pattern[bytes]]] = []
+    span = scan_frontmatter(content)
+    if span is not None:
+        meta = _FRONTMATTER_META.search(content, span.yaml_start, span.yaml_end)
+        if meta is not None:
+            regions.append((meta.start(), meta.end(), _FRONTMATTER_TIMESTAMP))
+    else:
+        # [meta] is the last table, after the prompt string
+        table = _TOML_META_TABLE.search(content)
+        if table is not None:
+            regions.append((table.start(1), table.end(1), _TOML_TIMESTAMP))
+    comment = _TRACKING_COMMENT.search(content)
+    if comment is not None:
+        regions.append((comment.start(), comment.end(), _TRACKING_DATE))
+
+    if not regions:
+        return content
+    pieces = []
+    end = 0
+    for start, stop, pattern in regions:
+        pieces.append(content[end:start])
+        pieces.append(pattern.sub(b"", content[start:stop]))
+        end = stop
+    pieces.append(content[end:])
+    return b"".join(pieces)
+
+
+def _sha256(chunks: Iterable[bytes]) -> str:
+    digest = hashlib.sha256()
+    for chunk in chunks:
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _matches_entry(entry: ManifestEntry, file_path: Path, stat: os.stat_result) -> bool:
+    """Whether a file still holds the content its manifest entry recorded.
+
+    Only files whose size or modification time changed are hashed.
+    """
+    return entry.matches(stat) or _sha256((file_path.read_bytes(),)) == entry.sha256
+
+
+def same_generated_content(existing: bytes, new: bytes) -> bool:
+    """Return True if two command files differ at most in their generation timestamps."""
+    if existing == new:
+        return True
+    return _mask_timestamps(existing) == _mask_timestamps(new)
+
+
+# Upper bound on the buffers passed to one os.writev() call (POSIX guarantees 16)
+_WRITEV_MAX_BUFFERS = 16
+# Windows translates line endings in files not opened in binary mode
+_O_BINARY = getattr(os, "O_BINARY", 0)
+
+
+# How hard write_chunks() tries to get files onto disk: "none" relies on the atomic
+# rename alone, "file" flushes every file and its directory before moving on, and
+# "batch" flushes everything written once the run is done
+Durability = Literal["none", "file", "batch"]
+
+
+def write_chunks(
+    path: Path,
+    chunks: Sequence[bytes],
+    *,
+    fsync: bool = False,
+    mode: int | None = None,
+    follow_symlinks: bool = True,
+) -> os.stat_result:
+    """Atomically replace ``path`` with ``chunks``, without joining them first.
+
+    The chunks are written to a temporary file next to ``path``, which is then
+    renamed over it, so an interrupted run never leaves a partially written file.
+    Uses ``os.writev`` where available, so a command file is usually written with
+    a single system call.
+
+    Args:
+        path: File to replace
+        chunks: New contents
+        fsync: Flush the file to disk before the rename, and the directory after it
+        mode: Permission bits for the new file. If None, the umask applies.
+        follow_symlinks: If ``path`` is a symbolic link, replace the file it points
+            to and keep the link. Callers that know ``path`` does not exist can pass
+            False to skip the check.
+
+    Returns:
+        The ``os.stat_result`` of the new file
+    """
+    if follow_symlinks and os.path.islink(path):
+        # Renaming over the link would replace it with a regular file
+        path = Path(os.path.realpath(path))
+
+    tmp_path = path.with_name(f".{path.name}.{os.urandom(4).hex()}.tmp")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | _O_BINARY, 0o666)
+    try:
+        try:
+            if mode is not None:
+                os.chmod(tmp_path, mode)
+            _write_all(fd, chunks)
+            if fsync:
+                os.fsync(fd)
+            stat = os.fstat(fd)
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+    if fsync:
+        fsync_directory(path.parent)
+    return stat
+
+
+def fsync_files(paths: Iterable[Path]) -> None:
+    """Flush files, then each of their directories once, to disk."""
+    directories: dict[Path, None] = {}
+    for path in paths:
+        fd = os.open(path, os.O_RDONLY | _O_BINARY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        directories[path.parent] = None
+    for directory in directories:
+        fsync_directory(directory)
+
+
+def fsync_directory(directory: Path) -> None:
+    """Flush a directory's entries (e.g. a rename) to disk.
+
+    Does nothing where directories cannot be opened, such as on Windows.
+    """
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _write_all(fd: int, chunks: Sequence[bytes]) -> None:
+    pending = [memoryview(chunk) for chunk in chunks if chunk]
+    if not hasattr(os, "writev"):
+        for chunk in pending:
+            while chunk:
+                chunk = chunk[os.write(fd, chunk) :]
+        return
+
+    while pending:
+        written = os.writev(fd, pending[:_WRITEV_MAX_BUFFERS])
+        # Drop what was written; a short write leaves part of a chunk
+        while written:
+            if written < len(pending[0]):
+                pending[0] = pending[0][written:]
+                break
+            written -= len(pending.pop(0))
+
+
 class SlashCommandWriter:
     """Orchestrates prompt loading and generation of command files for multiple agents."""
 
@@ -124,6 +472,14 @@ class SlashCommandWriter:
         github_repo: str | None = None,
         github_branch: str | None = None,
         github_path: str | None = None,
+        prompt_cache: PromptCache | None = None,
+        load_workers: int | None = None,
+        discovery: DiscoveryOptions | None = None,
+        object_store: ObjectStore | None = None,
+        run_context: RunContext | None = None,
+        render_cache: RenderCache | None = None,
+        durability: Durability = "none",
+        max_workers: int | None = None,
     ):
         """Initialize the writer.
 
@@ -138,7 +494,33 @@ class SlashCommandWriter:
             github_repo: GitHub repository in format owner/repo (optional)
             github_branch: GitHub branch name (optional)
             github_path: Path to prompts directory or single file within repository (optional)
+            prompt_cache: Parsed-prompt cache used for local prompt files (optional)
+            load_workers: Number of threads used to read and parse prompt files.
+                If None, uses the thread pool default; 1 loads sequentially.
+            discovery: Which files in the prompts directory are prompts. If None,
+                uses the flat ``*.md`` search.
+            object_store: Content-addressed store for GitHub prompts. When set, files
+                unchanged upstream are not downloaded again and are loaded through the
+                prompt cache (optional)
+            run_context: Timestamp shared by every generated file. If None, one is
+                captured from ``SOURCE_DATE_EPOCH`` or the clock when generation starts.
+            render_cache: Cache of rendered files, consulted before rendering when the
+                run timestamp is pinned (optional)
+            durability: When written files are flushed to disk: "none" (left to the
+                operating system), "file" (each file before the next one is written) or
+                "batch" (all files once the run is done). Files are always replaced
+                atomically.
+            max_workers: Number of threads that back up and write command files. If
+                None or 1, files are written one at a time. Results, backups and
+                errors are reported in the same order either way.
         """
+        if load_workers is not None and load_workers < 1:
+            raise ValueError(f"load_workers must be at least 1, got {load_workers}")
+        if max_workers is not None and max_workers < 1:
+            raise ValueError(f"max_workers must be at least 1, got {max_workers}")
+        if durability not in ("none", "file", "batch"):
+            raise ValueError(f"Unknown durability: {durability!r}")
+
         self.prompts_dir = prompts_dir
         self.agents = agents if agents is not None else list_agent_keys()
         self.dry_run = dry_run
@@ -148,9 +530,22 @@ class SlashCommandWriter:
         self.github_repo = github_repo
         self.github_branch = github_branch
         self.github_path = github_path
+        self.prompt_cache = prompt_cache
+        self.load_workers = load_workers
+        self.discovery = discovery
+        self.object_store = object_store
+        self.run_context = run_context
+        self.render_cache = render_cache
+        self.durability = durability
+        self.max_workers = max_workers
+        self.manifest = Manifest(self.base_path)
+        self._listing = _DirectoryListing()
+        self._unsynced: list[Path] = []  # Files written but not yet flushed ("batch")
         self._global_overwrite = False  # Track if user chose "overwrite-all"
         self._backups_created: list[str] = []  # Track backup files created
         self._backups_pending: list[str] = []  # Track backups that would be created in dry-run
+        # Existing files to ask about once the first of them is about to change
+        self._unconfirmed: list[Path] | None = None
 
         # Determine source metadata
         self._source_metadata: dict[str, Any] | None = None
@@ -176,46 +571,164 @@ class SlashCommandWriter:
             Dict with keys:
             - prompts_loaded: Number of prompts loaded
             - files_written: Number of files written
+            - files_unchanged: Number of existing files left alone because only their
+              generation timestamp would change
             - files: List of dicts with path and agent info
             - prompts: List of prompt metadata
+            - prompt_cache: Cache hit/miss counts, or None when no cache is configured
         """
-        # Load prompts
-        prompts = self._load_prompts()
-        if not prompts:
-            raise NoPromptsDiscoveredError(self._build_no_prompts_message())
-
-        # Get agent configs
-        agent_configs = [get_agent_config(key) for key in self.agents]
-
-        # Check for existing files upfront and prompt once if any exist
-        if not self.dry_run and not self.overwrite_action:
-            existing_files = self._find_existing_files(prompts, agent_configs)
-            if existing_files:
-                action = self._prompt_for_all_existing_files(existing_files)
-                if action == "cancel":
-                    raise RuntimeError("Cancelled by user")
-                self.overwrite_action = action
-
-        # Generate files
-        files = []
-        files_written = 0
-        for prompt in prompts:
-            for agent in agent_configs:
-                file_info = self._generate_file(prompt, agent)
-                if file_info:
-                    files.append(file_info)
-                    # Only count files that were actually written (not dry run)
-                    if not self.dry_run:
-                        files_written += 1
+        prompts: list[dict[str, str]] = []
+        files = list(
+            self.iter_generate(
+                on_prompt=lambda prompt: prompts.append(
+                    {"name": prompt.name, "path": str(prompt.path)}
+                )
+            )
+        )
 
+        unchanged = sum(1 for file_info in files if file_info["unchanged"])
         return {
             "prompts_loaded": len(prompts),
-            "files_written": files_written,
+            # Only count files that were actually written (not dry run)
+            "files_written": 0 if self.dry_run else len(files) - unchanged,
+            "files_unchanged": unchanged,
             "files": files,
-            "prompts": [{"name": p.name, "path": str(p.path)} for p in prompts],
+            "prompts": prompts,
             "backups_created": self._backups_created,
             "backups_pending": self._backups_pending,
+            "prompt_cache": self.prompt_cache.stats.as_dict() if self.prompt_cache else None,
+            "render_cache": (
+                self.render_cache.stats.as_dict() if self.render_cache is not None else None
+            ),
+        }
+
+    def iter_generate(
+        self, on_prompt: Callable[[MarkdownPrompt], None] | None = None
+    ) -> Iterator[dict[str, Any]]:
+        """Load, render and write command files one prompt at a time.
+
+        Each prompt is loaded, rendered and written for every agent before the next
+        one is loaded, so memory does not grow with the size of the catalog. Existing
+        files are found upfront with a metadata-only pass over the prompts, and the
+        user is asked once, when the first of them is about to change; a run that
+        leaves every existing file unchanged asks nothing. Files created before the
+        question are kept if the user cancels.
+
+        Args:
+            on_prompt: Called with each prompt as it is loaded (including disabled ones)
+
+        Yields:
+            Dicts with path and agent info for each generated file, as in
+            ``generate()["files"]``
+        """
+        with self._prompt_source() as (prompt_files, use_cache):
+            if not prompt_files:
+                raise NoPromptsDiscoveredError(self._build_no_prompts_message())
+
+            # Get agent configs
+            agent_configs = [get_agent_config(key) for key in self.agents]
+            # List every command directory once; existence checks for the files
+            # of this run are answered from the listing
+            self._listing = _DirectoryListing()
+            for agent in agent_configs:
+                self._listing.scan(self.base_path / agent.get_command_dir())
+            renderer = _PromptRenderer(
+                agent_configs, self._source_metadata, self.run_context or RunContext.create()
+            )
+
+            # Find existing files upfront; the question is asked by
+            # _handle_existing_file once one of them actually changes. Only the
+            # frontmatter is needed here, so bodies are not read until generation.
+            self._unconfirmed = None
+            if not self.dry_run and not self.overwrite_action:
+                metadata = (load_lazy_markdown_prompt(path) for path in prompt_files)
+                self._unconfirmed = self._find_existing_files(metadata, agent_configs) or None
+
+            loader = self._load_prompt_file if use_cache else load_markdown_prompt
+            tasks = self._iter_write_tasks(
+                _iter_prompt_files_loaded(prompt_files, loader, self.load_workers),
+                renderer,
+                agent_configs,
+                on_prompt,
+            )
+            try:
+                # A pending question is asked from _write_file, so those runs write
+                # on the calling thread
+                if self.max_workers is None or self.max_workers == 1 or self._unconfirmed:
+                    results: Iterable[_FileWrite] = (task() for _, task in tasks)
+                else:
+                    # Workers look files up in the manifest; load it before they start
+                    self.manifest.load()
+                    results = _iter_writes_in_order(tasks, self.max_workers)
+                for result in results:
+                    yield self._finish_file(result)
+            finally:
+                if self._unsynced:
+                    fsync_files(self._unsynced)
+                    self._unsynced.clear()
+                if use_cache and self.prompt_cache is not None:
+                    self.prompt_cache.save()
+                if self.render_cache is not None:
+                    self.render_cache.save()
+                if not self.dry_run:
+                    self.manifest.save()
+
+    def _iter_write_tasks(
+        self,
+        prompts: Iterable[MarkdownPrompt],
+        renderer: _PromptRenderer,
+        agent_configs: list[AgentConfig],
+        on_prompt: Callable[[MarkdownPrompt], None] | None,
+    ) -> Iterator[tuple[Path, Callable[[], _FileWrite]]]:
+        """Render each prompt and yield the file writes for it, with their output paths."""
+        for prompt in prompts:
+            if on_prompt is not None:
+                on_prompt(prompt)
+            # Skip if prompt is disabled
+            if not prompt.enabled:
+                continue
+            contents = self._render_prompt(renderer, prompt)
+            for agent in agent_configs:
+                output_path = self._output_path(prompt, agent)
+                yield (
+                    output_path,
+                    partial(self._write_file, prompt, agent, output_path, contents[agent.key]),
+                )
+
+    def _render_prompt(
+        self, renderer: _PromptRenderer, prompt: MarkdownPrompt
+    ) -> dict[str, CommandChunks]:
+        """Render a prompt for every agent, reusing cached files where possible."""
+        cache = self.render_cache
+        # Files embed the run timestamp, so only a pinned one can match earlier runs
+        if cache is None or not renderer.context.reproducible:
+            return renderer.render_bytes(prompt)
+
+        digest = prompt_digest(prompt)
+        keys = {
+            agent.key: render_key(
+                digest,
+                agent,
+                self._source_metadata,
+                renderer.context,
+                renderer.generator(agent.command_format),
+            )
+            for agent in renderer.agents
         }
+        contents: dict[str, CommandChunks] = {}
+        missing = []
+        for agent in renderer.agents:
+            chunks = cache.get(keys[agent.key])
+            if chunks is None:
+                missing.append(agent)
+            else:
+                contents[agent.key] = chunks
+        if missing:
+            rendered = renderer.render_bytes(prompt, missing)
+            for agent in missing:
+                cache.put(keys[agent.key], rendered[agent.key])
+                contents[agent.key] = rendered[agent.key]
+        return contents
 
     def _build_no_prompts_message(self) -> str:
         """Construct an actionable error message for zero-prompt scenarios."""
@@ -239,8 +752,14 @@ class SlashCommandWriter:
         )
         return "\n".join(lines)
 
-    def _load_prompts(self) -> list[MarkdownPrompt]:
-        """Load all prompts from the prompts directory or GitHub repository."""
+    @contextmanager
+    def _prompt_source(self) -> Iterator[tuple[list[Path], bool]]:
+        """Resolve the prompt files to load, downloading GitHub prompts if configured.
+
+        Yields:
+            The prompt file paths in load order, and whether they may go through the
+            prompt cache. Downloaded files only exist until the context exits.
+        """
         # Check if GitHub parameters are provided
         if self.github_repo and self.github_branch and self.github_path:
             # Download from GitHub to temporary directory
@@ -248,6 +767,24 @@ class SlashCommandWriter:
 
             owner, repo = validate_github_repo(self.github_repo)
 
+            if self.object_store is not None:
+                try:
+                    source_key = fetch_github_prompts_to_store(
+                        owner, repo, self.github_branch, self.github_path, self.object_store
+                    )
+                    self.object_store.save()
+                    checkout_dir = self.object_store.checkout(source_key)
+                except requests.exceptions.RequestException:
+                    raise
+                except OSError as e:
+                    # The store is an optimization; download to a temp dir instead
+                    logger.warning(
+                        "Could not use the prompt store in %s: %s", self.object_store.root, e
+                    )
+                else:
+                    yield list(iter_prompt_files(checkout_dir, self.discovery)), True
+                    return
+
             with tempfile.TemporaryDirectory() as temp_dir_str:
                 temp_dir = Path(temp_dir_str)
                 _download_github_prompts_to_temp_dir(
@@ -255,12 +792,8 @@ class SlashCommandWriter:
                 )
 
                 # Load prompts from temp directory using existing logic
-                prompts = []
-                for prompt_file in sorted(temp_dir.glob("*.md")):
-                    prompt = load_markdown_prompt(prompt_file)
-                    prompts.append(prompt)
-
-                return prompts
+                yield list(iter_prompt_files(temp_dir, self.discovery)), False
+            return
 
         # Load from local directory (existing logic)
         prompts_dir = self.prompts_dir
@@ -277,12 +810,13 @@ class SlashCommandWriter:
                 # Explicit path not found, raise error immediately without fallback
                 raise ValueError(f"Prompts directory does not exist: {self.prompts_dir}")
 
-        prompts = []
-        for prompt_file in sorted(prompts_dir.glob("*.md")):
-            prompt = load_markdown_prompt(prompt_file)
-            prompts.append(prompt)
+        yield list(iter_prompt_files(prompts_dir, self.discovery)), True
 
-        return prompts
+    def _load_prompt_file(self, prompt_file: Path) -> MarkdownPrompt:
+        """Load a local prompt file, going through the prompt cache when configured."""
+        if self.prompt_cache is not None:
+            return self.prompt_cache.load(prompt_file)
+        return load_markdown_prompt(prompt_file)
 
     def _sanitize_filename(self, name: str, extension: str) -> str:
         """Sanitize a filename by removing path components and unsafe characters.
@@ -300,7 +834,9 @@ class SlashCommandWriter:
         return f"{safe_stem}{extension}"
 
     def _find_existing_files(
-        self, prompts: list[MarkdownPrompt], agent_configs: list[AgentConfig]
+        self,
+        prompts: Iterable[MarkdownPrompt | LazyMarkdownPrompt],
+        agent_configs: list[AgentConfig],
     ) -> list[Path]:
         """Find all existing files that would be overwritten.
 
@@ -316,11 +852,8 @@ class SlashCommandWriter:
             if not prompt.enabled:
                 continue
             for agent in agent_configs:
-                # Determine output path (same logic as _generate_file)
-                filename = self._sanitize_filename(prompt.name, agent.command_file_extension)
-                output_path = self.base_path / agent.get_command_dir() / filename
-
-                if output_path.exists():
+                output_path = self._output_path(prompt, agent)
+                if self._listing.exists(output_path):
                     existing_files.append(output_path)
         return existing_files
 
@@ -335,8 +868,8 @@ class SlashCommandWriter:
         """
         file_count = len(existing_files)
         response = questionary.select(
-            f"Found {file_count} existing file{'s' if file_count != 1 else ''} "
-            "that will be overwritten.\nWhat would you like to do?",
+            f"Existing files will be overwritten ({file_count} existing "
+            f"file{'s' if file_count != 1 else ''} in the target).\nWhat would you like to do?",
             choices=[
                 questionary.Choice("Cancel", "cancel"),
                 questionary.Choice("Create backups and overwrite all (recommended)", "backup"),
@@ -357,57 +890,119 @@ class SlashCommandWriter:
 
         return response  # type: ignore[return-value]
 
-    def _generate_file(self, prompt: MarkdownPrompt, agent: AgentConfig) -> dict[str, Any] | None:
-        """Generate a command file for a single prompt and agent.
-
-        Args:
-            prompt: The prompt to generate from
-            agent: The agent configuration
-
-        Returns:
-            Dict with path and agent info, or None if skipped
-        """
-        # Skip if prompt is disabled
-        if not prompt.enabled:
-            return None
-
-        # Create generator for this agent's format
-        generator = CommandGenerator.create(agent.command_format)
-
-        # Generate command content with source metadata
-        content = generator.generate(prompt, agent, self._source_metadata)
-
+    def _output_path(self, prompt: MarkdownPrompt | LazyMarkdownPrompt, agent: AgentConfig) -> Path:
         # Determine output path (resolve relative to base_path)
         # Sanitize file stem: drop any path components and restrict to safe chars
         filename = self._sanitize_filename(prompt.name, agent.command_file_extension)
-        output_path = self.base_path / agent.get_command_dir() / filename
+        return self.base_path / agent.get_command_dir() / filename
+
+    def _write_file(
+        self,
+        prompt: MarkdownPrompt,
+        agent: AgentConfig,
+        output_path: Path,
+        content: CommandChunks,
+    ) -> _FileWrite:
+        """Back up and write one command file.
+
+        Safe to run on a worker thread: the run's shared state is only updated by
+        :meth:`_finish_file`.
+        """
+        result = _FileWrite(
+            file_info={
+                "path": str(output_path),
+                "agent": agent.key,
+                "agent_display_name": agent.display_name,
+                "format": agent.command_format.value,
+                "unchanged": False,
+            }
+        )
+
+        digest = _sha256(content)
+        stat = None
+        listed = self._listing.exists(output_path)
+        if listed:
+            try:
+                stat = os.stat(output_path)
+            except FileNotFoundError:
+                pass
+
+        # Leave files alone, without a backup, when only the timestamp would change
+        if stat is not None:
+            unchanged, existing_digest = self._is_unchanged(output_path, stat, content, digest)
+            if unchanged:
+                result.file_info["unchanged"] = True
+                if existing_digest is not None:
+                    # Record the file as it is on disk, with its earlier timestamp
+                    result.record = (prompt.name, existing_digest, stat)
+                return result
 
         # Handle existing files
-        if output_path.exists():
+        if stat is not None:
             action = self._handle_existing_file(output_path)
             if action == "cancel":
                 raise RuntimeError("Cancelled by user")
             if action == "backup":
                 if self.dry_run:
-                    self._backups_pending.append(str(output_path))
+                    result.backup = str(output_path)
                 else:
-                    backup_path = create_backup(output_path)
-                    self._backups_created.append(str(backup_path))
+                    result.backup = str(create_backup(output_path))
 
         # Create parent directories if needed
         if not self.dry_run:
-            output_path.parent.mkdir(parents=True, exist_ok=True)
+            self._listing.ensure_directory(output_path.parent)
 
         # Write file if not dry run
         if not self.dry_run:
-            output_path.write_text(content, encoding="utf-8")
+            new_stat = write_chunks(
+                output_path,
+                content,
+                fsync=self.durability == "file",
+                # Keep the permissions of the file being replaced
+                mode=stat.st_mode & 0o7777 if stat is not None else None,
+                # A path with no directory entry cannot be a symlink
+                follow_symlinks=listed,
+            )
+            result.record = (prompt.name, digest, new_stat)
+            result.written = True
+            self._listing.add(output_path)
+
+        return result
+
+    def _finish_file(self, result: _FileWrite) -> dict[str, Any]:
+        """Apply one file's backup and manifest bookkeeping to the run, in output order."""
+        file_info = result.file_info
+        if result.backup is not None:
+            if self.dry_run:
+                self._backups_pending.append(result.backup)
+            else:
+                self._backups_created.append(result.backup)
+        if result.record is not None and not self.dry_run:
+            self.manifest.record(Path(file_info["path"]), file_info["agent"], *result.record)
+        if result.written and self.durability == "batch":
+            self._unsynced.append(Path(file_info["path"]))
+        return file_info
 
-        return {
-            "path": str(output_path),
-            "agent": agent.key,
-            "agent_display_name": agent.display_name,
-            "format": agent.command_format.value,
-        }
+    def _is_unchanged(
+        self, output_path: Path, stat: os.stat_result, content: CommandChunks, digest: str
+    ) -> tuple[bool, str | None]:
+        """Check whether the existing file differs from ``content`` at most in its timestamp.
+
+        A file the manifest recorded with the same hash, and that has not been touched
+        since, is not read.
+
+        Returns:
+            Whether the file is unchanged, and the SHA-256 of the existing file when it
+            had to be read
+        """
+        entry = self.manifest.get(output_path)
+        if entry is not None and entry.sha256 == digest and entry.matches(stat):
+            return True, None
+
+        existing = output_path.read_bytes()
+        if not same_generated_content(existing, b"".join(content)):
+            return False, None
+        return True, hashlib.sha256(existing).hexdigest()
 
     def _handle_existing_file(self, file_path: Path) -> OverwriteAction:
         """Handle an existing file by applying the global overwrite action.
@@ -418,7 +1013,6 @@ class SlashCommandWriter:
         Returns:
             OverwriteAction to apply
         """
-        # Use global action if set (it should always be set after our upfront check)
         if self.dry_run:
             # Default to backup during dry-run to surface pending backups
             return self.overwrite_action or "backup"
@@ -426,7 +1020,15 @@ class SlashCommandWriter:
         if self.overwrite_action:
             return self.overwrite_action
 
-        # This should not happen anymore, but keep as fallback
+        # First existing file that changes: ask once for all of them
+        if self._unconfirmed:
+            action = self._prompt_for_all_existing_files(self._unconfirmed)
+            self._unconfirmed = None
+            if action != "cancel":
+                self.overwrite_action = action
+            return action
+
+        # No existing file was found upfront, e.g. one created during the run
         return "backup"
 
     def find_generated_files(
@@ -452,20 +1054,27 @@ class SlashCommandWriter:
                 if not command_dir.exists():
                     continue
 
-                # Check for regular command files
+                # Check for regular command files; files listed in the manifest and
+                # not edited since are known to be generated and are not parsed
                 for file_path in command_dir.glob(f"*{agent.command_file_extension}"):
-                    if self._is_generated_file(file_path, agent):
-                        # Convert Path to string explicitly using os.fspath
-                        path_str = os.fspath(file_path)
-                        found_files.append(
-                            {
-                                "path": path_str,
-                                "agent": agent.key,
-                                "agent_display_name": agent.display_name,
-                                "type": "command",
-                                "reason": "Has generated metadata",
-                            }
-                        )
+                    entry = self.manifest.get(file_path)
+                    if entry is not None and _matches_entry(entry, file_path, file_path.stat()):
+                        reason = "Listed in manifest"
+                    elif self._is_generated_file(file_path, agent):
+                        reason = "Has generated metadata"
+                    else:
+                        continue
+                    # Convert Path to string explicitly using os.fspath
+                    path_str = os.fspath(file_path)
+                    found_files.append(
+                        {
+                            "path": path_str,
+                            "agent": agent.key,
+                            "agent_display_name": agent.display_name,
+                            "type": "command",
+                            "reason": reason,
+                        }
+                    )
 
                 # Check for backup files
                 if include_backups:
@@ -491,6 +1100,37 @@ class SlashCommandWriter:
 
         return found_files
 
+    def manifest_status(self, agents: list[str] | None = None) -> list[dict[str, Any]]:
+        """Compare the files recorded in the target's manifest with the files on disk.
+
+        Args:
+            agents: List of agent keys to report. If None, reports all recorded files.
+
+        Returns:
+            List of dicts with keys: path, agent, source_prompt, state; state is
+            "ok", "modified" (edited since it was generated) or "missing"
+        """
+        statuses = []
+        for entry in self.manifest:
+            if agents is not None and entry.agent not in agents:
+                continue
+            file_path = self.manifest.resolve(entry)
+            try:
+                stat = os.stat(file_path)
+            except FileNotFoundError:
+                state = "missing"
+            else:
+                state = "ok" if _matches_entry(entry, file_path, stat) else "modified"
+            statuses.append(
+                {
+                    "path": os.fspath(file_path),
+                    "agent": entry.agent,
+                    "source_prompt": entry.source_prompt,
+                    "state": state,
+                }
+            )
+        return statuses
+
     def _is_generated_file(self, file_path: Path, agent: AgentConfig) -> bool:
         """Check if a file was generated by this tool.
 
@@ -524,23 +1164,19 @@ class SlashCommandWriter:
             True if generated by this tool
         """
         # Check for YAML frontmatter with metadata
-        if not content.startswith("---"):
+        span = scan_frontmatter(content)
+        if span is None:
             return False
 
         try:
-            # Extract YAML frontmatter
-            parts = content.split("---", 2)
-            if len(parts) < 3:
-                return False
-
-            frontmatter = yaml.safe_load(parts[1])
+            frontmatter = yaml_backend.safe_load(content[span.yaml_start : span.yaml_end])
             if not isinstance(frontmatter, dict):
                 return False
 
             # Check for meta section with source_prompt or version
             meta = frontmatter.get("meta", {})
             return isinstance(meta, dict) and ("source_prompt" in meta or "version" in meta)
-        except (yaml.YAMLError, AttributeError):
+        except (yaml_backend.YAMLError, AttributeError):
             return False
 
     def _is_generated_toml(self, content: str) -> bool:
@@ -599,11 +1235,15 @@ class SlashCommandWriter:
                 try:
                     file_path.unlink()
                     deleted_files.append(file_info)
+                    self.manifest.remove(file_path)
                 except OSError as e:
                     errors.append({"path": str(file_path), "error": str(e)})
             else:
                 deleted_files.append(file_info)
 
+        if not dry_run:
+            self.manifest.save()
+
         return {
             "files_found": len(found_files),
             "files_deleted": len(deleted_files),
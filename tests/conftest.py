@@ -10,6 +10,18 @@ from fastmcp import FastMCP
 from mcp_server.prompt_utils import MarkdownPrompt, load_markdown_prompt
 
 
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path_factory, monkeypatch):
+    """Keep the slash-man cache out of the real user cache directory.
+
+    Returns:
+        Path to the per-test cache directory
+    """
+    cache_dir = tmp_path_factory.mktemp("slash-man-cache")
+    monkeypatch.setenv("SLASH_MAN_CACHE_DIR", str(cache_dir))
+    return cache_dir
+
+
 @pytest.fixture
 def temp_workspace():
     """Create a temporary workspace directory for testing.
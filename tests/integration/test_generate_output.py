@@ -32,12 +32,20 @@ def _normalize_summary(summary: str, target_path: Path) -> str:
     return normalized
 
 
+def _edit_generated_files(target_path: Path) -> None:
+    # Files that only differ in their timestamp are left alone, so change them
+    for command_file in (target_path / ".claude" / "commands").glob("*.md"):
+        with command_file.open("a", encoding="utf-8") as handle:
+            handle.write("Local edit\n")
+
+
 EXPECTED_REAL_RUN = """╭──────────────────────────── Generation Summary ────────────────────────────╮
 │ Generation (safe mode) Summary                                             │
 │ ├── Counts                                                                 │
 │ │   ├── Prompts loaded: 3                                                  │
 │ │   ├── Files planned: 3                                                   │
-│ │   └── Files written: 3                                                   │
+│ │   ├── Files written: 3                                                   │
+│ │   └── Prompt cache: 0 hit(s), 3 miss(es)                                 │
 │ ├── Agents                                                                 │
 │ │   ├── Detected                                                           │
 │ │   │   └── claude-code                                                    │
@@ -67,7 +75,8 @@ EXPECTED_BACKUP_RUN = """╭─────────────────
 │ ├── Counts                                                                 │
 │ │   ├── Prompts loaded: 3                                                  │
 │ │   ├── Files planned: 3                                                   │
-│ │   └── Files written: 3                                                   │
+│ │   ├── Files written: 3                                                   │
+│ │   └── Prompt cache: 3 hit(s), 0 miss(es)                                 │
 │ ├── Agents                                                                 │
 │ │   ├── Detected                                                           │
 │ │   │   └── claude-code                                                    │
@@ -100,7 +109,8 @@ EXPECTED_DRY_RUN = """╭──────────────────
 │ ├── Counts                                                                 │
 │ │   ├── Prompts loaded: 3                                                  │
 │ │   ├── Files planned: 3                                                   │
-│ │   └── Files written: 0                                                   │
+│ │   ├── Files written: 0                                                   │
+│ │   └── Prompt cache: 3 hit(s), 0 miss(es)                                 │
 │ ├── Agents                                                                 │
 │ │   ├── Detected                                                           │
 │ │   │   └── claude-code                                                    │
@@ -164,6 +174,7 @@ def test_rich_summary_backup_counts_snapshot(temp_test_dir: Path, test_prompts_d
         ],
     )
     assert seed.exit_code == 0
+    _edit_generated_files(temp_test_dir)
 
     result = runner.invoke(
         app,
@@ -199,6 +210,7 @@ def test_rich_summary_dry_run_pending_backups(temp_test_dir: Path, test_prompts_
         ],
     )
     assert seed.exit_code == 0
+    _edit_generated_files(temp_test_dir)
 
     result = runner.invoke(
         app,
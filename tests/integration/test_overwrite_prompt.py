@@ -49,6 +49,11 @@ def test_skip_backups_only_route_without_backups(temp_test_dir: Path, test_promp
     for backup in command_dir.glob("*.bak"):
         backup.unlink()
 
+    # Unchanged files are left alone without asking, so change them
+    for command_file in command_dir.glob("*.md"):
+        with command_file.open("a", encoding="utf-8") as handle:
+            handle.write("Local edit\n")
+
     spawn_cmd = get_slash_man_command()
     command = spawn_cmd[0]
     args = spawn_cmd[1:] + base_args
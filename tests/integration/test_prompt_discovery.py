@@ -67,6 +67,7 @@ def test_zero_prompts_github_download_fails(temp_test_dir: Path):
                 "claude-code",
                 "--target-path",
                 str(target_path),
+                "--no-cache",
                 "--yes",
             ],
         )
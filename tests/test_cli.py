@@ -8,6 +8,7 @@ from unittest.mock import MagicMock, patch
 import pytest
 from typer.testing import CliRunner
 
+from mcp_server.prompt_discovery import DiscoveryOptions
 from slash_commands.cli import _resolve_detected_agents, app
 from slash_commands.config import AgentConfig, CommandFormat
 
@@ -175,6 +176,119 @@ def test_cli_yes_flag_injects_backup_action(mock_prompts_dir, tmp_path):
         assert kwargs["overwrite_action"] == "backup"
 
 
+def test_cli_load_workers_option_is_passed_to_writer(mock_prompts_dir, tmp_path):
+    """--load-workers should configure the writer's prompt loading pool."""
+    runner = CliRunner()
+    with patch("slash_commands.cli.SlashCommandWriter") as mock_writer:
+        writer_instance = mock_writer.return_value
+        writer_instance.generate.return_value = {
+            "prompts_loaded": 0,
+            "files_written": 0,
+            "files": [],
+            "prompts": [],
+            "backups_created": [],
+            "backups_pending": [],
+        }
+
+        result = runner.invoke(
+            app,
+            [
+                "generate",
+                "--prompts-dir",
+                str(mock_prompts_dir),
+                "--agent",
+                "claude-code",
+                "--target-path",
+                str(tmp_path),
+                "--yes",
+                "--load-workers",
+                "3",
+            ],
+        )
+
+        assert result.exit_code == 0
+        _, kwargs = mock_writer.call_args
+        assert kwargs["load_workers"] == 3
+
+
+def test_cli_jobs_option_is_passed_to_writer(mock_prompts_dir, tmp_path):
+    """--jobs should configure the writer's file writing pool."""
+    runner = CliRunner()
+    with patch("slash_commands.cli.SlashCommandWriter") as mock_writer:
+        writer_instance = mock_writer.return_value
+        writer_instance.generate.return_value = {
+            "prompts_loaded": 0,
+            "files_written": 0,
+            "files": [],
+            "prompts": [],
+            "backups_created": [],
+            "backups_pending": [],
+        }
+
+        result = runner.invoke(
+            app,
+            [
+                "generate",
+                "--prompts-dir",
+                str(mock_prompts_dir),
+                "--agent",
+                "claude-code",
+                "--target-path",
+                str(tmp_path),
+                "--yes",
+                "-j",
+                "8",
+            ],
+        )
+
+        assert result.exit_code == 0
+        _, kwargs = mock_writer.call_args
+        assert kwargs["max_workers"] == 8
+
+
+def test_cli_discovery_options_are_passed_to_writer(mock_prompts_dir, tmp_path):
+    """--include/--exclude/--max-depth should configure recursive prompt discovery."""
+    runner = CliRunner()
+    with patch("slash_commands.cli.SlashCommandWriter") as mock_writer:
+        writer_instance = mock_writer.return_value
+        writer_instance.generate.return_value = {
+            "prompts_loaded": 0,
+            "files_written": 0,
+            "files": [],
+            "prompts": [],
+            "backups_created": [],
+            "backups_pending": [],
+        }
+
+        result = runner.invoke(
+            app,
+            [
+                "generate",
+                "--prompts-dir",
+                str(mock_prompts_dir),
+                "--agent",
+                "claude-code",
+                "--target-path",
+                str(tmp_path),
+                "--yes",
+                "--include",
+                "*.md",
+                "--include",
+                "*.prompt",
+                "--exclude",
+                "drafts",
+                "--max-depth",
+                "2",
+            ],
+        )
+
+        assert result.exit_code == 0
+        _, kwargs = mock_writer.call_args
+        assert kwargs["discovery"] == DiscoveryOptions(
+            recursive=True, include=("*.md", "*.prompt"), exclude=("drafts",), max_depth=2
+        )
+
+
 def test_cli_yes_flag_mentions_safe_mode(mock_prompts_dir, tmp_path):
     """--yes output should mention non-interactive safe mode to users."""
     runner = CliRunner()
@@ -331,6 +445,29 @@ def test_cli_shows_summary(mock_prompts_dir, tmp_path):
     assert "prompts loaded" in result.stdout.lower() or "files written" in result.stdout.lower()
 
 
+def test_cli_summary_counts_unchanged_files(mock_prompts_dir, tmp_path):
+    """Regenerating identical prompts reports the files as unchanged."""
+    args = [
+        "generate",
+        "--prompts-dir",
+        str(mock_prompts_dir),
+        "--agent",
+        "claude-code",
+        "--target-path",
+        str(tmp_path),
+        "--yes",
+    ]
+    runner = CliRunner()
+    first = runner.invoke(app, args)
+    second = runner.invoke(app, args)
+
+    assert first.exit_code == 0
+    assert second.exit_code == 0
+    assert "Files unchanged" not in first.stdout
+    assert "Files written: 0" in second.stdout
+    assert "Files unchanged:" in second.stdout
+
+
 def test_cli_respects_prompts_dir_option(mock_prompts_dir, tmp_path):
     """Test that CLI respects --prompts-dir option."""
     runner = CliRunner()
@@ -1227,3 +1364,47 @@ def test_documentation_github_examples():
     # Test that cleanup help works
     result = runner.invoke(app, ["cleanup", "--help"])
     assert result.exit_code == 0
+
+
+def test_cli_generate_timestamp_pins_updated_at(mock_prompts_dir, tmp_path):
+    """--timestamp is written to every generated file."""
+    runner = CliRunner()
+    result = runner.invoke(
+        app,
+        [
+            "generate",
+            "--prompts-dir",
+            str(mock_prompts_dir),
+            "--agent",
+            "claude-code",
+            "--target-path",
+            str(tmp_path),
+            "--timestamp",
+            "1735787045",
+            "--yes",
+        ],
+    )
+
+    assert result.exit_code == 0
+    generated = (tmp_path / ".claude" / "commands" / "test-prompt.md").read_text()
+    assert "updated_at: '2025-01-02T03:04:05+00:00'" in generated
+
+
+def test_cli_generate_rejects_invalid_timestamp(mock_prompts_dir, tmp_path):
+    """An unparseable --timestamp is a validation error."""
+    runner = CliRunner()
+    result = runner.invoke(
+        app,
+        [
+            "generate",
+            "--prompts-dir",
+            str(mock_prompts_dir),
+            "--target-path",
+            str(tmp_path),
+            "--timestamp",
+            "yesterday",
+        ],
+    )
+
+    assert result.exit_code == 2
+    assert "invalid timestamp" in _get_cli_output(result)
@@ -0,0 +1,183 @@
+"""Parity tests for the schema-specialised YAML and TOML emitters."""
+
+from __future__ import annotations
+
+import random
+from typing import Any
+
+import pytest
+import tomli_w
+
+from mcp_server import yaml_backend
+from slash_commands import emitters
+from slash_commands.emitters import emit_toml, emit_yaml
+
+# Fragments chosen to hit YAML indicators, implicit types, escapes and folding
+FRAGMENTS = [
+    "a",
+    "word",
+    "\u2028",
+    "  ",
+    ":",
+    ": ",
+    " #",
+    "#",
+    "-",
+    "- ",
+    "'",
+    '"',
+    "\\",
+    "\n",
+    "\r",
+    "\t",
+    "\x07",
+    "\x7f",
+    "\x85",
+    " ",
+    "\ufeff",
+    "é",
+    "日本",
+    "😀",
+    "yes",
+    "off",
+    "null",
+    "~",
+    "1",
+    "0.5",
+    "2025-01-02",
+    "*",
+    "&",
+    "!",
+    "?",
+    "[",
+    "{",
+    "%",
+    "@",
+    "`",
+    ",",
+    "|",
+    ">",
+    "---",
+    "x" * 40,
+]
+
+
+def _text(rng: random.Random) -> str:
+    return "".join(rng.choice(FRAGMENTS) for _ in range(rng.randint(0, 25)))
+
+
+def _words(rng: random.Random) -> str:
+    """Long space-separated text that PyYAML folds across lines."""
+    words = ["a", "word", "longerword", "x" * 40, "é", "日本語", "yes", "2025"]
+    return " ".join(rng.choice(words) for _ in range(rng.randint(1, 40)))
+
+
+def _scalar(rng: random.Random) -> Any:
+    return rng.choice(
+        [None, True, False, rng.randint(-(10**6), 10**6), 1.5, _text(rng), _words(rng)]
+    )
+
+
+def _value(rng: random.Random, depth: int = 0) -> Any:
+    kind = rng.randint(0, 5)
+    if kind < 3 or depth > 2:
+        return _scalar(rng)
+    if kind == 3:
+        return [_value(rng, depth + 1) for _ in range(rng.randint(0, 3))]
+    return {_key(rng): _value(rng, depth + 1) for _ in range(rng.randint(0, 3))}
+
+
+def _key(rng: random.Random) -> str:
+    return _text(rng) if rng.random() < 0.3 else rng.choice(["name", "description", "x y"])
+
+
+def _frontmatter(rng: random.Random) -> dict[str, Any]:
+    """A generated frontmatter with random values in every field."""
+    return {
+        "name": _text(rng),
+        "description": rng.choice([_text(rng), _words(rng), None]),
+        "tags": [_text(rng) for _ in range(rng.randint(0, 3))],
+        "enabled": rng.choice([True, False]),
+        "arguments": [
+            {"name": _text(rng), "description": _words(rng), "required": rng.random() < 0.5}
+            for _ in range(rng.randint(0, 3))
+        ],
+        "meta": {_key(rng): _value(rng) for _ in range(rng.randint(0, 6))},
+    }
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_emit_yaml_matches_safe_dump(seed):
+    rng = random.Random(f"emit-yaml-{seed}")
+    for _ in range(400):
+        data = _frontmatter(rng) if rng.random() < 0.5 else {_key(rng): _value(rng)}
+        assert emit_yaml(data) == yaml_backend.safe_dump(data, allow_unicode=True, sort_keys=False)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_emit_toml_matches_tomli_w(seed):
+    rng = random.Random(f"emit-toml-{seed}")
+    for _ in range(400):
+        data: dict[str, Any] = {"prompt": _text(rng) + _words(rng), "description": _text(rng)}
+        data["meta"] = {
+            _key(rng): rng.choice([_text(rng), True, rng.randint(0, 99), 1.5])
+            for _ in range(rng.randint(0, 6))
+        }
+        if rng.random() < 0.2:
+            data["meta"]["nested"] = {"key": _text(rng)}
+        assert emit_toml(data) == tomli_w.dumps(data)
+
+
+def test_emit_yaml_writes_typical_frontmatter_without_pyyaml(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("fell back to the general serializer")
+
+    monkeypatch.setattr(emitters.yaml_backend, "safe_dump", fail)
+    data = {
+        "name": "sdd-1-generate-spec",
+        "description": " ".join(["Generate a specification"] * 5),
+        "tags": ["planning"],
+        "enabled": True,
+        "arguments": [{"name": "feature", "description": None, "required": False}],
+        "meta": {"version": "1.0.0", "updated_at": "2025-01-02T03:04:05+00:00"},
+    }
+
+    assert emit_yaml(data) == (
+        "name: sdd-1-generate-spec\n"
+        "description: Generate a specification Generate a specification Generate a specification\n"
+        "  Generate a specification Generate a specification\n"
+        "tags:\n"
+        "- planning\n"
+        "enabled: true\n"
+        "arguments:\n"
+        "- name: feature\n"
+        "  description: null\n"
+        "  required: false\n"
+        "meta:\n"
+        "  version: 1.0.0\n"
+        "  updated_at: '2025-01-02T03:04:05+00:00'\n"
+    )
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"meta": {"ratio": 0.5}},
+        {"description": "line one\nline two"},
+        {"description": "trailing space "},
+        {"meta": {"nested": [["a"]]}},
+        {"meta": {1: "integer key"}},
+    ],
+)
+def test_emit_yaml_falls_back_for_unusual_values(data):
+    assert emit_yaml(data) == yaml_backend.safe_dump(data, allow_unicode=True, sort_keys=False)
+
+
+def test_emit_yaml_falls_back_for_shared_containers():
+    tags = ["a", "b"]
+    data = {"tags": tags, "meta": {"tags": tags}}
+
+    output = emit_yaml(data)
+
+    assert "&id001" in output
+    assert output == yaml_backend.safe_dump(data, allow_unicode=True, sort_keys=False)
@@ -1,17 +1,30 @@
 from __future__ import annotations
 
+import random
 import tomllib
+from datetime import UTC, datetime
+from pathlib import Path
 
 import pytest
+import tomli_w
+import yaml
 
-from mcp_server.prompt_utils import parse_frontmatter
-from slash_commands.config import get_agent_config
+from mcp_server.prompt_utils import parse_frontmatter, prompt_from_content
+from slash_commands import generators
+from slash_commands.config import SUPPORTED_AGENTS, CommandFormat, get_agent_config
 from slash_commands.generators import (
+    CommandGenerator,
     KiroCommandGenerator,
     KiroIdeCommandGenerator,
     MarkdownCommandGenerator,
+    RenderedCommand,
     TomlCommandGenerator,
+    _apply_agent_overrides,
+    _normalize_output,
+    _replace_placeholders,
+    plan_renders,
 )
+from slash_commands.run_context import RunContext
 
 
 def _extract_frontmatter_and_body(content: str) -> tuple[dict, str]:
@@ -476,3 +489,305 @@ def test_kiro_ide_generator_snapshot_regression(sample_prompt):
 
     # Must have tracking comment at end
     assert generated.strip().endswith("-->")
+
+
+_FROZEN = RunContext(datetime(2025, 1, 2, 3, 4, 5, tzinfo=UTC), reproducible=True)
+
+
+def _reference_markdown(prompt, agent, source_metadata):
+    """Markdown output rendered as a single YAML document, as before render groups."""
+    description, arguments, enabled = _apply_agent_overrides(prompt, agent)
+    meta = prompt.meta.copy() if prompt.meta else {}
+    meta.update(
+        {
+            "agent": agent.key,
+            "agent_display_name": agent.display_name,
+            "command_dir": agent.get_command_dir(),
+            "command_format": agent.command_format.value,
+            "command_file_extension": agent.command_file_extension,
+            "source_prompt": prompt.name,
+            "source_path": prompt.path.name,
+            "version": generators.__version__,
+            "updated_at": _FROZEN.updated_at,
+        }
+    )
+    if source_metadata:
+        meta.update(source_metadata)
+    prefix = prompt.meta.get("command_prefix", "") if prompt.meta else ""
+    frontmatter = {
+        "name": f"{prefix}{prompt.name}",
+        "description": description,
+        "tags": sorted(prompt.tags) if prompt.tags else [],
+        "enabled": enabled,
+        "arguments": [
+            {"name": arg.name, "description": arg.description, "required": arg.required}
+            for arg in arguments
+        ],
+        "meta": meta,
+    }
+    body = _replace_placeholders(prompt.body, arguments, replace_double_braces=False)
+    yaml_content = yaml.dump(
+        frontmatter, Dumper=yaml.SafeDumper, allow_unicode=True, sort_keys=False
+    )
+    return _normalize_output(f"---\n{yaml_content}---\n\n{body}\n")
+
+
+def _reference_toml(prompt, agent, source_metadata):
+    description, arguments, _enabled = _apply_agent_overrides(prompt, agent)
+    data = {"prompt": _replace_placeholders(prompt.body, arguments, replace_double_braces=False)}
+    if description:
+        data["description"] = description
+    data["meta"] = {
+        "version": generators.__version__,
+        "updated_at": _FROZEN.updated_at,
+        "source_prompt": prompt.name,
+        "agent": agent.key,
+    }
+    if source_metadata:
+        data["meta"].update(source_metadata)
+    return _normalize_output(tomli_w.dumps(data))
+
+
+def _reference_normalize_output(content: str) -> str:
+    """Line-by-line normalization, as before the already-normalized fast path."""
+    content = content.replace("\r\n", "\n").replace("\r", "\n")
+    result = "\n".join(line.rstrip() for line in content.splitlines())
+    if result and not result.endswith("\n"):
+        result += "\n"
+    return result
+
+
+# Line boundaries, whitespace that is not a boundary and ordinary text
+_NORMALIZE_PIECES = ["a", "b c", " ", "\t", "\xa0", "\u3000", "\x1f", "\n", "\r", "\r\n"]
+_NORMALIZE_PIECES += ["\v", "\f", "\x1c", "\x1d", "\x1e", "\x85", "\u2028", "\u2029"]
+
+
+def test_normalize_output_matches_line_by_line_normalization():
+    rng = random.Random("normalize")
+    for _ in range(20_000):
+        content = "".join(rng.choice(_NORMALIZE_PIECES) for _ in range(rng.randint(0, 12)))
+        assert _normalize_output(content) == _reference_normalize_output(content)
+
+
+@pytest.mark.parametrize("content", ["", "a\n", "a\n\nb\n", "---\nname: x\n---\n\nBody\n"])
+def test_normalize_output_returns_normalized_content_unchanged(content):
+    assert _normalize_output(content) is content
+
+
+_TEXT = ["plain", "with: colon", "ünïcödé 漢字", "emoji 😀", "two\nlines", "trailing  ", "", "#x"]
+_BODY_LINES = ["Use $ARGUMENTS here", "trailing spaces   ", "", "\tindented", "ends\r", "\u2028sep"]
+
+
+def _random_prompt(rng: random.Random, index: int):
+    def text():
+        return rng.choice(_TEXT) + rng.choice(["", str(index)])
+
+    frontmatter = {
+        "name": f"prompt-{index}",
+        "description": text(),
+        "tags": [text() for _ in range(rng.randint(0, 2))],
+        "arguments": [
+            {"name": f"arg{i}", "description": text(), "required": rng.random() < 0.5}
+            for i in range(rng.randint(0, 2))
+        ],
+    }
+    if rng.random() < 0.5:
+        frontmatter["meta"] = {"category": text(), "command_prefix": rng.choice(["", "sdd-"])}
+    if rng.random() < 0.3:
+        frontmatter["meta"] = {**frontmatter.get("meta", {}), "agent": "preset"}
+    if rng.random() < 0.3:
+        frontmatter["extra"] = rng.choice([text(), [text()], {"nested": text()}])
+    if rng.random() < 0.4:
+        frontmatter["agent_overrides"] = {
+            "cursor": {"description": rng.choice([text(), ["list"]])},
+            "windsurf": {"arguments": [{"name": "arg0", "description": text(), "required": True}]},
+            "gemini-cli": {"description": rng.choice([text(), ["list"], {"table": text()}])},
+        }
+    body = "\n".join(rng.choice(_BODY_LINES) for _ in range(rng.randint(0, 6)))
+    document = yaml.safe_dump(frontmatter, allow_unicode=True, sort_keys=False)
+    return prompt_from_content(Path(f"prompt-{index}.md"), f"---\n{document}---\n{body}")
+
+
+def test_plan_renders_groups_agents_by_format_and_override(sample_prompt):
+    groups = plan_renders(sample_prompt, SUPPORTED_AGENTS)
+
+    # sample_prompt overrides claude-code and gemini-cli
+    by_first_agent = {group.agents[0].key: group for group in groups}
+    assert by_first_agent["claude-code"].agents == (get_agent_config("claude-code"),)
+    markdown = [g for g in groups if g.command_format == CommandFormat.MARKDOWN]
+    assert sum(len(group.agents) for group in markdown) == 8
+    assert len(markdown) == 2
+    assert sorted(agent.key for group in groups for agent in group.agents) == sorted(
+        agent.key for agent in SUPPORTED_AGENTS
+    )
+
+
+def test_plan_renders_without_overrides_uses_one_group_per_format(tmp_path):
+    prompt = prompt_from_content(tmp_path / "p.md", "---\nname: p\n---\nBody")
+
+    groups = plan_renders(prompt, SUPPORTED_AGENTS)
+
+    assert len(groups) == len({agent.command_format for agent in SUPPORTED_AGENTS})
+
+
+@pytest.mark.parametrize("source_metadata", [None, {"source_type": "github", "source_repo": "o/r"}])
+def test_group_rendering_matches_single_document_rendering(source_metadata):
+    rng = random.Random(f"render-{source_metadata is None}")
+
+    for index in range(100):
+        prompt = _random_prompt(rng, index)
+        for group in plan_renders(prompt, SUPPORTED_AGENTS):
+            generator = CommandGenerator.create(group.command_format)
+            rendered = generator.generate_many(prompt, group.agents, source_metadata, _FROZEN)
+            for agent, content in zip(group.agents, rendered, strict=True):
+                assert content == generator.generate(prompt, agent, source_metadata, _FROZEN)
+                if group.command_format == CommandFormat.MARKDOWN:
+                    assert content == _reference_markdown(prompt, agent, source_metadata)
+                elif group.command_format == CommandFormat.TOML:
+                    assert content == _reference_toml(prompt, agent, source_metadata)
+
+
+def test_render_bytes_matches_render():
+    rng = random.Random("render-bytes")
+    renderer = generators._PromptRenderer(SUPPORTED_AGENTS, {"source_type": "local"}, _FROZEN)
+
+    for index in range(100):
+        prompt = _random_prompt(rng, index)
+        contents = renderer.render(prompt)
+        for key, chunks in renderer.render_bytes(prompt).items():
+            assert b"".join(chunks) == contents[key].encode("utf-8")
+
+
+def test_render_bytes_encodes_shared_body_once(tmp_path):
+    body = "Large prompt body line.\n" * 1_000
+    prompt = prompt_from_content(tmp_path / "p.md", f"---\nname: p\n---\n{body}")
+    agents = [get_agent_config(key) for key in ("cursor", "windsurf", "gemini-cli")]
+
+    chunks = generators._PromptRenderer(agents, None, _FROZEN).render_bytes(prompt)
+
+    assert chunks["cursor"][-1] is chunks["windsurf"][-1]
+    # TOML: the top-level keys, then the [meta] table
+    assert len(chunks["gemini-cli"]) == 2
+    assert body.encode() in chunks["cursor"][-1]
+
+
+@pytest.mark.parametrize("format", list(CommandFormat))
+def test_generators_use_the_run_context_timestamp(sample_prompt, format):
+    agent = next(agent for agent in SUPPORTED_AGENTS if agent.command_format == format)
+    generator = CommandGenerator.create(format)
+
+    first = generator.generate(sample_prompt, agent, context=_FROZEN)
+    second = generator.generate(sample_prompt, agent, context=_FROZEN)
+
+    assert first == second
+    if format in (CommandFormat.KIRO, CommandFormat.KIRO_IDE):
+        assert "updated: 2025-01-02" in first
+    else:
+        assert "2025-01-02T03:04:05+00:00" in first
+
+
+@pytest.mark.parametrize("workers", [None, 2])
+def test_render_many_matches_generate(monkeypatch, workers):
+    # Use the process pool even on single-CPU machines
+    monkeypatch.setattr(generators.os, "cpu_count", lambda: 4)
+    rng = random.Random("render-many")
+    prompts = [_random_prompt(rng, index) for index in range(80)]
+    metadata = {"source_type": "local"}
+
+    rendered = list(
+        CommandGenerator.render_many(
+            prompts, SUPPORTED_AGENTS, metadata, context=_FROZEN, workers=workers
+        )
+    )
+
+    assert [(item.prompt.name, item.agent.key) for item in rendered] == [
+        (prompt.name, agent.key) for prompt in prompts for agent in SUPPORTED_AGENTS
+    ]
+    for item in rendered:
+        generator = CommandGenerator.create(item.agent.command_format)
+        assert item.content == generator.generate(item.prompt, item.agent, metadata, _FROZEN)
+
+
+def test_render_many_consumes_prompts_lazily(sample_prompt):
+    agents = [get_agent_config("claude-code")]
+    consumed = []
+
+    def prompts():
+        for index in range(3):
+            consumed.append(index)
+            yield sample_prompt
+
+    stream = CommandGenerator.render_many(prompts(), agents, context=_FROZEN)
+
+    assert isinstance(next(stream), RenderedCommand)
+    assert consumed == [0]
+
+
+def test_render_many_rejects_invalid_worker_count(sample_prompt):
+    with pytest.raises(ValueError, match="workers"):
+        list(CommandGenerator.render_many([sample_prompt], SUPPORTED_AGENTS, workers=0))
+
+
+class _StubGenerator:
+    def generate(self, prompt, agent, source_metadata=None, context=None):
+        return f"stub {prompt.name} {agent.key}"
+
+    def generate_many(self, prompt, agents, source_metadata=None, context=None):
+        return [self.generate(prompt, agent) for agent in agents]
+
+
+def test_registry_imports_format_modules_on_first_use(tmp_path):
+    import subprocess
+    import sys
+
+    script = (
+        "import sys\n"
+        "from pathlib import Path\n"
+        "from mcp_server.prompt_utils import prompt_from_content\n"
+        "from slash_commands.config import get_agent_config\n"
+        "from slash_commands.generators import CommandGenerator\n"
+        "prompt = prompt_from_content(Path('p.md'), 'Body')\n"
+        "agent = get_agent_config('gemini-cli')\n"
+        "CommandGenerator.create(agent.command_format).generate(prompt, agent)\n"
+        "print(sorted(name for name in sys.modules if name.startswith('slash_commands.formats.')))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True, cwd=tmp_path
+    )
+
+    assert result.stdout.strip() == "['slash_commands.formats.toml']"
+
+
+def test_registry_prefers_registered_factories(sample_prompt):
+    registry = generators.GeneratorRegistry(entry_point_group=None)
+    registry.register(CommandFormat.TOML, _StubGenerator)
+    agent = get_agent_config("gemini-cli")
+
+    assert registry.create(CommandFormat.TOML).generate(sample_prompt, agent) == (
+        f"stub {sample_prompt.name} gemini-cli"
+    )
+    assert isinstance(registry.create(CommandFormat.MARKDOWN), MarkdownCommandGenerator)
+
+
+def test_registry_loads_entry_points_by_format_value(monkeypatch):
+    from importlib.metadata import EntryPoint
+
+    stub = EntryPoint(
+        name="kiro", value=f"{__name__}:_StubGenerator", group=generators.ENTRY_POINT_GROUP
+    )
+    monkeypatch.setattr(
+        "importlib.metadata.entry_points",
+        lambda group: [stub] if group == generators.ENTRY_POINT_GROUP else [],
+    )
+    registry = generators.GeneratorRegistry()
+
+    assert isinstance(registry.create(CommandFormat.KIRO), _StubGenerator)
+    assert isinstance(registry.create(CommandFormat.KIRO_IDE), KiroIdeCommandGenerator)
+
+
+def test_registry_rejects_formats_without_a_generator():
+    registry = generators.GeneratorRegistry(builtins={}, entry_point_group=None)
+
+    assert registry.formats() == []
+    with pytest.raises(ValueError, match="Unsupported command format"):
+        registry.create(CommandFormat.MARKDOWN)
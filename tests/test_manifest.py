@@ -0,0 +1,235 @@
+"""Tests for the per-target manifest of generated files."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from slash_commands.cli import app
+from slash_commands.manifest import MANIFEST_FILENAME, Manifest
+from slash_commands.run_context import RunContext
+from slash_commands.writer import SlashCommandWriter
+
+
+@pytest.fixture
+def prompts_dir(tmp_path):
+    directory = tmp_path / "prompts"
+    directory.mkdir()
+    for name in ("alpha", "beta"):
+        (directory / f"{name}.md").write_text(
+            f"---\nname: {name}\ndescription: A prompt\n---\nBody\n", encoding="utf-8"
+        )
+    return directory
+
+
+def _writer(prompts_dir: Path, target: Path, timestamp: str = "0", dry_run: bool = False):
+    return SlashCommandWriter(
+        prompts_dir=prompts_dir,
+        agents=["claude-code", "gemini-cli"],
+        dry_run=dry_run,
+        base_path=target,
+        overwrite_action="backup",
+        run_context=RunContext.create(timestamp),
+    )
+
+
+def _record(manifest: Manifest, file_path: Path, content: bytes) -> None:
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    file_path.write_bytes(content)
+    manifest.record(
+        file_path, "claude-code", "alpha.md", hashlib.sha256(content).hexdigest(), file_path.stat()
+    )
+
+
+def test_manifest_round_trips_through_disk(tmp_path):
+    manifest = Manifest(tmp_path)
+    _record(manifest, tmp_path / ".claude" / "commands" / "alpha.md", b"alpha\n")
+    manifest.save()
+
+    reloaded = Manifest(tmp_path)
+    entry = reloaded.get(tmp_path / ".claude" / "commands" / "alpha.md")
+
+    assert reloaded.exists
+    assert entry is not None
+    assert entry.path == ".claude/commands/alpha.md"
+    assert entry.agent == "claude-code"
+    assert entry.source_prompt == "alpha.md"
+    assert entry.size == 6
+    assert entry.matches(os.stat(reloaded.resolve(entry)))
+
+
+def test_empty_manifest_is_deleted(tmp_path):
+    manifest = Manifest(tmp_path)
+    file_path = tmp_path / "alpha.md"
+    _record(manifest, file_path, b"alpha\n")
+    manifest.save()
+
+    manifest.remove(file_path)
+    manifest.save()
+
+    assert not manifest.path.exists()
+
+
+@pytest.mark.parametrize(
+    "content",
+    [b"not json", b"[]", json.dumps({"version": 999, "files": {}}).encode(), b'{"version": 1}'],
+)
+def test_unreadable_manifest_is_treated_as_empty(tmp_path, content):
+    (tmp_path / MANIFEST_FILENAME).write_bytes(content)
+
+    manifest = Manifest(tmp_path)
+
+    assert len(manifest) == 0
+    assert not manifest.exists
+
+
+def test_generate_records_written_files(prompts_dir, tmp_path):
+    target = tmp_path / "out"
+    result = _writer(prompts_dir, target).generate()
+
+    manifest = Manifest(target)
+    entries = {entry.path: entry for entry in manifest}
+
+    assert sorted(entries) == [
+        ".claude/commands/alpha.md",
+        ".claude/commands/beta.md",
+        ".gemini/commands/alpha.toml",
+        ".gemini/commands/beta.toml",
+    ]
+    for info in result["files"]:
+        content = Path(info["path"]).read_bytes()
+        entry = manifest.get(Path(info["path"]))
+        assert entry.sha256 == hashlib.sha256(content).hexdigest()
+        assert entry.agent == info["agent"]
+    assert entries[".gemini/commands/beta.toml"].source_prompt == "beta"
+
+
+def test_dry_run_does_not_write_manifest(prompts_dir, tmp_path):
+    target = tmp_path / "out"
+    _writer(prompts_dir, target, dry_run=True).generate()
+
+    assert not (target / MANIFEST_FILENAME).exists()
+
+
+def test_unchanged_files_are_recognized_without_reading_them(prompts_dir, tmp_path, monkeypatch):
+    target = tmp_path / "out"
+    _writer(prompts_dir, target).generate()
+
+    read_bytes = Path.read_bytes
+
+    def fail(self):
+        if self.name != MANIFEST_FILENAME:
+            raise AssertionError(f"read {self}")
+        return read_bytes(self)
+
+    monkeypatch.setattr(Path, "read_bytes", fail)
+    result = _writer(prompts_dir, target).generate()
+
+    assert result["files_unchanged"] == 4
+
+
+def test_edited_files_are_compared_and_rewritten(prompts_dir, tmp_path):
+    target = tmp_path / "out"
+    _writer(prompts_dir, target).generate()
+    edited = target / ".claude" / "commands" / "alpha.md"
+    edited.write_text(edited.read_text() + "Local edit\n")
+
+    result = _writer(prompts_dir, target).generate()
+
+    assert result["files_written"] == 1
+    entry = Manifest(target).get(edited)
+    assert entry.sha256 == hashlib.sha256(edited.read_bytes()).hexdigest()
+
+
+def test_timestamp_only_change_records_file_on_disk(prompts_dir, tmp_path):
+    target = tmp_path / "out"
+    _writer(prompts_dir, target, timestamp="0").generate()
+    (target / MANIFEST_FILENAME).unlink()
+
+    result = _writer(prompts_dir, target, timestamp="86400").generate()
+
+    assert result["files_unchanged"] == 4
+    claude_file = target / ".claude" / "commands" / "alpha.md"
+    entry = Manifest(target).get(claude_file)
+    assert entry.sha256 == hashlib.sha256(claude_file.read_bytes()).hexdigest()
+    assert entry.matches(claude_file.stat())
+
+
+def test_cleanup_uses_and_updates_manifest(prompts_dir, tmp_path, monkeypatch):
+    target = tmp_path / "out"
+    _writer(prompts_dir, target).generate()
+    cleaner = _writer(prompts_dir, target)
+    monkeypatch.setattr(
+        SlashCommandWriter,
+        "_is_generated_file",
+        lambda *args: pytest.fail("parsed a file listed in the manifest"),
+    )
+
+    found = cleaner.find_generated_files(agents=["claude-code"], include_backups=False)
+    assert {info["reason"] for info in found} == {"Listed in manifest"}
+    assert len(found) == 2
+
+    cleaner.cleanup(agents=["claude-code"], include_backups=False)
+
+    remaining = {entry.path for entry in Manifest(target)}
+    assert remaining == {".gemini/commands/alpha.toml", ".gemini/commands/beta.toml"}
+
+
+def test_cleanup_keeps_listed_files_the_user_rewrote(prompts_dir, tmp_path):
+    target = tmp_path / "out"
+    _writer(prompts_dir, target).generate()
+    edited = target / ".claude" / "commands" / "alpha.md"
+    edited.write_text("Hand-written notes\n")
+
+    cleaner = _writer(prompts_dir, target)
+    found = {
+        Path(info["path"]).name: info["reason"]
+        for info in cleaner.find_generated_files(agents=["claude-code"], include_backups=False)
+    }
+    cleaner.cleanup(agents=["claude-code"], include_backups=False)
+
+    assert found == {"beta.md": "Listed in manifest"}
+    assert edited.read_text() == "Hand-written notes\n"
+
+
+def test_manifest_status_reports_modified_and_missing_files(prompts_dir, tmp_path):
+    target = tmp_path / "out"
+    writer = _writer(prompts_dir, target)
+    writer.generate()
+    touched = target / ".gemini" / "commands" / "alpha.toml"
+    os.utime(touched, ns=(0, 0))
+    edited = target / ".claude" / "commands" / "alpha.md"
+    edited.write_text("Local edit\n")
+    (target / ".claude" / "commands" / "beta.md").unlink()
+
+    statuses = {
+        Path(item["path"]).relative_to(target).as_posix(): item["state"]
+        for item in _writer(prompts_dir, target).manifest_status()
+    }
+
+    assert statuses == {
+        ".claude/commands/alpha.md": "modified",
+        ".claude/commands/beta.md": "missing",
+        ".gemini/commands/alpha.toml": "ok",
+        ".gemini/commands/beta.toml": "ok",
+    }
+
+
+def test_status_command(prompts_dir, tmp_path):
+    target = tmp_path / "out"
+    _writer(prompts_dir, target).generate()
+    (target / ".claude" / "commands" / "beta.md").unlink()
+
+    result = CliRunner().invoke(
+        app, ["status", "--target-path", str(target), "--agent", "claude-code"]
+    )
+
+    assert result.exit_code == 0
+    assert "2 generated file(s)" in result.output
+    assert "missing" in result.output
+    assert "gemini" not in result.output
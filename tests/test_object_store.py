@@ -0,0 +1,256 @@
+"""Tests for the content-addressed prompt object store."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+from typer.testing import CliRunner
+
+from mcp_server.prompt_cache import PromptCache
+from slash_commands.cli import app
+from slash_commands.github_utils import fetch_github_prompts_to_store
+from slash_commands.object_store import INDEX_FILENAME, ObjectStore
+from slash_commands.writer import SlashCommandWriter
+
+PROMPT = b"---\nname: shared\n---\nShared body\n"
+
+
+def test_put_is_content_addressed_and_idempotent(tmp_path):
+    store = ObjectStore(tmp_path / "store")
+
+    digest = store.put(PROMPT)
+
+    assert digest == hashlib.sha256(PROMPT).hexdigest()
+    assert store.object_path(digest) == tmp_path / "store" / "objects" / digest[:2] / digest[2:]
+    assert store.put(PROMPT) == digest
+    assert store.get(digest) == PROMPT
+    assert store.size() == len(PROMPT)
+
+
+def test_get_unknown_object_raises_key_error(tmp_path):
+    with pytest.raises(KeyError, match="not in store"):
+        ObjectStore(tmp_path).get("0" * 64)
+
+
+def test_blob_lookup_requires_the_object(tmp_path):
+    store = ObjectStore(tmp_path / "store")
+    digest = store.put(PROMPT, blob_sha="abc123")
+
+    assert store.lookup_blob("abc123") == digest
+    assert store.lookup_blob("unknown") is None
+
+    store.object_path(digest).unlink()
+    assert store.lookup_blob("abc123") is None
+
+
+def test_index_persists_sources_and_blobs(tmp_path):
+    store = ObjectStore(tmp_path / "store")
+    digest = store.put(PROMPT, blob_sha="abc123")
+    store.record_source("github:o/r@main:prompts", {"shared.md": digest})
+    store.save()
+
+    reopened = ObjectStore(tmp_path / "store")
+
+    assert reopened.resolve("github:o/r@main:prompts") == {"shared.md": digest}
+    assert reopened.lookup_blob("abc123") == digest
+    assert reopened.resolve("github:o/r@main:other") is None
+
+
+def test_corrupt_index_is_treated_as_empty(tmp_path):
+    (tmp_path / "store").mkdir()
+    (tmp_path / "store" / INDEX_FILENAME).write_text("{not json")
+
+    store = ObjectStore(tmp_path / "store")
+    store.record_source("key", {})
+    store.save()
+
+    assert json.loads((tmp_path / "store" / INDEX_FILENAME).read_text())["sources"]["key"]
+
+
+def test_checkout_links_objects_into_a_stable_directory(tmp_path):
+    store = ObjectStore(tmp_path / "store")
+    first = store.put(b"first")
+    second = store.put(b"second")
+    store.record_source("key", {"a.md": first, "b.md": second})
+
+    directory = store.checkout("key")
+    (directory / "a.md").stat()
+
+    store.record_source("key", {"a.md": second})
+    assert store.checkout("key") == directory
+    assert sorted(path.name for path in directory.iterdir()) == ["a.md"]
+    assert (directory / "a.md").read_bytes() == b"second"
+
+    with pytest.raises(KeyError, match="Source not in store"):
+        store.checkout("missing")
+
+
+def test_gc_removes_unreferenced_objects_blobs_and_checkouts(tmp_path):
+    store = ObjectStore(tmp_path / "store")
+    kept = store.put(b"kept")
+    dropped = store.put(b"dropped", blob_sha="old-blob")
+    store.record_source("old", {"x.md": dropped})
+    store.checkout("old")
+    store.record_source("new", {"y.md": kept})
+    store._sources.pop("old")
+
+    result = store.gc()
+
+    assert result.objects_removed == 1
+    assert result.bytes_freed == len(b"dropped")
+    assert result.checkouts_removed == 1
+    assert store.lookup_blob("old-blob") is None
+    assert store.get(kept) == b"kept"
+
+
+def test_size_cap_drops_least_recently_used_sources(tmp_path):
+    store = ObjectStore(tmp_path / "store", max_bytes=150)
+    for key in ("one", "two", "six"):
+        store.record_source(key, {"p.md": store.put(key.encode() * 20)})
+
+    result = store.save()
+
+    assert result is not None and result.objects_removed == 1
+    assert store.resolve("one") is None
+    assert store.resolve("six") is not None
+    assert store.size() <= 150
+
+
+def test_size_cap_keeps_the_newest_source_even_when_too_large(tmp_path):
+    store = ObjectStore(tmp_path / "store", max_bytes=10)
+    store.record_source("big", {"p.md": store.put(b"x" * 100)})
+
+    store.save()
+
+    assert store.resolve("big") is not None
+
+
+def test_rejects_non_positive_size_cap(tmp_path):
+    with pytest.raises(ValueError, match="max_bytes"):
+        ObjectStore(tmp_path, max_bytes=0)
+
+
+def _listing_response(files: dict[str, str]) -> MagicMock:
+    response = MagicMock()
+    response.json.return_value = [
+        {
+            "type": "file",
+            "name": name,
+            "path": f"prompts/{name}",
+            "sha": sha,
+            "download_url": f"https://raw.githubusercontent.com/owner/repo/main/prompts/{name}",
+        }
+        for name, sha in files.items()
+    ]
+    return response
+
+
+def _file_response(text: str) -> MagicMock:
+    response = MagicMock()
+    response.text = text
+    return response
+
+
+@patch("slash_commands.github_utils.requests.get")
+def test_fetch_skips_downloads_for_stored_blobs(mock_get, tmp_path):
+    store = ObjectStore(tmp_path / "store")
+    mock_get.side_effect = [
+        _listing_response({"a.md": "sha-a", "b.md": "sha-b"}),
+        _file_response("---\nname: a\n---\nA\n"),
+        _file_response("---\nname: b\n---\nB\n"),
+    ]
+    key = fetch_github_prompts_to_store("owner", "repo", "main", "prompts", store)
+    first = store.resolve(key)
+
+    # Only b.md changed upstream
+    mock_get.reset_mock()
+    mock_get.side_effect = [
+        _listing_response({"a.md": "sha-a", "b.md": "sha-b2"}),
+        _file_response("---\nname: b\n---\nB2\n"),
+    ]
+    fetch_github_prompts_to_store("owner", "repo", "main", "prompts", store)
+    second = store.resolve(key)
+
+    assert mock_get.call_count == 2
+    assert second["a.md"] == first["a.md"]
+    assert store.get(second["b.md"]) == b"---\nname: b\n---\nB2\n"
+
+
+@patch("slash_commands.github_utils.requests.get")
+def test_writer_reuses_stored_github_prompts(mock_get, tmp_path):
+    def run() -> dict:
+        writer = SlashCommandWriter(
+            prompts_dir=tmp_path / "unused",
+            agents=["claude-code"],
+            base_path=tmp_path / "out",
+            overwrite_action="overwrite",
+            github_repo="owner/repo",
+            github_branch="main",
+            github_path="prompts",
+            prompt_cache=PromptCache(tmp_path / "cache"),
+            object_store=ObjectStore(tmp_path / "store"),
+        )
+        return writer.generate()
+
+    mock_get.side_effect = [
+        _listing_response({"a.md": "sha-a"}),
+        _file_response("---\nname: a\n---\nA\n"),
+    ]
+    first = run()
+    mock_get.side_effect = [_listing_response({"a.md": "sha-a"})]
+    second = run()
+
+    assert [prompt["name"] for prompt in second["prompts"]] == ["a"]
+    assert second["prompts"] == first["prompts"]
+    assert second["prompt_cache"] == {"hits": 1, "misses": 0, "evictions": 0}
+
+
+def test_cache_gc_command_reports_removed_objects(tmp_path, monkeypatch):
+    monkeypatch.setenv("SLASH_MAN_CACHE_DIR", str(tmp_path))
+    ObjectStore(tmp_path / "store").put(b"orphan")
+
+    result = CliRunner().invoke(app, ["cache", "gc"])
+
+    assert result.exit_code == 0
+    assert "Removed 1 object(s)" in result.output
+
+
+def test_save_to_unwritable_root_warns(tmp_path, caplog):
+    blocker = tmp_path / "blocker"
+    blocker.write_text("not a directory")
+    store = ObjectStore(blocker / "store")
+    store.record_source("local", {})
+
+    with caplog.at_level("WARNING", logger="slash_commands.object_store"):
+        assert store.save() is None
+
+    assert "Could not save the prompt store" in caplog.text
+
+
+@patch("slash_commands.github_utils.requests.get")
+def test_writer_downloads_to_temp_dir_when_store_is_unwritable(mock_get, tmp_path):
+    blocker = tmp_path / "blocker"
+    blocker.write_text("not a directory")
+    responses = [
+        _listing_response({"a.md": "sha-a"}),
+        _file_response("---\nname: a\n---\nA\n"),
+    ]
+    mock_get.side_effect = responses * 2
+    writer = SlashCommandWriter(
+        prompts_dir=tmp_path / "unused",
+        agents=["claude-code"],
+        base_path=tmp_path / "out",
+        overwrite_action="overwrite",
+        github_repo="owner/repo",
+        github_branch="main",
+        github_path="prompts",
+        object_store=ObjectStore(blocker / "store"),
+    )
+
+    result = writer.generate()
+
+    assert [prompt["name"] for prompt in result["prompts"]] == ["a"]
+    assert (tmp_path / "out" / ".claude" / "commands" / "a.md").exists()
@@ -0,0 +1,122 @@
+"""Tests for the single-pass placeholder engine."""
+
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from mcp_server.prompt_utils import PromptArgumentSpec
+from slash_commands.placeholders import (
+    PLACEHOLDERS,
+    PlaceholderEngine,
+    arguments_section_markdown,
+)
+
+ARGUMENTS = [
+    PromptArgumentSpec(name="target", description="What to work on", required=True),
+    PromptArgumentSpec(name="mode", description=None, required=False),
+]
+ALL_TOKENS = ["`$ARGUMENTS`", "$ARGUMENTS", "{{args}}"]
+
+
+def _chained_replace(body: str, arguments: list[PromptArgumentSpec]) -> str:
+    """One str.replace per token, longest token first."""
+    section = arguments_section_markdown(arguments)
+    body = body.replace("`$ARGUMENTS`", section).replace("$ARGUMENTS", section)
+    return body.replace("{{args}}", ", ".join(arg.name for arg in arguments))
+
+
+def test_substitute_matches_chained_replace():
+    rng = random.Random("placeholders")
+    fragments = ["$ARGUMENTS", "`", "{{args}}", "{{", "}}", "$", "ARGUMENTS", "text ", "\n", "{"]
+    placeholders = PLACEHOLDERS.compile(ALL_TOKENS)
+
+    for _ in range(2_000):
+        body = "".join(rng.choice(fragments) for _ in range(rng.randint(0, 20)))
+        assert placeholders.substitute(body, ARGUMENTS) == _chained_replace(body, ARGUMENTS)
+
+
+def test_backticked_token_wins_over_bare_token():
+    placeholders = PLACEHOLDERS.compile(ALL_TOKENS)
+
+    result = placeholders.substitute("A `$ARGUMENTS` B $ARGUMENTS", ARGUMENTS)
+
+    section = arguments_section_markdown(ARGUMENTS)
+    assert result == f"A {section} B {section}"
+
+
+def test_unselected_tokens_are_left_alone():
+    placeholders = PLACEHOLDERS.compile(["`$ARGUMENTS`", "$ARGUMENTS"])
+
+    assert placeholders.substitute("{{args}}", ARGUMENTS) == "{{args}}"
+
+
+def test_replacements_are_not_rescanned():
+    arguments = [PromptArgumentSpec(name="x", description="uses {{args}}", required=True)]
+
+    result = PLACEHOLDERS.compile(ALL_TOKENS).substitute("$ARGUMENTS", arguments)
+
+    assert result == "- `<x>` (required): uses {{args}}"
+
+
+def test_body_without_tokens_is_returned_unchanged():
+    body = "No placeholders here, only $ and {braces}"
+
+    assert PLACEHOLDERS.compile(ALL_TOKENS).substitute(body, ARGUMENTS) is body
+
+
+def test_replacements_are_cached_per_argument_list():
+    calls: list[int] = []
+    engine = PlaceholderEngine()
+    engine.register("@N", lambda arguments: calls.append(1) or str(len(arguments)))
+    placeholders = engine.compile(["@N"])
+
+    assert placeholders.substitute("@N @N", ARGUMENTS) == "2 2"
+    assert placeholders.substitute("again @N", list(ARGUMENTS)) == "again 2"
+    assert len(calls) == 1
+
+
+def test_unhashable_argument_descriptions_are_supported():
+    arguments = [PromptArgumentSpec(name="x", description=["a", "list"], required=True)]
+
+    result = PLACEHOLDERS.compile(ALL_TOKENS).substitute("{{args}}", arguments)
+
+    assert result == "x"
+
+
+def test_registered_tokens_join_the_single_pass():
+    engine = PlaceholderEngine()
+    engine.register("$ARGUMENTS", lambda arguments: "section")
+    engine.register("@{$ARGUMENTS}", lambda arguments: "wrapped")
+    engine.register("<<count>>", lambda arguments: str(len(arguments)))
+
+    result = engine.compile(["$ARGUMENTS", "@{$ARGUMENTS}", "<<count>>"]).substitute(
+        "@{$ARGUMENTS} $ARGUMENTS <<count>>", ARGUMENTS
+    )
+
+    assert result == "wrapped section 2"
+
+
+def test_register_rejects_duplicates_and_empty_tokens():
+    engine = PlaceholderEngine()
+    engine.register("{{x}}", lambda arguments: "")
+
+    with pytest.raises(ValueError, match="already registered"):
+        engine.register("{{x}}", lambda arguments: "")
+    with pytest.raises(ValueError, match="must not be empty"):
+        engine.register("", lambda arguments: "")
+
+
+def test_compile_rejects_unknown_tokens():
+    with pytest.raises(KeyError, match="Unknown placeholder"):
+        PlaceholderEngine().compile(["{{missing}}"])
+
+
+def test_register_invalidates_compiled_sets():
+    engine = PlaceholderEngine()
+    engine.register("{{a}}", lambda arguments: "A")
+    first = engine.compile(["{{a}}"])
+    engine.register("{{b}}", lambda arguments: "B")
+
+    assert engine.compile(["{{a}}"]) is not first
@@ -0,0 +1,321 @@
+"""Tests for the persistent parsed-prompt cache."""
+
+from __future__ import annotations
+
+import os
+import pickle
+
+import anyio
+import pytest
+
+from mcp_server.prompt_cache import CACHE_FILENAME, PromptCache, default_cache_dir
+from mcp_server.prompt_utils import LazyMarkdownPrompt, load_markdown_prompt
+from mcp_server.prompts_loader import register_prompts
+from slash_commands.writer import SlashCommandWriter
+
+
+def _write_prompt(path, name: str, description: str = "A prompt") -> None:
+    path.write_text(
+        f"""---
+name: {name}
+description: {description}
+tags:
+  - testing
+arguments:
+  - name: target
+    required: false
+---
+# {name}
+
+Body for {name}.
+""",
+        encoding="utf-8",
+    )
+
+
+@pytest.fixture
+def prompts_dir(tmp_path):
+    directory = tmp_path / "prompts"
+    directory.mkdir()
+    _write_prompt(directory / "alpha.md", "alpha")
+    _write_prompt(directory / "beta.md", "beta")
+    return directory
+
+
+def test_default_cache_dir_honours_override(monkeypatch, tmp_path):
+    monkeypatch.setenv("SLASH_MAN_CACHE_DIR", str(tmp_path / "custom"))
+    assert default_cache_dir() == tmp_path / "custom"
+
+
+def test_default_cache_dir_uses_xdg_cache_home(monkeypatch, tmp_path):
+    monkeypatch.delenv("SLASH_MAN_CACHE_DIR", raising=False)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    assert default_cache_dir() == tmp_path / "slash-man"
+
+
+def test_cache_returns_same_prompt_as_direct_load(prompts_dir, tmp_path):
+    cache = PromptCache(tmp_path / "cache")
+
+    cached = cache.load(prompts_dir / "alpha.md")
+
+    assert cached == load_markdown_prompt(prompts_dir / "alpha.md")
+    assert cache.stats.misses == 1
+    assert cache.stats.hits == 0
+
+
+def test_cache_hits_persist_across_instances(prompts_dir, tmp_path):
+    first = PromptCache(tmp_path / "cache")
+    first.load(prompts_dir / "alpha.md")
+    first.load(prompts_dir / "beta.md")
+    first.save()
+    assert (tmp_path / "cache" / CACHE_FILENAME).exists()
+
+    second = PromptCache(tmp_path / "cache")
+    prompt = second.load(prompts_dir / "alpha.md")
+    second.load(prompts_dir / "beta.md")
+
+    assert prompt.name == "alpha"
+    assert second.stats.hits == 2
+    assert second.stats.misses == 0
+
+
+def test_cache_invalidates_changed_content(prompts_dir, tmp_path):
+    cache = PromptCache(tmp_path / "cache")
+    cache.load(prompts_dir / "alpha.md")
+    cache.save()
+
+    _write_prompt(prompts_dir / "alpha.md", "alpha", description="Rewritten description")
+    # Guarantee a different mtime even on coarse-grained filesystems
+    stat = (prompts_dir / "alpha.md").stat()
+    os.utime(prompts_dir / "alpha.md", ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    reloaded = PromptCache(tmp_path / "cache")
+    prompt = reloaded.load(prompts_dir / "alpha.md")
+
+    assert prompt.description == "Rewritten description"
+    assert reloaded.stats.misses == 1
+
+
+def test_cache_touched_file_with_same_content_is_a_hit(prompts_dir, tmp_path):
+    cache = PromptCache(tmp_path / "cache")
+    cache.load(prompts_dir / "alpha.md")
+
+    stat = (prompts_dir / "alpha.md").stat()
+    os.utime(prompts_dir / "alpha.md", ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    cache.load(prompts_dir / "alpha.md")
+
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 1
+
+
+def test_cache_shares_records_between_identical_files(prompts_dir, tmp_path):
+    other_dir = tmp_path / "other"
+    other_dir.mkdir()
+    (other_dir / "alpha.md").write_bytes((prompts_dir / "alpha.md").read_bytes())
+    cache = PromptCache(tmp_path / "cache")
+
+    cache.load(prompts_dir / "alpha.md")
+    copy = cache.load(other_dir / "alpha.md")
+
+    assert copy.path == other_dir / "alpha.md"
+    assert cache.stats.hits == 1
+
+
+def test_cache_evicts_least_recently_used(prompts_dir, tmp_path):
+    _write_prompt(prompts_dir / "gamma.md", "gamma")
+    cache = PromptCache(tmp_path / "cache", max_entries=2)
+
+    cache.load(prompts_dir / "alpha.md")
+    cache.load(prompts_dir / "beta.md")
+    cache.load(prompts_dir / "alpha.md")
+    cache.load(prompts_dir / "gamma.md")
+
+    assert len(cache) == 2
+    assert cache.stats.evictions == 1
+
+    cache.load(prompts_dir / "alpha.md")
+    cache.load(prompts_dir / "beta.md")
+    assert cache.stats.misses == 4
+
+
+def test_cache_recency_survives_save_and_reload(prompts_dir, tmp_path):
+    _write_prompt(prompts_dir / "gamma.md", "gamma")
+    cache = PromptCache(tmp_path / "cache", max_entries=2)
+    cache.load(prompts_dir / "alpha.md")
+    cache.load(prompts_dir / "beta.md")
+    cache.load(prompts_dir / "alpha.md")
+    cache.save()
+
+    reloaded = PromptCache(tmp_path / "cache", max_entries=2)
+    reloaded.load(prompts_dir / "gamma.md")
+    reloaded.load(prompts_dir / "alpha.md")
+
+    assert reloaded.stats.as_dict() == {"hits": 1, "misses": 1, "evictions": 1}
+
+
+def test_cache_eviction_drops_index_entries_of_evicted_content(prompts_dir, tmp_path):
+    _write_prompt(prompts_dir / "gamma.md", "gamma")
+    cache = PromptCache(tmp_path / "cache", max_entries=2)
+    cache.load(prompts_dir / "alpha.md")
+    cache.load_lazy(prompts_dir / "alpha.md")
+    cache.load(prompts_dir / "beta.md")
+    cache.save()
+
+    with (tmp_path / "cache" / CACHE_FILENAME).open("rb") as handle:
+        indexed = set(pickle.load(handle)["index"])
+    # The lazy record still holds alpha's content, so its index entry stays
+    assert indexed == {str(prompts_dir / "alpha.md"), str(prompts_dir / "beta.md")}
+
+    cache.load(prompts_dir / "gamma.md")
+    cache.save()
+
+    with (tmp_path / "cache" / CACHE_FILENAME).open("rb") as handle:
+        indexed = set(pickle.load(handle)["index"])
+    assert indexed == {str(prompts_dir / "beta.md"), str(prompts_dir / "gamma.md")}
+    assert cache.stats.evictions == 2
+
+
+def test_cache_rejects_non_positive_size(tmp_path):
+    with pytest.raises(ValueError, match="max_entries"):
+        PromptCache(tmp_path, max_entries=0)
+
+
+def test_cache_ignores_corrupt_cache_file(prompts_dir, tmp_path):
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
+    (cache_dir / CACHE_FILENAME).write_bytes(b"not a pickle")
+
+    cache = PromptCache(cache_dir)
+    prompt = cache.load(prompts_dir / "alpha.md")
+    cache.save()
+
+    assert prompt.name == "alpha"
+    assert PromptCache(cache_dir).load(prompts_dir / "alpha.md").name == "alpha"
+
+
+def test_cache_missing_file_raises(tmp_path):
+    cache = PromptCache(tmp_path / "cache")
+
+    with pytest.raises(FileNotFoundError, match="does not exist"):
+        cache.load(tmp_path / "missing.md")
+
+
+def test_cache_clear_removes_cache_file(prompts_dir, tmp_path):
+    cache = PromptCache(tmp_path / "cache")
+    cache.load(prompts_dir / "alpha.md")
+    cache.save()
+
+    cache.clear()
+
+    assert len(cache) == 0
+    assert not cache.path.exists()
+
+
+def test_writer_reports_prompt_cache_stats(prompts_dir, tmp_path):
+    def run() -> dict:
+        writer = SlashCommandWriter(
+            prompts_dir=prompts_dir,
+            agents=["claude-code"],
+            base_path=tmp_path / "out",
+            overwrite_action="overwrite",
+            prompt_cache=PromptCache(tmp_path / "cache"),
+        )
+        return writer.generate()
+
+    first = run()
+    second = run()
+
+    assert first["prompt_cache"] == {"hits": 0, "misses": 2, "evictions": 0}
+    assert second["prompt_cache"] == {"hits": 2, "misses": 0, "evictions": 0}
+
+
+def test_cache_save_to_unwritable_dir_warns(prompts_dir, tmp_path, caplog):
+    not_a_dir = tmp_path / "file"
+    not_a_dir.write_text("")
+    cache = PromptCache(not_a_dir / "cache")
+    cache.load(prompts_dir / "alpha.md")
+
+    cache.save()
+
+    assert "Could not save the prompt cache" in caplog.text
+
+
+def test_writer_succeeds_with_unwritable_cache_dir(prompts_dir, tmp_path):
+    not_a_dir = tmp_path / "file"
+    not_a_dir.write_text("")
+    writer = SlashCommandWriter(
+        prompts_dir=prompts_dir,
+        agents=["claude-code"],
+        base_path=tmp_path / "out",
+        prompt_cache=PromptCache(not_a_dir / "cache"),
+    )
+
+    result = writer.generate()
+
+    assert result["files_written"] == 2
+
+
+def test_writer_without_cache_reports_none(prompts_dir, tmp_path):
+    writer = SlashCommandWriter(
+        prompts_dir=prompts_dir,
+        agents=["claude-code"],
+        base_path=tmp_path / "out",
+    )
+
+    assert writer.generate()["prompt_cache"] is None
+
+
+def test_cache_lazy_records_are_separate_from_eager_ones(prompts_dir, tmp_path):
+    cache = PromptCache(tmp_path / "cache")
+
+    eager = cache.load(prompts_dir / "alpha.md")
+    lazy = cache.load_lazy(prompts_dir / "alpha.md")
+    cache.save()
+
+    assert isinstance(lazy, LazyMarkdownPrompt)
+    assert lazy.materialize() == eager
+    assert cache.stats.misses == 2
+    assert PromptCache(tmp_path / "cache").load_lazy(prompts_dir / "alpha.md") == lazy
+
+
+def test_cache_lazy_hit_tracks_touched_file(prompts_dir, tmp_path):
+    cache = PromptCache(tmp_path / "cache")
+    cache.load_lazy(prompts_dir / "alpha.md")
+
+    stat = (prompts_dir / "alpha.md").stat()
+    os.utime(prompts_dir / "alpha.md", ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    prompt = cache.load_lazy(prompts_dir / "alpha.md")
+
+    assert cache.stats.hits == 1
+    assert prompt.mtime_ns == stat.st_mtime_ns + 1_000_000_000
+    assert prompt.body == "# alpha\n\nBody for alpha."
+
+
+def test_cache_decodes_crlf_like_text_mode(tmp_path):
+    path = tmp_path / "crlf.md"
+    path.write_bytes(b"---\r\nname: crlf\r\n---\r\nLine one\r\nLine two\r\n")
+
+    assert PromptCache(tmp_path / "cache").load(path) == load_markdown_prompt(path)
+
+
+def test_register_prompts_uses_cache(mcp_server, prompts_dir, tmp_path):
+    warm = PromptCache(tmp_path / "cache")
+    warm.load_lazy(prompts_dir / "alpha.md")
+    warm.load_lazy(prompts_dir / "beta.md")
+    warm.save()
+
+    cache = PromptCache(tmp_path / "cache")
+    register_prompts(mcp_server, prompts_dir, cache=cache)
+
+    prompts = anyio.run(mcp_server.get_prompts)
+    assert set(prompts) == {"alpha", "beta"}
+    assert cache.stats.hits == 2
+
+
+def test_register_prompts_with_unwritable_cache_dir(mcp_server, prompts_dir, tmp_path):
+    not_a_dir = tmp_path / "file"
+    not_a_dir.write_text("")
+
+    register_prompts(mcp_server, prompts_dir, cache=PromptCache(not_a_dir / "cache"))
+
+    assert set(anyio.run(mcp_server.get_prompts)) == {"alpha", "beta"}
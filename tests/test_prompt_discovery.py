@@ -0,0 +1,144 @@
+"""Tests for prompt file discovery."""
+
+from __future__ import annotations
+
+import os
+
+import anyio
+import pytest
+
+from mcp_server.config import Config
+from mcp_server.prompt_discovery import DiscoveryOptions, iter_prompt_files
+from mcp_server.prompts_loader import register_prompts
+from slash_commands.writer import SlashCommandWriter
+
+
+@pytest.fixture
+def prompt_tree(tmp_path):
+    """A nested prompts directory:
+
+    root.md, notes.txt, b.md, team-a/{a.md, drafts/draft.md}, team-b/b.md, .hidden/h.md
+    """
+    root = tmp_path / "prompts"
+    for relative in (
+        "root.md",
+        "notes.txt",
+        "b.md",
+        "team-a/a.md",
+        "team-a/drafts/draft.md",
+        "team-b/b.md",
+        ".hidden/h.md",
+    ):
+        path = root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        name = relative.replace("/", "-").removesuffix(".md")
+        path.write_text(f"---\nname: {name}\n---\nBody of {relative}\n", encoding="utf-8")
+    (root / "dir.md").mkdir()
+    return root
+
+
+def _relative(root, paths):
+    return [path.relative_to(root).as_posix() for path in paths]
+
+
+def test_default_discovery_is_flat_and_sorted(prompt_tree):
+    assert _relative(prompt_tree, iter_prompt_files(prompt_tree)) == ["b.md", "root.md"]
+
+
+def test_recursive_discovery_lists_files_before_subdirectories(prompt_tree):
+    paths = iter_prompt_files(prompt_tree, DiscoveryOptions(recursive=True))
+
+    assert _relative(prompt_tree, paths) == [
+        "b.md",
+        "root.md",
+        ".hidden/h.md",
+        "team-a/a.md",
+        "team-a/drafts/draft.md",
+        "team-b/b.md",
+    ]
+
+
+def test_max_depth_limits_recursion(prompt_tree):
+    paths = iter_prompt_files(prompt_tree, DiscoveryOptions(recursive=True, max_depth=1))
+
+    assert "team-a/a.md" in _relative(prompt_tree, paths)
+    assert "team-a/drafts/draft.md" not in _relative(prompt_tree, paths)
+
+
+def test_max_depth_zero_matches_flat_discovery(prompt_tree):
+    options = DiscoveryOptions(recursive=True, max_depth=0)
+
+    assert list(iter_prompt_files(prompt_tree, options)) == list(iter_prompt_files(prompt_tree))
+
+
+def test_exclude_prunes_directories_and_files(prompt_tree):
+    options = DiscoveryOptions(recursive=True, exclude=(".*", "drafts", "team-b/b.md"))
+
+    assert _relative(prompt_tree, iter_prompt_files(prompt_tree, options)) == [
+        "b.md",
+        "root.md",
+        "team-a/a.md",
+    ]
+
+
+def test_include_patterns_match_names_or_relative_paths(prompt_tree):
+    options = DiscoveryOptions(recursive=True, include=("team-a/*.md", "*.txt"))
+
+    # fnmatch's * crosses directory separators, so nested files match too
+    assert _relative(prompt_tree, iter_prompt_files(prompt_tree, options)) == [
+        "notes.txt",
+        "team-a/a.md",
+        "team-a/drafts/draft.md",
+    ]
+
+
+@pytest.mark.skipif(not hasattr(os, "symlink"), reason="symlinks unavailable")
+def test_symlinked_directories_are_not_entered(prompt_tree):
+    (prompt_tree / "loop").symlink_to(prompt_tree, target_is_directory=True)
+    (prompt_tree / "linked.md").symlink_to(prompt_tree / "root.md")
+
+    paths = _relative(prompt_tree, iter_prompt_files(prompt_tree, DiscoveryOptions(recursive=True)))
+
+    assert "linked.md" in paths
+    assert not any(path.startswith("loop/") for path in paths)
+
+
+def test_negative_max_depth_is_rejected():
+    with pytest.raises(ValueError, match="max_depth"):
+        DiscoveryOptions(recursive=True, max_depth=-1)
+
+
+def test_writer_and_server_discover_the_same_prompts(prompt_tree, tmp_path, mcp_server):
+    options = DiscoveryOptions(recursive=True, exclude=(".*",))
+    writer = SlashCommandWriter(
+        prompts_dir=prompt_tree,
+        agents=["claude-code"],
+        base_path=tmp_path / "out",
+        dry_run=True,
+        discovery=options,
+    )
+
+    result = writer.generate()
+    register_prompts(mcp_server, prompt_tree, discovery=options)
+
+    written = [prompt["name"] for prompt in result["prompts"]]
+    assert written == ["b", "root", "team-a-a", "team-a-drafts-draft", "team-b-b"]
+    assert set(anyio.run(mcp_server.get_prompts)) == set(written)
+
+
+def test_config_reads_discovery_environment(monkeypatch):
+    monkeypatch.setenv("SDD_PROMPTS_RECURSIVE", "true")
+    monkeypatch.setenv("SDD_PROMPTS_INCLUDE", "*.md, *.prompt")
+    monkeypatch.setenv("SDD_PROMPTS_EXCLUDE", "drafts,")
+    monkeypatch.setenv("SDD_PROMPTS_MAX_DEPTH", "2")
+
+    assert Config().prompt_discovery == DiscoveryOptions(
+        recursive=True, include=("*.md", "*.prompt"), exclude=("drafts",), max_depth=2
+    )
+
+
+def test_config_rejects_invalid_max_depth(monkeypatch):
+    monkeypatch.setenv("SDD_PROMPTS_MAX_DEPTH", "-1")
+
+    with pytest.raises(ValueError, match="SDD_PROMPTS_MAX_DEPTH"):
+        Config()
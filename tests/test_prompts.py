@@ -1,9 +1,23 @@
 """Tests for prompt loading and registration."""
 
+import os
+import pickle
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
 import anyio
 import pytest
 
-from mcp_server.prompt_utils import load_markdown_prompt, parse_frontmatter
+from mcp_server import prompt_utils
+from mcp_server.prompt_utils import (
+    MarkdownPrompt,
+    load_lazy_markdown_prompt,
+    load_markdown_prompt,
+    parse_frontmatter,
+    scan_frontmatter,
+)
 from mcp_server.prompts_loader import register_prompts
 
 
@@ -49,6 +63,314 @@ Body"""
         assert "Body" in body
 
 
+class TestFrontmatterScanner:
+    """Tests for the line-anchored frontmatter delimiter scanner."""
+
+    def test_scan_returns_offsets_for_yaml_and_body(self):
+        content = "---\nname: demo\n---\n\n# Body\n"
+        span = scan_frontmatter(content)
+
+        assert span is not None
+        assert content[span.yaml_start : span.yaml_end] == "name: demo\n"
+        assert content[span.body_start :] == "\n# Body\n"
+
+    def test_scan_works_on_bytes_with_identical_offsets(self):
+        content = "---\ndescription: café\n---\nBody ünïcode\n"
+        encoded = content.encode("utf-8")
+
+        span = scan_frontmatter(encoded)
+
+        assert span is not None
+        assert encoded[span.yaml_start : span.yaml_end].decode() == "description: café\n"
+        assert encoded[span.body_start :].decode() == "Body ünïcode\n"
+
+    def test_scan_ignores_delimiter_inside_values(self):
+        content = "---\ntitle: before---after\nrule: '---'\n---\nBody\n"
+        frontmatter, body = parse_frontmatter(content)
+
+        assert frontmatter == {"title": "before---after", "rule": "---"}
+        assert body == "Body"
+
+    def test_scan_ignores_indented_delimiter_in_block_scalar(self):
+        content = "---\ndescription: |\n  first\n  ---\n  last\n---\nBody\n"
+        frontmatter, body = parse_frontmatter(content)
+
+        assert frontmatter == {"description": "first\n---\nlast\n"}
+        assert body == "Body"
+
+    def test_scan_ignores_longer_horizontal_rules(self):
+        content = "---\nname: demo\n-----\n---\nBody\n"
+        span = scan_frontmatter(content)
+
+        assert span is not None
+        assert content[span.yaml_start : span.yaml_end] == "name: demo\n-----\n"
+
+    def test_scan_accepts_crlf_and_trailing_whitespace(self):
+        content = "---  \r\nname: demo\r\n--- \r\nBody\r\n"
+        frontmatter, body = parse_frontmatter(content)
+
+        assert frontmatter == {"name": "demo"}
+        assert body == "Body"
+
+    def test_scan_handles_empty_frontmatter_and_missing_trailing_newline(self):
+        assert parse_frontmatter("---\n---\nBody") == ({}, "Body")
+        assert parse_frontmatter("---\nname: demo\n---") == ({"name": "demo"}, "")
+
+    @pytest.mark.parametrize(
+        "content",
+        [
+            "--- not a delimiter\nname: demo\n---\nBody",
+            "---\nname: demo\nno closing delimiter\n",
+            "---",
+            "Body only\n---\nname: demo\n---\n",
+        ],
+    )
+    def test_scan_rejects_incomplete_frontmatter(self, content):
+        assert scan_frontmatter(content) is None
+        assert parse_frontmatter(content) == ({}, content)
+
+
+class TestLazyPrompt:
+    """Tests for prompts that read their body on first access."""
+
+    @pytest.mark.parametrize(
+        "content",
+        [
+            "---\nname: lazy\ntags: [a]\n---\n\n# Title\n\nBody text.\n\n",
+            "---\r\nname: crlf\r\n---\r\n\r\nLine one\r\nLine two\r\n",
+            "---\nname: unicode\n---\nÜnïcödé — 漢字 😀\n",
+            "---\nname: empty\n---",
+            "No frontmatter at all\n\n",
+            "---\nname: unterminated\n\nBody\n",
+        ],
+    )
+    def test_lazy_prompt_matches_eager_prompt(self, tmp_path, content):
+        path = tmp_path / "prompt.md"
+        path.write_bytes(content.encode("utf-8"))
+
+        lazy = load_lazy_markdown_prompt(path)
+
+        assert lazy.materialize() == load_markdown_prompt(path)
+
+    def test_frontmatter_larger_than_one_read_chunk(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(prompt_utils, "_HEAD_CHUNK_SIZE", 16)
+        path = tmp_path / "prompt.md"
+        path.write_text(
+            "---\nname: chunked\ndescription: " + "x" * 100 + "\n---\nBody\n", encoding="utf-8"
+        )
+
+        lazy = load_lazy_markdown_prompt(path)
+
+        assert lazy.description == "x" * 100
+        assert lazy.body == "Body"
+
+    def test_body_is_read_on_first_access_only(self, tmp_path, monkeypatch):
+        path = tmp_path / "prompt.md"
+        path.write_text("---\nname: lazy\n---\nBody\n", encoding="utf-8")
+        lazy = load_lazy_markdown_prompt(path)
+        assert lazy._body is None
+
+        assert lazy.body == "Body"
+
+        monkeypatch.setattr(type(lazy), "_read_body", lambda self: pytest.fail("body re-read"))
+        assert lazy.body == "Body"
+
+    def test_changed_file_is_reparsed(self, tmp_path):
+        path = tmp_path / "prompt.md"
+        path.write_text("---\nname: lazy\n---\nOld body\n", encoding="utf-8")
+        lazy = load_lazy_markdown_prompt(path)
+
+        path.write_text("---\nname: lazy\ndescription: longer now\n---\nNew body\n")
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        assert lazy.body == "New body"
+
+    def test_pickled_prompt_does_not_carry_body(self, tmp_path):
+        path = tmp_path / "prompt.md"
+        path.write_text("---\nname: lazy\n---\nBody\n", encoding="utf-8")
+        lazy = load_lazy_markdown_prompt(path)
+        assert lazy.body == "Body"
+
+        restored = pickle.loads(pickle.dumps(lazy))
+
+        assert restored._body is None
+        assert restored == lazy
+        assert restored.body == "Body"
+
+    def test_materialize_returns_markdown_prompt(self, temp_prompts_dir):
+        lazy = load_lazy_markdown_prompt(temp_prompts_dir / "manage-tasks.md")
+
+        prompt = lazy.materialize()
+
+        assert isinstance(prompt, MarkdownPrompt)
+        assert lazy.decorator_kwargs() == prompt.decorator_kwargs()
+
+
+@dataclass(frozen=True)
+class _DictPromptArgumentSpec:
+    """The argument representation before prompts were slotted."""
+
+    name: str
+    description: str | None
+    required: bool
+
+
+@dataclass(frozen=True)
+class _DictMarkdownPrompt:
+    """The prompt representation before prompts were slotted (set tags, no interning)."""
+
+    path: Path
+    name: str
+    description: str | None
+    tags: set[str] | None
+    meta: dict[str, Any] | None
+    enabled: bool
+    arguments: list[_DictPromptArgumentSpec]
+    body: str
+    agent_overrides: dict[str, Any] | None = None
+
+
+def _dict_prompt_from_content(path: Path, content: str) -> _DictMarkdownPrompt:
+    frontmatter, body = parse_frontmatter(content)
+    return _DictMarkdownPrompt(
+        path=path,
+        name=frontmatter["name"],
+        description=frontmatter.get("description"),
+        tags={str(tag) for tag in frontmatter["tags"]},
+        meta=None,
+        enabled=True,
+        arguments=[_DictPromptArgumentSpec(**entry) for entry in frontmatter["arguments"]],
+        body=body,
+    )
+
+
+class TestPromptMemory:
+    """Per-prompt memory of the slotted representation."""
+
+    COUNT = 2_000
+
+    @staticmethod
+    def _content(index: int) -> str:
+        return f"""---
+name: prompt-{index}
+description: Prompt number {index}
+tags: [planning, specification, team-{index % 10}]
+arguments:
+  - name: target
+    description: What to work on
+    required: false
+  - name: scope
+    description: How far to go
+    required: true
+---
+Body {index}
+"""
+
+    def _bytes_per_prompt(self, factory) -> float:
+        contents = [self._content(index) for index in range(self.COUNT)]
+        paths = [Path(f"/prompts/prompt-{index}.md") for index in range(self.COUNT)]
+        tracemalloc.start()
+        try:
+            prompts = [
+                factory(path, content) for path, content in zip(paths, contents, strict=True)
+            ]
+            retained, _peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        assert len(prompts) == self.COUNT
+        return retained / self.COUNT
+
+    def test_slotted_prompts_use_less_memory(self, record_property):
+        before = self._bytes_per_prompt(_dict_prompt_from_content)
+        after = self._bytes_per_prompt(prompt_utils.prompt_from_content)
+        record_property("bytes_per_prompt_before", round(before))
+        record_property("bytes_per_prompt_after", round(after))
+
+        assert after < before * 0.8
+
+    def test_prompts_have_no_instance_dict(self, tmp_path):
+        path = tmp_path / "prompt.md"
+        path.write_text(self._content(1), encoding="utf-8")
+
+        for prompt in (load_markdown_prompt(path), load_lazy_markdown_prompt(path)):
+            assert not hasattr(prompt, "__dict__")
+            assert not hasattr(prompt.arguments[0], "__dict__")
+            assert isinstance(prompt.tags, frozenset)
+
+    def test_tags_and_argument_names_are_interned(self):
+        first = prompt_utils.prompt_from_content(Path("a.md"), self._content(1))
+        second = prompt_utils.prompt_from_content(Path("b.md"), self._content(2))
+
+        first_tags = {tag: tag for tag in first.tags}
+        assert all(first_tags.get(tag) is tag for tag in second.tags & first.tags)
+        assert first.arguments[0].name is second.arguments[0].name
+
+
+class TestResolvedOverrides:
+    """Agent overrides are merged into a per-agent table when a prompt is created."""
+
+    CONTENT = """---
+name: overridden
+description: Base
+arguments:
+  - name: target
+    description: Base target
+  - name: mode
+    required: false
+agent_overrides:
+  cursor:
+    description: Cursor only
+    enabled: false
+    arguments:
+      - name: mode
+        description: Cursor mode
+        required: true
+      - name: extra
+      - description: no name is ignored
+  windsurf: not-a-mapping
+---
+Body
+"""
+
+    def test_table_merges_overrides_with_base_values(self, tmp_path):
+        prompt = prompt_utils.prompt_from_content(tmp_path / "p.md", self.CONTENT)
+
+        assert set(prompt.resolved_overrides) == {"cursor"}
+        cursor = prompt.resolved_overrides["cursor"]
+        assert cursor.description == "Cursor only"
+        assert cursor.enabled is False
+        assert [(arg.name, arg.description, arg.required) for arg in cursor.arguments] == [
+            ("target", "Base target", True),
+            ("mode", "Cursor mode", True),
+            ("extra", None, True),
+        ]
+
+    def test_table_is_read_only(self, tmp_path):
+        prompt = prompt_utils.prompt_from_content(tmp_path / "p.md", self.CONTENT)
+
+        with pytest.raises(TypeError):
+            prompt.resolved_overrides["claude-code"] = prompt.resolved_overrides["cursor"]
+
+    def test_prompts_without_overrides_share_an_empty_table(self, tmp_path):
+        first = prompt_utils.prompt_from_content(tmp_path / "a.md", "---\nname: a\n---\nA")
+        second = prompt_utils.prompt_from_content(tmp_path / "b.md", "Body only")
+
+        assert not first.resolved_overrides
+        assert first.resolved_overrides is second.resolved_overrides
+
+    def test_table_is_rebuilt_after_pickling(self, tmp_path):
+        path = tmp_path / "p.md"
+        path.write_text(self.CONTENT)
+        eager = load_markdown_prompt(path)
+        lazy = load_lazy_markdown_prompt(path)
+
+        for prompt in (eager, lazy, lazy.materialize()):
+            restored = pickle.loads(pickle.dumps(prompt))
+            assert restored.resolved_overrides == prompt.resolved_overrides
+            assert restored == prompt
+
+
 class TestPromptLoading:
     """Tests for loading prompts from directory."""
 
@@ -0,0 +1,251 @@
+"""Tests for the persistent rendered-file cache."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from mcp_server.prompt_utils import prompt_from_content
+from slash_commands import generators, render_cache
+from slash_commands.cli import app
+from slash_commands.config import CommandFormat, get_agent_config
+from slash_commands.formats.markdown import MarkdownCommandGenerator
+from slash_commands.placeholders import PLACEHOLDERS
+from slash_commands.render_cache import RenderCache, prompt_digest, render_key
+from slash_commands.run_context import RunContext
+from slash_commands.writer import SlashCommandWriter
+
+PINNED = RunContext.create("1700000000")
+
+
+def _write_prompt(path: Path, name: str, body: str = "Body") -> None:
+    path.write_text(f"---\nname: {name}\ndescription: A prompt\n---\n{body}\n", encoding="utf-8")
+
+
+@pytest.fixture
+def prompts_dir(tmp_path):
+    directory = tmp_path / "prompts"
+    directory.mkdir()
+    _write_prompt(directory / "alpha.md", "alpha")
+    _write_prompt(directory / "beta.md", "beta")
+    return directory
+
+
+def _key(name: str, agent: str = "claude-code", context: RunContext = PINNED, metadata=None):
+    prompt = prompt_from_content(Path(f"{name}.md"), f"---\nname: {name}\n---\nBody")
+    config = get_agent_config(agent)
+    generator = generators.CommandGenerator.create(config.command_format)
+    return render_key(prompt_digest(prompt), config, metadata, context, generator)
+
+
+class _CustomMarkdownGenerator(MarkdownCommandGenerator):
+    pass
+
+
+def _writer(prompts_dir, tmp_path, cache, run_context=PINNED):
+    return SlashCommandWriter(
+        prompts_dir=prompts_dir,
+        agents=["claude-code", "gemini-cli", "kiro-cli"],
+        base_path=tmp_path / "out",
+        overwrite_action="overwrite",
+        render_cache=cache,
+        run_context=run_context,
+    )
+
+
+def test_prompt_digest_depends_on_rendered_fields():
+    base = prompt_from_content(Path("p.md"), "---\nname: p\ntags: [b, a]\n---\nBody")
+    same = prompt_from_content(Path("other/p.md"), "---\nname: p\ntags: [a, b]\n---\nBody")
+    changed = prompt_from_content(Path("p.md"), "---\nname: p\ntags: [a, b]\n---\nBody!")
+
+    assert prompt_digest(base) == prompt_digest(same)
+    assert prompt_digest(base) != prompt_digest(changed)
+
+
+def test_render_key_separates_agents_sources_and_timestamps():
+    keys = {
+        _key("p"),
+        _key("p", agent="cursor"),
+        _key("p", context=RunContext.create("1700000001")),
+        _key("q"),
+    }
+    keys.add(_key("p", metadata={"a": 1}))
+    keys.add(_key("p", metadata={"a": "1"}))
+
+    assert len(keys) == 6
+
+
+def test_prompt_digest_keeps_key_types_apart():
+    numeric = prompt_from_content(Path("p.md"), "---\nname: p\nmeta:\n  1: x\n---\nBody")
+    text = prompt_from_content(Path("p.md"), "---\nname: p\nmeta:\n  '1': x\n---\nBody")
+    listed = prompt_from_content(Path("p.md"), "---\nname: p\nmeta:\n  '1': [x]\n---\nBody")
+    mapped = prompt_from_content(Path("p.md"), "---\nname: p\nmeta:\n  '1': {x: null}\n---\nBody")
+
+    assert len({prompt_digest(p) for p in (numeric, text, listed, mapped)}) == 4
+
+
+def test_render_key_depends_on_generator_and_placeholders(monkeypatch):
+    prompt = prompt_from_content(Path("p.md"), "---\nname: p\n---\nBody")
+    agent = get_agent_config("claude-code")
+    base = render_key(prompt_digest(prompt), agent, None, PINNED, MarkdownCommandGenerator())
+    custom = render_key(prompt_digest(prompt), agent, None, PINNED, _CustomMarkdownGenerator())
+
+    monkeypatch.setitem(PLACEHOLDERS._renderers, "{{name}}", lambda arguments: "name")
+    placeholder = render_key(prompt_digest(prompt), agent, None, PINNED, MarkdownCommandGenerator())
+
+    assert len({base, custom, placeholder}) == 3
+
+
+def test_cache_round_trips_through_disk(tmp_path):
+    cache = RenderCache(tmp_path)
+    cache.put(_key("p"), (b"head\n", b"body\n"))
+    cache.save()
+
+    reloaded = RenderCache(tmp_path)
+
+    assert reloaded.get(_key("p")) == (b"head\n", b"body\n")
+    assert reloaded.get(_key("q")) is None
+    assert reloaded.stats.as_dict() == {"hits": 1, "misses": 1, "evictions": 0}
+    assert reloaded.size == 10
+
+
+def test_cache_evicts_least_recently_used_over_size_cap(tmp_path):
+    cache = RenderCache(tmp_path, max_bytes=10)
+    cache.put(_key("a"), (b"aaaa",))
+    cache.put(_key("b"), (b"bbbb",))
+    assert cache.get(_key("a")) is not None
+
+    cache.put(_key("c"), (b"cccc",))
+
+    assert cache.get(_key("b")) is None
+    assert cache.get(_key("a")) == (b"aaaa",)
+    assert cache.get(_key("c")) == (b"cccc",)
+    assert cache.stats.evictions == 1
+    assert cache.size == 8
+
+
+def test_cache_keeps_an_entry_larger_than_the_cap(tmp_path):
+    cache = RenderCache(tmp_path, max_bytes=2)
+    cache.put(_key("a"), (b"aaaa",))
+
+    assert cache.get(_key("a")) == (b"aaaa",)
+
+
+def test_cache_from_another_version_is_discarded(tmp_path, monkeypatch):
+    cache = RenderCache(tmp_path)
+    cache.put(_key("p"), (b"old\n",))
+    cache.save()
+
+    monkeypatch.setattr(render_cache, "__version__", "999.0.0")
+    upgraded = RenderCache(tmp_path)
+
+    assert len(upgraded) == 0
+    upgraded.save()
+    assert len(RenderCache(tmp_path)) == 0
+
+
+def test_corrupt_cache_file_is_treated_as_empty(tmp_path):
+    (tmp_path / render_cache.CACHE_FILENAME).write_bytes(b"not a pickle")
+
+    assert len(RenderCache(tmp_path)) == 0
+
+
+def test_cache_save_to_unwritable_dir_warns(tmp_path, caplog):
+    not_a_dir = tmp_path / "file"
+    not_a_dir.write_text("")
+    cache = RenderCache(not_a_dir / "cache")
+    cache.put(_key("p"), (b"12345",))
+
+    cache.save()
+
+    assert "Could not save the render cache" in caplog.text
+
+
+def test_generate_succeeds_with_unwritable_cache_dir(prompts_dir, tmp_path, monkeypatch):
+    not_a_dir = tmp_path / "file"
+    not_a_dir.write_text("")
+    monkeypatch.setenv("SLASH_MAN_CACHE_DIR", str(not_a_dir / "cache"))
+
+    result = CliRunner().invoke(
+        app,
+        [
+            "generate",
+            "--prompts-dir",
+            str(prompts_dir),
+            "--agent",
+            "claude-code",
+            "--target-path",
+            str(tmp_path / "out"),
+            "--timestamp",
+            "1700000000",
+            "--yes",
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert (tmp_path / "out" / ".claude" / "commands" / "alpha.md").exists()
+
+
+def test_writer_reuses_cached_renders(prompts_dir, tmp_path):
+    first = _writer(prompts_dir, tmp_path, RenderCache(tmp_path / "cache")).generate()
+    written = {info["path"]: Path(info["path"]).read_bytes() for info in first["files"]}
+
+    with pytest.MonkeyPatch.context() as patch:
+
+        def fail(*args, **kwargs):
+            raise AssertionError("rendered despite a cache hit")
+
+        patch.setattr(generators._PromptRenderer, "render_bytes", fail)
+        second = _writer(prompts_dir, tmp_path, RenderCache(tmp_path / "cache")).generate()
+
+    assert first["render_cache"] == {"hits": 0, "misses": 6, "evictions": 0}
+    assert second["render_cache"] == {"hits": 6, "misses": 0, "evictions": 0}
+    assert {info["path"]: Path(info["path"]).read_bytes() for info in second["files"]} == written
+
+
+def test_writer_renders_only_changed_prompts(prompts_dir, tmp_path):
+    _writer(prompts_dir, tmp_path, RenderCache(tmp_path / "cache")).generate()
+    _write_prompt(prompts_dir / "beta.md", "beta", body="Changed body")
+
+    result = _writer(prompts_dir, tmp_path, RenderCache(tmp_path / "cache")).generate()
+
+    assert result["render_cache"] == {"hits": 3, "misses": 3, "evictions": 0}
+    beta = tmp_path / "out" / ".claude" / "commands" / "beta.md"
+    assert "Changed body" in beta.read_text()
+
+
+def test_writer_rerenders_after_registering_a_generator(prompts_dir, tmp_path, monkeypatch):
+    _writer(prompts_dir, tmp_path, RenderCache(tmp_path / "cache")).generate()
+
+    registry = generators.GeneratorRegistry(entry_point_group=None)
+    registry.register(CommandFormat.MARKDOWN, _CustomMarkdownGenerator)
+    monkeypatch.setattr(generators, "GENERATORS", registry)
+    result = _writer(prompts_dir, tmp_path, RenderCache(tmp_path / "cache")).generate()
+
+    # Only claude-code renders markdown; the other agents' files are still cached
+    assert result["render_cache"] == {"hits": 4, "misses": 2, "evictions": 0}
+
+
+def test_writer_skips_cache_without_pinned_timestamp(prompts_dir, tmp_path):
+    cache = RenderCache(tmp_path / "cache")
+
+    result = _writer(
+        prompts_dir, tmp_path, cache, run_context=RunContext.create(environ={})
+    ).generate()
+
+    assert result["render_cache"] == {"hits": 0, "misses": 0, "evictions": 0}
+    assert not cache.path.exists()
+
+
+def test_cache_stats_command(tmp_path, monkeypatch):
+    monkeypatch.setenv("SLASH_MAN_CACHE_DIR", str(tmp_path))
+    cache = RenderCache(tmp_path)
+    cache.put(_key("p"), (b"12345",))
+    cache.save()
+
+    result = CliRunner().invoke(app, ["cache", "stats"])
+
+    assert result.exit_code == 0
+    assert "Rendered files: 1 cached (5 of" in result.output
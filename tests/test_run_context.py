@@ -0,0 +1,59 @@
+"""Tests for the per-run generation context."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+
+import pytest
+
+from slash_commands.run_context import RunContext, parse_timestamp
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("1735787045", datetime(2025, 1, 2, 3, 4, 5, tzinfo=UTC)),
+        ("2025-01-02T03:04:05", datetime(2025, 1, 2, 3, 4, 5, tzinfo=UTC)),
+        ("2025-01-02T05:04:05+02:00", datetime(2025, 1, 2, 3, 4, 5, tzinfo=UTC)),
+        ("2025-01-02", datetime(2025, 1, 2, tzinfo=UTC)),
+    ],
+)
+def test_parse_timestamp(value, expected):
+    parsed = parse_timestamp(value)
+
+    assert parsed == expected
+    assert parsed.tzinfo is UTC
+
+
+@pytest.mark.parametrize("value", ["yesterday", "", "99999999999999999999"])
+def test_parse_timestamp_rejects_invalid_values(value):
+    with pytest.raises(ValueError):
+        parse_timestamp(value)
+
+
+def test_create_prefers_explicit_timestamp_over_source_date_epoch():
+    context = RunContext.create("2025-01-02T03:04:05Z", environ={"SOURCE_DATE_EPOCH": "0"})
+
+    assert context.reproducible
+    assert context.updated_at == "2025-01-02T03:04:05+00:00"
+    assert context.updated_date == "2025-01-02"
+
+
+def test_create_reads_source_date_epoch():
+    context = RunContext.create(environ={"SOURCE_DATE_EPOCH": "1735787045"})
+
+    assert context.reproducible
+    assert context.updated_at == "2025-01-02T03:04:05+00:00"
+
+
+def test_create_rejects_non_integer_source_date_epoch():
+    with pytest.raises(ValueError, match="SOURCE_DATE_EPOCH"):
+        RunContext.create(environ={"SOURCE_DATE_EPOCH": "2025-01-02"})
+
+
+def test_create_without_pinned_timestamp_uses_the_clock():
+    before = datetime.now(UTC)
+    context = RunContext.create(environ={})
+
+    assert not context.reproducible
+    assert before <= context.timestamp <= datetime.now(UTC)
@@ -185,3 +185,53 @@ def test_single_prompt_skip_backups_applies_to_all(mock_prompts_dir, tmp_path):
             # No backup files should be created
             backup_files = list(file_path.parent.glob(f"{file_path.name}.*.bak"))
             assert len(backup_files) == 0
+
+
+def _generate(prompts_dir, target, *extra):
+    return CliRunner().invoke(
+        app,
+        [
+            "generate",
+            "--prompts-dir",
+            str(prompts_dir),
+            "--agent",
+            "claude-code",
+            "--agent",
+            "gemini-cli",
+            "--target-path",
+            str(target),
+            *extra,
+        ],
+    )
+
+
+def test_resync_without_changes_does_not_prompt(mock_prompts_dir, tmp_path):
+    """Re-generating identical content leaves the existing files alone without asking."""
+    assert _generate(mock_prompts_dir, tmp_path, "--yes").exit_code == 0
+
+    with patch(
+        "slash_commands.writer.SlashCommandWriter._prompt_for_all_existing_files"
+    ) as mock_prompt:
+        result = _generate(mock_prompts_dir, tmp_path)
+
+    assert result.exit_code == 0
+    mock_prompt.assert_not_called()
+
+
+def test_prompt_is_asked_when_the_first_existing_file_changes(mock_prompts_dir, tmp_path):
+    """One changed prompt triggers the single question; unchanged files are not backed up."""
+    assert _generate(mock_prompts_dir, tmp_path, "--yes").exit_code == 0
+    prompt2 = mock_prompts_dir / "prompt2.md"
+    prompt2.write_text(prompt2.read_text() + "\nMore text.\n")
+
+    with patch(
+        "slash_commands.writer.SlashCommandWriter._prompt_for_all_existing_files"
+    ) as mock_prompt:
+        mock_prompt.return_value = "backup"
+        result = _generate(mock_prompts_dir, tmp_path)
+
+    assert result.exit_code == 0
+    assert mock_prompt.call_count == 1
+    assert len(mock_prompt.call_args.args[0]) == 6
+    backups = sorted(path.name.split(".")[0] for path in tmp_path.rglob("*.bak"))
+    assert backups == ["prompt2", "prompt2"]
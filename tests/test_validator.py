@@ -0,0 +1,294 @@
+"""Tests for catalog-wide prompt validation."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from mcp_server import yaml_backend
+from slash_commands import generators
+from slash_commands import validator as validator_module
+from slash_commands.cli import app
+from slash_commands.config import CommandFormat
+from slash_commands.generators import MarkdownCommandGenerator
+from slash_commands.placeholders import PLACEHOLDERS
+from slash_commands.validator import (
+    CACHE_FILENAME,
+    VALIDATION_FORMAT_VERSION,
+    PromptValidator,
+    ValidationCache,
+    check_prompt,
+)
+
+VALID_PROMPT = """---
+name: valid
+description: A valid prompt
+arguments:
+  - name: target
+    description: What to work on
+agent_overrides:
+  cursor:
+    description: Cursor description
+---
+Work on $ARGUMENTS
+"""
+
+
+def _write(directory: Path, name: str, content: str) -> Path:
+    path = directory / name
+    path.write_text(content, encoding="utf-8")
+    return path
+
+
+def _checks(content: str) -> list[tuple[str, str | None]]:
+    diagnostics = check_prompt(Path("prompt.md"), content.encode("utf-8"))
+    return [(diagnostic.check, diagnostic.agent) for diagnostic in diagnostics]
+
+
+def test_valid_prompt_has_no_diagnostics():
+    assert _checks(VALID_PROMPT) == []
+    assert _checks("Just a body without frontmatter\n") == []
+
+
+@pytest.mark.parametrize(
+    ("content", "expected"),
+    [
+        ("---\nname: [broken\n---\nBody\n", [("frontmatter", None)]),
+        ("---\nname: unclosed\nBody\n", [("frontmatter", None)]),
+        ("---\n- a list\n---\nBody\n", [("frontmatter", None)]),
+        ("---\nmeta: 5\n---\nBody\n", [("frontmatter", None)]),
+        ("---\narguments: 5\n---\nBody\n", [("arguments", None)]),
+        ("---\narguments:\n  - description: no name\n---\nBody\n", [("arguments", None)]),
+        ("---\nagent_overrides: [cursor]\n---\nBody\n", [("agent_overrides", None)]),
+        (
+            "---\nagent_overrides:\n  not-an-agent: {}\n---\nBody\n",
+            [("agent_overrides", "not-an-agent")],
+        ),
+        ("---\nagent_overrides:\n  cursor: yes\n---\nBody\n", [("agent_overrides", "cursor")]),
+        (
+            "---\nagent_overrides:\n  cursor:\n    enabled: sometimes\n    arguments: 1\n---\nBody\n",
+            [("agent_overrides", "cursor"), ("agent_overrides", "cursor")],
+        ),
+    ],
+)
+def test_invalid_prompts_are_reported(content, expected):
+    assert _checks(content) == expected
+
+
+def test_yaml_errors_point_at_the_file_line():
+    diagnostics = check_prompt(Path("p.md"), b"---\nname: ok\ntags: [a\n---\nBody\n")
+
+    assert "line 4" in diagnostics[0].message
+
+
+def test_non_utf8_file_is_reported():
+    diagnostics = check_prompt(Path("p.md"), b"---\nname: \xff\n---\n")
+
+    assert [(d.check, d.message.split(":")[0]) for d in diagnostics] == [
+        ("read", "File is not valid UTF-8")
+    ]
+
+
+def test_render_failures_are_reported_per_agent(monkeypatch):
+    def fail(self, prompt, agent, source_metadata=None):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(MarkdownCommandGenerator, "generate", fail)
+
+    diagnostics = check_prompt(Path("p.md"), VALID_PROMPT.encode("utf-8"))
+
+    assert diagnostics
+    assert {d.check for d in diagnostics} == {"render"}
+    assert all(d.message == "RuntimeError: boom" for d in diagnostics)
+    assert "claude-code" in {d.agent for d in diagnostics}
+    assert "gemini-cli" not in {d.agent for d in diagnostics}
+
+
+def test_validate_collects_all_diagnostics_in_path_order(tmp_path):
+    _write(tmp_path, "b.md", "---\narguments: 5\n---\nBody\n")
+    _write(tmp_path, "a.md", "---\nname: [broken\n---\nBody\n")
+    _write(tmp_path, "c.md", VALID_PROMPT)
+
+    report = PromptValidator(tmp_path, workers=1).validate()
+
+    assert report.checked == 3
+    assert report.failed == 2
+    assert not report.ok
+    assert [d.path.name for d in report.diagnostics] == ["a.md", "b.md"]
+    assert str(report.diagnostics[1]) == (
+        f"{tmp_path / 'b.md'}: [arguments] arguments metadata must be a list of argument definitions"
+    )
+
+
+def test_validate_missing_directory_raises(tmp_path):
+    with pytest.raises(ValueError, match="does not exist"):
+        PromptValidator(tmp_path / "missing").validate()
+
+
+def test_process_pool_matches_sequential_results(tmp_path):
+    for index in range(40):
+        content = VALID_PROMPT if index % 3 else "---\narguments: 5\n---\nBody\n"
+        _write(tmp_path, f"prompt-{index:02d}.md", content.replace("valid", f"valid-{index}"))
+
+    sequential = PromptValidator(tmp_path, workers=1).validate()
+    parallel = PromptValidator(tmp_path, workers=2).validate()
+
+    assert parallel == sequential
+    assert parallel.failed == 14
+
+
+def test_cache_only_rechecks_changed_files(tmp_path, monkeypatch):
+    prompts = tmp_path / "prompts"
+    prompts.mkdir()
+    _write(prompts, "good.md", VALID_PROMPT)
+    bad = _write(prompts, "bad.md", "---\narguments: 5\n---\nBody\n")
+    cache_dir = tmp_path / "cache"
+
+    first = PromptValidator(prompts, cache=ValidationCache(cache_dir), workers=1).validate()
+    assert (first.checked, first.cached, first.failed) == (2, 0, 1)
+
+    checked: list[str] = []
+    original = validator_module._check_item
+
+    def spy(item):
+        checked.append(item[0].name)
+        return original(item)
+
+    monkeypatch.setattr(validator_module, "_check_item", spy)
+
+    second = PromptValidator(prompts, cache=ValidationCache(cache_dir), workers=1).validate()
+    assert (second.cached, checked) == (2, [])
+    assert second.diagnostics == first.diagnostics
+
+    bad.write_text(VALID_PROMPT.replace("valid", "fixed"), encoding="utf-8")
+    third = PromptValidator(prompts, cache=ValidationCache(cache_dir), workers=1).validate()
+    assert (third.cached, checked, third.ok) == (1, ["bad.md"], True)
+
+
+def test_cache_is_discarded_when_checks_change(tmp_path, monkeypatch):
+    _write(tmp_path, "good.md", VALID_PROMPT)
+    cache_dir = tmp_path / "cache"
+    PromptValidator(tmp_path, cache=ValidationCache(cache_dir), workers=1).validate()
+
+    monkeypatch.setattr(validator_module, "_fingerprint", lambda: "other-version")
+    report = PromptValidator(tmp_path, cache=ValidationCache(cache_dir), workers=1).validate()
+
+    assert report.cached == 0
+
+
+class _PluginGenerator(MarkdownCommandGenerator):
+    pass
+
+
+def _register_generator(monkeypatch):
+    registry = generators.GeneratorRegistry(entry_point_group=None)
+    registry.register(CommandFormat.MARKDOWN, _PluginGenerator)
+    monkeypatch.setattr(generators, "GENERATORS", registry)
+
+
+def _register_placeholder(monkeypatch):
+    monkeypatch.setitem(PLACEHOLDERS._renderers, "{{plugin}}", lambda arguments: "")
+
+
+def _switch_yaml_backend(monkeypatch):
+    monkeypatch.setattr(yaml_backend, "HAS_LIBYAML", not yaml_backend.HAS_LIBYAML)
+
+
+@pytest.mark.parametrize(
+    "change", [_register_generator, _register_placeholder, _switch_yaml_backend]
+)
+def test_cache_is_discarded_when_plugins_or_yaml_backend_change(tmp_path, monkeypatch, change):
+    _write(tmp_path, "good.md", VALID_PROMPT)
+    cache_dir = tmp_path / "cache"
+    PromptValidator(tmp_path, cache=ValidationCache(cache_dir), workers=1).validate()
+
+    change(monkeypatch)
+    report = PromptValidator(tmp_path, cache=ValidationCache(cache_dir), workers=1).validate()
+
+    assert report.cached == 0
+
+
+@pytest.mark.parametrize("results", [[], {"digest": 5}, {"digest": [7]}, None])
+def test_malformed_cache_results_are_treated_as_empty(tmp_path, results):
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
+    payload = {
+        "version": VALIDATION_FORMAT_VERSION,
+        "fingerprint": validator_module._fingerprint(),
+        "results": results,
+    }
+    (cache_dir / CACHE_FILENAME).write_text(json.dumps(payload))
+    _write(tmp_path, "good.md", VALID_PROMPT)
+
+    report = PromptValidator(tmp_path, cache=ValidationCache(cache_dir), workers=1).validate()
+
+    assert report.ok
+    assert report.cached == 0
+
+
+def test_corrupt_cache_is_treated_as_empty(tmp_path):
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
+    (cache_dir / CACHE_FILENAME).write_text("{not json")
+    _write(tmp_path, "good.md", VALID_PROMPT)
+
+    report = PromptValidator(tmp_path, cache=ValidationCache(cache_dir), workers=1).validate()
+
+    assert report.ok
+    assert (cache_dir / CACHE_FILENAME).read_text().startswith("{")
+
+
+def test_unwritable_cache_dir_only_warns(tmp_path, caplog):
+    not_a_dir = tmp_path / "file"
+    not_a_dir.write_text("")
+    _write(tmp_path, "good.md", VALID_PROMPT)
+
+    report = PromptValidator(
+        tmp_path, cache=ValidationCache(not_a_dir / "cache"), workers=1
+    ).validate()
+
+    assert report.ok
+    assert "Could not save the validation cache" in caplog.text
+
+
+def test_cache_drops_least_recently_used_results(tmp_path):
+    cache = ValidationCache(tmp_path, max_entries=2)
+    cache.put("a", [])
+    cache.put("b", [])
+    cache.get("a")
+    cache.put("c", [])
+    cache.save()
+
+    reloaded = ValidationCache(tmp_path)
+    assert reloaded.get("b") is None
+    assert reloaded.get("a") == []
+    assert reloaded.get("c") == []
+
+
+def test_cli_validate_reports_failures(tmp_path):
+    _write(tmp_path, "good.md", VALID_PROMPT)
+    _write(tmp_path, "bad.md", "---\narguments: 5\n---\nBody\n")
+
+    result = CliRunner().invoke(app, ["validate", "--prompts-dir", str(tmp_path), "-j", "1"])
+
+    assert result.exit_code == 1
+    assert "bad.md: [arguments]" in result.output
+    assert "Validated 2 prompt(s): 1 failed" in result.output
+
+
+def test_cli_validate_passes_clean_catalog(tmp_path):
+    _write(tmp_path, "good.md", VALID_PROMPT)
+
+    result = CliRunner().invoke(app, ["validate", "-p", str(tmp_path), "--no-cache"])
+
+    assert result.exit_code == 0
+    assert "Validated 1 prompt(s): 0 failed" in result.output
+
+
+def test_cli_validate_missing_directory(tmp_path):
+    result = CliRunner().invoke(app, ["validate", "-p", str(tmp_path / "missing")])
+
+    assert result.exit_code == 3
@@ -2,15 +2,27 @@
 
 from __future__ import annotations
 
+import os
 import sys
+import threading
+import time
+from collections import Counter
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
 import requests
 
-from slash_commands.config import CommandFormat
-from slash_commands.writer import SlashCommandWriter, _find_package_prompts_dir
+from slash_commands.config import CommandFormat, get_agent_config
+from slash_commands.generators import CommandGenerator
+from slash_commands.run_context import RunContext
+from slash_commands.writer import (
+    SlashCommandWriter,
+    _DirectoryListing,
+    _find_package_prompts_dir,
+    same_generated_content,
+    write_chunks,
+)
 
 
 @pytest.fixture
@@ -135,9 +147,10 @@ def test_writer_calls_generator_with_correct_agent(mock_prompt_load: Path, tmp_p
     """Test that writer calls generator with correct agent configuration."""
     prompts_dir = mock_prompt_load
 
-    with patch("slash_commands.writer.CommandGenerator") as mock_generator_class:
-        mock_generator = MagicMock()
-        mock_generator.generate.return_value = "---\nname: test-prompt\n---\n\n# Test Prompt"
+    with patch("slash_commands.generators.CommandGenerator") as mock_generator_class:
+        # A generator without generate_many_bytes(); its output is encoded by the writer
+        mock_generator = MagicMock(spec=["generate", "generate_many"])
+        mock_generator.generate_many.return_value = ["---\nname: test-prompt\n---\n\n# Test Prompt"]
         mock_generator_class.create.return_value = mock_generator
 
         writer = SlashCommandWriter(
@@ -151,7 +164,34 @@ def test_writer_calls_generator_with_correct_agent(mock_prompt_load: Path, tmp_p
 
         # Verify generator was called with correct agent
         mock_generator_class.create.assert_called_once_with(CommandFormat.MARKDOWN)
-        assert mock_generator.generate.called
+        agents = mock_generator.generate_many.call_args.args[1]
+        assert agents == (get_agent_config("claude-code"),)
+        output = tmp_path / ".claude" / "commands" / "test-prompt.md"
+        assert output.read_text() == "---\nname: test-prompt\n---\n\n# Test Prompt"
+
+
+def test_writer_renders_once_per_format(mock_prompt_load: Path, tmp_path):
+    """Agents sharing a format are rendered together by one generator."""
+    agents = ["claude-code", "cursor", "windsurf", "gemini-cli"]
+
+    with patch(
+        "slash_commands.generators.CommandGenerator.create", wraps=CommandGenerator.create
+    ) as create:
+        writer = SlashCommandWriter(
+            prompts_dir=mock_prompt_load,
+            agents=agents,
+            dry_run=False,
+            base_path=tmp_path,
+        )
+        result = writer.generate()
+
+    assert [call.args[0] for call in create.call_args_list] == [
+        CommandFormat.MARKDOWN,
+        CommandFormat.TOML,
+    ]
+    assert [file_info["agent"] for file_info in result["files"]] == agents
+    cursor_file = tmp_path / ".cursor" / "commands" / "test-prompt.md"
+    assert "agent: cursor\n" in cursor_file.read_text()
 
 
 def test_writer_loads_prompts_from_directory(mock_prompt_load: Path, tmp_path):
@@ -770,11 +810,11 @@ Content 2
         github_path="prompts",
     )
 
-    prompts = writer._load_prompts()
+    prompts = writer.generate()["prompts"]
 
     assert len(prompts) == 2
-    assert prompts[0].name == "prompt1"
-    assert prompts[1].name == "prompt2"
+    assert prompts[0]["name"] == "prompt1"
+    assert prompts[1]["name"] == "prompt2"
 
 
 @patch("slash_commands.writer._download_github_prompts_to_temp_dir")
@@ -814,10 +854,10 @@ Content
         github_path="prompts/generate-spec.md",
     )
 
-    prompts = writer._load_prompts()
+    prompts = writer.generate()["prompts"]
 
     assert len(prompts) == 1
-    assert prompts[0].name == "generate-spec"
+    assert prompts[0]["name"] == "generate-spec"
 
 
 @patch("slash_commands.writer._download_github_prompts_to_temp_dir")
@@ -839,13 +879,13 @@ def test_writer_github_api_error_handling(mock_download, tmp_path):
     )
 
     with pytest.raises(requests.exceptions.HTTPError):
-        writer._load_prompts()
+        writer.generate()
 
     # Mock RequestException (network error)
     mock_download.side_effect = requests.exceptions.RequestException("Network error")
 
     with pytest.raises(requests.exceptions.RequestException):
-        writer._load_prompts()
+        writer.generate()
 
 
 @pytest.mark.parametrize(
@@ -1004,3 +1044,705 @@ def test_writer_generates_kiro_ide_agent_files(mock_prompt_load: Path, tmp_path)
         assert "inclusion: manual" in content  # Has inclusion field
         assert "tools:" in content  # Has tools field
         assert "<!-- slash-command-manager:" in content  # Has tracking comment
+
+
+def _write_numbered_prompts(prompts_dir: Path, count: int) -> None:
+    prompts_dir.mkdir(exist_ok=True)
+    for index in range(count):
+        (prompts_dir / f"prompt-{index:03d}.md").write_text(
+            f"---\nname: prompt-{index:03d}\ndescription: Prompt {index}\n---\n# Prompt {index}\n"
+        )
+
+
+@pytest.mark.parametrize("load_workers", [None, 1, 4])
+def test_writer_loads_prompts_in_sorted_order_with_workers(tmp_path, load_workers):
+    """Concurrent loading must return prompts in the same order as sequential loading."""
+    prompts_dir = tmp_path / "prompts"
+    _write_numbered_prompts(prompts_dir, 40)
+
+    writer = SlashCommandWriter(
+        prompts_dir=prompts_dir,
+        agents=["claude-code"],
+        base_path=tmp_path,
+        load_workers=load_workers,
+    )
+
+    prompts = writer.generate()["prompts"]
+
+    assert [prompt["name"] for prompt in prompts] == [f"prompt-{index:03d}" for index in range(40)]
+
+
+@pytest.mark.parametrize("load_workers", [1, 4])
+def test_writer_concurrent_loading_raises_first_error_in_order(tmp_path, load_workers):
+    """The error for the first failing file (in sorted order) is raised, as before."""
+    prompts_dir = tmp_path / "prompts"
+    _write_numbered_prompts(prompts_dir, 10)
+    (prompts_dir / "prompt-003.md").write_text("---\narguments: not-a-list\n---\nBody\n")
+    (prompts_dir / "prompt-007.md").write_text("---\narguments:\n  - 42\n---\nBody\n")
+
+    writer = SlashCommandWriter(
+        prompts_dir=prompts_dir,
+        agents=["claude-code"],
+        base_path=tmp_path,
+        load_workers=load_workers,
+    )
+
+    with pytest.raises(ValueError, match="arguments metadata must be a list"):
+        writer.generate()
+
+
+def test_writer_rejects_invalid_load_workers(tmp_path):
+    """load_workers must be a positive integer."""
+    with pytest.raises(ValueError, match="load_workers"):
+        SlashCommandWriter(prompts_dir=tmp_path, load_workers=0)
+
+
+def test_writer_detects_generated_markdown_with_delimiter_in_values(tmp_path):
+    """A '---' inside a frontmatter value must not end the frontmatter early."""
+    command_dir = tmp_path / ".claude" / "commands"
+    command_dir.mkdir(parents=True, exist_ok=True)
+
+    generated_file = command_dir / "ruled.md"
+    generated_file.write_text(
+        "---\nname: ruled\ndescription: before---after\nmeta:\n"
+        "  source_prompt: ruled\n  version: 1.0.0\n---\n\n# Ruled\n"
+    )
+
+    writer = SlashCommandWriter(
+        prompts_dir=tmp_path / "prompts",
+        agents=[],
+        dry_run=False,
+        base_path=tmp_path,
+    )
+
+    found_files = writer.find_generated_files(agents=["claude-code"], include_backups=False)
+
+    assert [info["path"] for info in found_files] == [str(generated_file)]
+
+
+def test_iter_generate_writes_each_prompt_before_loading_the_next(tmp_path):
+    """Streaming generation hands back results as soon as each file is written."""
+    prompts_dir = tmp_path / "prompts"
+    _write_numbered_prompts(prompts_dir, 5)
+    writer = SlashCommandWriter(
+        prompts_dir=prompts_dir,
+        agents=["claude-code", "cursor"],
+        base_path=tmp_path,
+        overwrite_action="overwrite",
+        load_workers=1,
+    )
+
+    loaded: list[str] = []
+    stream = writer.iter_generate(on_prompt=lambda prompt: loaded.append(prompt.name))
+    first = next(stream)
+
+    assert Path(first["path"]).exists()
+    assert first["agent"] == "claude-code"
+    assert loaded == ["prompt-000"]
+
+    rest = list(stream)
+    assert len(rest) == 9
+    assert loaded == [f"prompt-{index:03d}" for index in range(5)]
+
+
+def test_iter_generate_reports_disabled_prompts_without_files(tmp_path):
+    """Disabled prompts are passed to on_prompt but produce no files."""
+    prompts_dir = tmp_path / "prompts"
+    _write_numbered_prompts(prompts_dir, 2)
+    (prompts_dir / "prompt-001.md").write_text("---\nname: disabled\nenabled: false\n---\nBody\n")
+    writer = SlashCommandWriter(
+        prompts_dir=prompts_dir,
+        agents=["claude-code"],
+        base_path=tmp_path,
+        dry_run=True,
+    )
+
+    result = writer.generate()
+
+    assert result["prompts_loaded"] == 2
+    assert [prompt["name"] for prompt in result["prompts"]] == ["prompt-000", "disabled"]
+    assert len(result["files"]) == 1
+
+
+@pytest.mark.parametrize("load_workers", [1, 4])
+def test_iter_generate_peak_memory_does_not_grow_with_catalog(tmp_path, load_workers):
+    """Only a bounded window of prompt bodies is alive at any time while streaming."""
+    import tracemalloc
+    from collections import deque
+
+    body = "x" * 200_000
+
+    def peak_for(count: int) -> int:
+        prompts_dir = tmp_path / f"prompts-{count}"
+        prompts_dir.mkdir()
+        for index in range(count):
+            (prompts_dir / f"p-{index:03d}.md").write_text(f"---\nname: p-{index}\n---\n{body}\n")
+        writer = SlashCommandWriter(
+            prompts_dir=prompts_dir,
+            agents=["claude-code"],
+            base_path=tmp_path / f"out-{count}",
+            overwrite_action="overwrite",
+            load_workers=load_workers,
+        )
+        tracemalloc.start()
+        try:
+            deque(writer.iter_generate(), maxlen=0)
+            _current, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return peak
+
+    small, large = peak_for(20), peak_for(80)
+
+    # Loading all 80 bodies up front would need ~16 MB more than 20 bodies
+    assert large - small < 3_000_000
+
+
+def test_iter_generate_closed_early_saves_prompt_cache(tmp_path):
+    """Abandoning the stream still persists what was loaded through the cache."""
+    from mcp_server.prompt_cache import PromptCache
+
+    prompts_dir = tmp_path / "prompts"
+    _write_numbered_prompts(prompts_dir, 4)
+    writer = SlashCommandWriter(
+        prompts_dir=prompts_dir,
+        agents=["claude-code"],
+        base_path=tmp_path,
+        overwrite_action="overwrite",
+        prompt_cache=PromptCache(tmp_path / "cache"),
+        load_workers=2,
+    )
+
+    stream = writer.iter_generate()
+    next(stream)
+    stream.close()
+
+    assert PromptCache(tmp_path / "cache").path.exists()
+
+
+def test_pinned_run_context_makes_generation_reproducible(mock_prompt_load, tmp_path):
+    """Two runs with the same pinned timestamp write byte-identical files."""
+    context = RunContext.create("2025-01-02T03:04:05Z")
+    runs = []
+    for run in ("first", "second"):
+        writer = SlashCommandWriter(
+            prompts_dir=mock_prompt_load,
+            agents=["claude-code", "gemini-cli", "kiro-cli"],
+            base_path=tmp_path / run,
+            overwrite_action="overwrite",
+            run_context=context,
+        )
+        result = writer.generate()
+        runs.append(
+            {
+                Path(info["path"]).relative_to(tmp_path / run): Path(info["path"]).read_bytes()
+                for info in result["files"]
+            }
+        )
+
+    assert runs[0] == runs[1]
+    assert b"2025-01-02T03:04:05+00:00" in runs[0][Path(".claude/commands/test-prompt.md")]
+
+
+def test_write_chunks_replaces_file_contents(tmp_path):
+    path = tmp_path / "command.md"
+    path.write_text("previous, longer content\n")
+
+    write_chunks(path, [b"head\n", b"", "b\xc3\xb6dy\n".encode("latin-1")])
+
+    assert path.read_bytes() == "head\nb\xc3\xb6dy\n".encode("latin-1")
+
+
+def test_write_chunks_resumes_short_writes(tmp_path, monkeypatch):
+    real_writev = os.writev
+
+    def short_writev(fd, buffers):
+        # Write at most three bytes per call
+        return real_writev(fd, [bytes(buffers[0][:3])])
+
+    monkeypatch.setattr(os, "writev", short_writev)
+    path = tmp_path / "command.md"
+
+    write_chunks(path, [b"frontmatter\n", b"body\n", b"x"])
+
+    assert path.read_bytes() == b"frontmatter\nbody\nx"
+
+
+def test_write_chunks_without_writev(tmp_path, monkeypatch):
+    monkeypatch.delattr(os, "writev", raising=False)
+    path = tmp_path / "command.md"
+
+    write_chunks(path, [b"a\n", b"b\n"])
+
+    assert path.read_bytes() == b"a\nb\n"
+
+
+def test_write_chunks_keeps_old_file_when_interrupted(tmp_path, monkeypatch):
+    path = tmp_path / "command.md"
+    path.write_bytes(b"old\n")
+
+    def interrupted(*args):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(os, "writev", interrupted, raising=False)
+    monkeypatch.setattr(os, "write", interrupted)
+
+    with pytest.raises(KeyboardInterrupt):
+        write_chunks(path, [b"new\n"])
+
+    assert path.read_bytes() == b"old\n"
+    assert list(tmp_path.iterdir()) == [path]
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="symlinks need privileges")
+def test_write_chunks_replaces_symlink_target(tmp_path):
+    target = tmp_path / "shared" / "command.md"
+    target.parent.mkdir()
+    target.write_bytes(b"old\n")
+    link = tmp_path / "command.md"
+    link.symlink_to(target)
+
+    write_chunks(link, [b"new\n"])
+
+    assert link.is_symlink()
+    assert target.read_bytes() == b"new\n"
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["command.md", "shared"]
+    assert list(target.parent.iterdir()) == [target]
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="symlinks need privileges")
+def test_writer_keeps_symlinked_command_files(tmp_path):
+    prompts_dir = tmp_path / "prompts"
+    prompts_dir.mkdir()
+    prompt = prompts_dir / "hi.md"
+    prompt.write_text("---\nname: hi\n---\nHello\n")
+    shared = tmp_path / "shared" / "hi.md"
+    shared.parent.mkdir()
+    shared.write_text("Edited elsewhere\n")
+    link = tmp_path / "out" / ".claude" / "commands" / "hi.md"
+    link.parent.mkdir(parents=True)
+    link.symlink_to(shared)
+
+    def generate() -> dict:
+        return SlashCommandWriter(
+            prompts_dir=prompts_dir,
+            agents=["claude-code"],
+            base_path=tmp_path / "out",
+            overwrite_action="overwrite",
+        ).generate()
+
+    generate()
+    assert link.is_symlink()
+    assert "Hello" in shared.read_text()
+
+    prompt.write_text("---\nname: hi\n---\nHello again\n")
+    result = generate()
+
+    assert result["files_written"] == 1
+    assert link.is_symlink()
+    assert "Hello again" in shared.read_text()
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="POSIX permission bits")
+def test_write_chunks_applies_mode(tmp_path):
+    path = tmp_path / "command.md"
+
+    stat = write_chunks(path, [b"x"], mode=0o640)
+
+    assert path.stat().st_mode & 0o777 == 0o640
+    assert stat.st_size == 1
+    assert stat.st_ino == path.stat().st_ino
+
+
+def test_write_chunks_fsyncs_file_and_directory(tmp_path, monkeypatch):
+    synced = []
+    monkeypatch.setattr(os, "fsync", lambda fd: synced.append(os.fstat(fd).st_ino))
+    path = tmp_path / "command.md"
+
+    write_chunks(path, [b"x"], fsync=True)
+
+    assert synced == [path.stat().st_ino, tmp_path.stat().st_ino]
+
+
+@pytest.mark.parametrize("durability", ["none", "file", "batch"])
+def test_writer_flushes_files_per_durability(mock_prompt_load, tmp_path, monkeypatch, durability):
+    synced = []
+    monkeypatch.setattr(os, "fsync", lambda fd: synced.append(os.fstat(fd).st_ino))
+    writer = SlashCommandWriter(
+        prompts_dir=mock_prompt_load,
+        agents=["claude-code", "gemini-cli"],
+        base_path=tmp_path,
+        durability=durability,
+    )
+
+    result = writer.generate()
+
+    files = {Path(info["path"]).stat().st_ino for info in result["files"]}
+    directories = {Path(info["path"]).parent.stat().st_ino for info in result["files"]}
+    if durability == "none":
+        assert synced == []
+    else:
+        # Every file is flushed, and its directory after the rename
+        assert set(synced) == files | directories
+    if durability == "batch":
+        assert len(synced) == len(files) + len(directories)
+        assert set(synced[: len(files)]) == files
+
+
+def test_writer_keeps_permissions_of_replaced_files(mock_prompt_load, tmp_path):
+    if sys.platform == "win32":
+        pytest.skip("POSIX permission bits")
+    output = tmp_path / ".claude" / "commands" / "test-prompt.md"
+    output.parent.mkdir(parents=True)
+    output.write_text("local\n")
+    output.chmod(0o600)
+
+    SlashCommandWriter(
+        prompts_dir=mock_prompt_load,
+        agents=["claude-code"],
+        base_path=tmp_path,
+        overwrite_action="overwrite",
+    ).generate()
+
+    assert output.stat().st_mode & 0o777 == 0o600
+    assert "test-prompt" in output.read_text()
+
+
+def test_writer_rejects_unknown_durability(tmp_path):
+    with pytest.raises(ValueError, match="durability"):
+        SlashCommandWriter(prompts_dir=tmp_path, durability="always")
+
+
+def _regenerate(prompts_dir: Path, tmp_path: Path, timestamp: str, dry_run: bool = False):
+    return SlashCommandWriter(
+        prompts_dir=prompts_dir,
+        agents=["claude-code", "gemini-cli", "kiro-cli", "kiro-ide"],
+        dry_run=dry_run,
+        base_path=tmp_path,
+        overwrite_action="backup",
+        run_context=RunContext.create(timestamp),
+    ).generate()
+
+
+def test_writer_leaves_files_alone_when_only_the_timestamp_changes(mock_prompt_load, tmp_path):
+    first = _regenerate(mock_prompt_load, tmp_path, "2025-01-02T03:04:05Z")
+    before = {info["path"]: Path(info["path"]).read_bytes() for info in first["files"]}
+
+    second = _regenerate(mock_prompt_load, tmp_path, "2025-02-03T04:05:06.123456Z")
+
+    assert second["files_written"] == 0
+    assert second["files_unchanged"] == 4
+    assert all(info["unchanged"] for info in second["files"])
+    assert second["backups_created"] == []
+    assert {path: Path(path).read_bytes() for path in before} == before
+    assert list(tmp_path.rglob("*.bak")) == []
+
+
+def test_writer_rewrites_and_backs_up_changed_files(mock_prompt_load, tmp_path):
+    _regenerate(mock_prompt_load, tmp_path, "0")
+    prompt_file = mock_prompt_load / "test-prompt.md"
+    prompt_file.write_text(prompt_file.read_text() + "\nNew instructions.\n")
+
+    result = _regenerate(mock_prompt_load, tmp_path, "0")
+
+    assert result["files_written"] == 4
+    assert result["files_unchanged"] == 0
+    assert len(result["backups_created"]) == 4
+    claude_file = tmp_path / ".claude" / "commands" / "test-prompt.md"
+    assert "New instructions." in claude_file.read_text()
+
+
+def test_writer_dry_run_reports_unchanged_files(mock_prompt_load, tmp_path):
+    _regenerate(mock_prompt_load, tmp_path, "0")
+
+    result = _regenerate(mock_prompt_load, tmp_path, "86400", dry_run=True)
+
+    assert result["files_unchanged"] == 4
+    assert result["backups_pending"] == []
+
+
+@pytest.mark.parametrize(
+    ("existing", "new", "same"),
+    [
+        (
+            b"---\nmeta:\n  updated_at: '2025-01-02T03:04:05+00:00'\n---\n\nBody\n",
+            b"---\nmeta:\n  updated_at: '2025-02-03T04:05:06.123456+00:00'\n---\n\nBody\n",
+            True,
+        ),
+        (
+            b'prompt = "Body"\n\n[meta]\nupdated_at = "2025-01-02T03:04:05+00:00"\n',
+            b'prompt = "Body"\n\n[meta]\nupdated_at = "2025-02-03T04:05:06+00:00"\n',
+            True,
+        ),
+        (
+            b"Body\n\n<!-- slash-command-manager: source: p | version: 1 | updated: 2025-01-02 -->\n",
+            b"Body\n\n<!-- slash-command-manager: source: p | version: 1 | updated: 2025-02-03 -->\n",
+            True,
+        ),
+        (
+            b"Body\n\n<!-- slash-command-manager: source: p | updated: 2025-01-02 | repo: o/r -->\n",
+            b"Body\n\n<!-- slash-command-manager: source: p | updated: 2025-02-03 | repo: o/r -->\n",
+            True,
+        ),
+        (
+            b"---\nmeta:\n  updated_at: '2025-01-02T03:04:05+00:00'\n---\n\nBody\n",
+            b"---\nmeta:\n  updated_at: '2025-01-02T03:04:05+00:00'\n---\n\nNew body\n",
+            False,
+        ),
+        (
+            b"Body\n\n<!-- slash-command-manager: source: p | version: 1 | updated: 2025-01-02 -->\n",
+            b"Body\n\n<!-- slash-command-manager: source: p | version: 2 | updated: 2025-01-02 -->\n",
+            False,
+        ),
+        (b'updated_at = "soon"\n', b'updated_at = "later"\n', False),
+        # Timestamps in the prompt body are content
+        (
+            b"---\nmeta:\n  updated_at: '2025-01-02'\n---\n\nupdated_at = \"2024-01-01\"\n",
+            b"---\nmeta:\n  updated_at: '2025-01-02'\n---\n\nupdated_at = \"2025-06-30\"\n",
+            False,
+        ),
+        (
+            b"---\nmeta:\n  updated_at: '2025-01-02'\n---\n\n  updated_at: '2024-01-01'\n",
+            b"---\nmeta:\n  updated_at: '2025-01-02'\n---\n\n  updated_at: '2025-06-30'\n",
+            False,
+        ),
+        (
+            b'prompt = """\nupdated_at = "2024-01-01"\n"""\n\n[meta]\nupdated_at = "2025-01-02"\n',
+            b'prompt = """\nupdated_at = "2025-06-30"\n"""\n\n[meta]\nupdated_at = "2025-01-02"\n',
+            False,
+        ),
+        (
+            b"| updated: 2024-01-01 |\n\n<!-- slash-command-manager: updated: 2025-01-02 -->\n",
+            b"| updated: 2025-06-30 |\n\n<!-- slash-command-manager: updated: 2025-01-02 -->\n",
+            False,
+        ),
+    ],
+)
+def test_same_generated_content_ignores_only_timestamps(existing, new, same):
+    assert same_generated_content(existing, new) is same
+
+
+def test_writer_rewrites_files_whose_body_timestamp_changed(tmp_path):
+    prompts_dir = tmp_path / "prompts"
+    prompts_dir.mkdir()
+    prompt = prompts_dir / "p.md"
+
+    def generate(date: str) -> dict:
+        prompt.write_text(f'---\nname: p\n---\nupdated_at = "{date}"\n')
+        return SlashCommandWriter(
+            prompts_dir=prompts_dir,
+            agents=["claude-code", "gemini-cli", "kiro-cli"],
+            base_path=tmp_path / "out",
+            overwrite_action="overwrite",
+            run_context=RunContext.create("0"),
+        ).generate()
+
+    generate("2024-01-01")
+    result = generate("2025-06-30")
+
+    assert result["files_unchanged"] == 0
+    assert result["files_written"] == 3
+    assert '"2025-06-30"' in (tmp_path / "out" / ".claude" / "commands" / "p.md").read_text()
+
+
+def _many_prompts(tmp_path: Path, count: int = 12) -> Path:
+    prompts_dir = tmp_path / "many-prompts"
+    prompts_dir.mkdir()
+    for index in range(count):
+        (prompts_dir / f"p{index:02d}.md").write_text(
+            f"---\nname: p{index:02d}\ndescription: Prompt {index}\n---\nBody {index}\n"
+        )
+    return prompts_dir
+
+
+def _parallel_writer(prompts_dir: Path, base_path: Path, max_workers: int | None, **kwargs):
+    return SlashCommandWriter(
+        prompts_dir=prompts_dir,
+        agents=["claude-code", "gemini-cli", "kiro-cli"],
+        base_path=base_path,
+        overwrite_action="backup",
+        run_context=RunContext.create("0"),
+        max_workers=max_workers,
+        **kwargs,
+    )
+
+
+def _relative(paths: list[str], base_path: Path) -> list[str]:
+    return [Path(path).relative_to(base_path).as_posix() for path in paths]
+
+
+def test_parallel_writes_match_sequential_writes(tmp_path, monkeypatch):
+    prompts_dir = _many_prompts(tmp_path)
+    real_write_chunks = write_chunks
+
+    def slow_first_writes(path, chunks, **kwargs):
+        # Finish writes out of order: earlier prompts take longer
+        time.sleep(0.0005 * (20 - int(path.stem[1:])))
+        return real_write_chunks(path, chunks, **kwargs)
+
+    monkeypatch.setattr(sys.modules["slash_commands.writer"], "write_chunks", slow_first_writes)
+
+    runs = {}
+    for workers in (None, 4):
+        base_path = tmp_path / f"out-{workers}"
+        _parallel_writer(prompts_dir, base_path, workers).generate()
+        for command_file in base_path.rglob("*"):
+            if command_file.suffix in (".md", ".toml"):
+                command_file.write_text(command_file.read_text() + "Local edit\n")
+        result = _parallel_writer(prompts_dir, base_path, workers).generate()
+        runs[workers] = {
+            "files": [
+                {**info, "path": _relative([info["path"]], base_path)[0]}
+                for info in result["files"]
+            ],
+            "backups": [
+                path.split(".md.")[0].split(".toml.")[0]
+                for path in _relative(result["backups_created"], base_path)
+            ],
+            "contents": {
+                path.relative_to(base_path).as_posix(): path.read_bytes()
+                for path in base_path.rglob("*")
+                if path.suffix in (".md", ".toml")
+            },
+        }
+
+    assert runs[4] == runs[None]
+    assert len(runs[4]["backups"]) == 36
+
+
+def test_parallel_writes_raise_first_failure_in_order(tmp_path, monkeypatch):
+    prompts_dir = _many_prompts(tmp_path)
+    real_write_chunks = write_chunks
+
+    def failing(path, chunks, **kwargs):
+        if path.stem == "p03":
+            time.sleep(0.05)
+            raise OSError(f"cannot write {path.stem}")
+        if path.stem == "p05":
+            raise OSError(f"cannot write {path.stem}")
+        return real_write_chunks(path, chunks, **kwargs)
+
+    monkeypatch.setattr(sys.modules["slash_commands.writer"], "write_chunks", failing)
+    writer = _parallel_writer(prompts_dir, tmp_path / "out", 8)
+    written = []
+
+    with pytest.raises(OSError, match="cannot write p03"):
+        for info in writer.iter_generate():
+            written.append(Path(info["path"]).stem)
+
+    assert written == [f"p{index:02d}" for index in range(3) for _ in range(3)]
+
+
+def test_parallel_writes_to_the_same_path_keep_the_last(tmp_path):
+    prompts_dir = tmp_path / "prompts"
+    prompts_dir.mkdir()
+    # The first and last names sanitize to the same file name
+    for index, name in enumerate(["same name", "same/name", "same-name"]):
+        (prompts_dir / f"{index}.md").write_text(f"---\nname: {name}\n---\nBody {index}\n")
+
+    SlashCommandWriter(
+        prompts_dir=prompts_dir,
+        agents=["claude-code"],
+        base_path=tmp_path,
+        overwrite_action="overwrite",
+        max_workers=4,
+    ).generate()
+
+    commands = list((tmp_path / ".claude" / "commands").iterdir())
+    assert [path.name for path in commands] == ["name.md", "same-name.md"]
+    assert "Body 2" in (tmp_path / ".claude" / "commands" / "same-name.md").read_text()
+
+
+def test_writer_rejects_invalid_max_workers(tmp_path):
+    with pytest.raises(ValueError, match="max_workers"):
+        SlashCommandWriter(prompts_dir=tmp_path, max_workers=0)
+
+
+def _count_syscalls(monkeypatch, root: Path) -> Counter[str]:
+    """Count file system calls on paths under ``root``."""
+    counts: Counter[str] = Counter()
+    for name in ("stat", "lstat", "mkdir", "scandir"):
+        real = getattr(os, name)
+
+        def shim(path, *args, _name=name, _real=real, **kwargs):
+            if str(path).startswith(str(root)):
+                counts[_name] += 1
+            return _real(path, *args, **kwargs)
+
+        monkeypatch.setattr(os, name, shim)
+    return counts
+
+
+def test_writer_lists_each_command_directory_once(tmp_path, monkeypatch):
+    prompts_dir = _many_prompts(tmp_path)
+    base_path = tmp_path / "out"
+    base_path.mkdir()
+    counts = _count_syscalls(monkeypatch, base_path)
+
+    result = _parallel_writer(prompts_dir, base_path, None).generate()
+
+    # 36 files in 3 new directories: no per-file existence check or mkdir; creating
+    # a directory and its missing parent takes pathlib up to three calls
+    assert len(result["files"]) == 36
+    assert counts["scandir"] == 3
+    assert counts["stat"] + counts["lstat"] == 0
+    assert counts["mkdir"] <= 3 * 3
+
+
+def test_writer_stats_only_existing_files_once(tmp_path, monkeypatch):
+    prompts_dir = _many_prompts(tmp_path)
+    base_path = tmp_path / "out"
+    _parallel_writer(prompts_dir, base_path, None).generate()
+    counts = _count_syscalls(monkeypatch, base_path)
+
+    with patch.object(
+        SlashCommandWriter, "_prompt_for_all_existing_files", return_value="overwrite"
+    ) as prompt:
+        writer = _parallel_writer(prompts_dir, base_path, None)
+        writer.overwrite_action = None
+        result = writer.generate()
+
+    # The upfront check answers from the listing; each file is stat'ed once, for
+    # the unchanged check, and as nothing changes nothing is asked
+    prompt.assert_not_called()
+    assert result["files_unchanged"] == 36
+    assert counts == {"scandir": 3, "stat": 36}
+
+
+def test_directory_listing_keeps_files_added_while_creating_the_directory(tmp_path, monkeypatch):
+    listing = _DirectoryListing()
+    directory = tmp_path / "commands"
+    created = threading.Event()
+    real_mkdir = Path.mkdir
+
+    def slow_mkdir(self, *args, **kwargs):
+        real_mkdir(self, *args, **kwargs)
+        created.set()
+        time.sleep(0.05)
+
+    monkeypatch.setattr(Path, "mkdir", slow_mkdir)
+    creator = threading.Thread(target=listing.ensure_directory, args=(directory,))
+    creator.start()
+    created.wait()
+    listing.add(directory / "a.md")
+    creator.join()
+
+    assert listing.exists(directory / "a.md")
+
+
+def test_writer_sees_files_written_earlier_in_the_run(tmp_path):
+    prompts_dir = tmp_path / "prompts"
+    prompts_dir.mkdir()
+    # Both names sanitize to the same file name
+    for index, name in enumerate(["same name", "same-name"]):
+        (prompts_dir / f"{index}.md").write_text(f"---\nname: {name}\n---\nBody {index}\n")
+
+    result = SlashCommandWriter(
+        prompts_dir=prompts_dir,
+        agents=["claude-code"],
+        base_path=tmp_path,
+        overwrite_action="backup",
+    ).generate()
+
+    assert len(result["backups_created"]) == 1
+    assert "Body 1" in (tmp_path / ".claude" / "commands" / "same-name.md").read_text()
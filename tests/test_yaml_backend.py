@@ -0,0 +1,141 @@
+"""Parity tests for the libyaml-backed YAML helpers."""
+
+from __future__ import annotations
+
+import importlib
+import random
+from datetime import date
+
+import pytest
+import yaml
+
+from mcp_server import yaml_backend
+from mcp_server.prompt_utils import parse_frontmatter
+
+_ALPHABETS = {
+    "ascii": "abcxyz ABC 0123 -_:#'\"{}[],&*!|>%@`?",
+    "bmp": "abc äöü 漢字 ñ — “quotes” ",
+    "escapes": "ab \n\t\r\x00\x07\x1b\x85 ﻿ ",
+    "astral": "ab 😀🚀 𝒳 ",
+}
+
+
+def _random_string(rng: random.Random, alphabet: str) -> str:
+    return "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 120)))
+
+
+def _random_scalar(rng: random.Random, alphabet: str):
+    return rng.choice(
+        [
+            lambda: _random_string(rng, alphabet),
+            lambda: rng.randint(-1000, 1000),
+            lambda: rng.random() * 1000,
+            lambda: rng.choice([True, False, None]),
+            lambda: date(2020, 1, rng.randint(1, 28)),
+            lambda: rng.choice(["yes", "no", "~", "null", "1.0", "0x1F", "-", "---", ""]),
+        ]
+    )()
+
+
+def _random_frontmatter(rng: random.Random, alphabet: str) -> dict:
+    return {
+        "name": _random_string(rng, alphabet),
+        "description": _random_string(rng, alphabet),
+        "tags": [_random_string(rng, alphabet) for _ in range(rng.randint(0, 4))],
+        "arguments": [
+            {"name": f"arg{i}", "description": _random_scalar(rng, alphabet), "required": False}
+            for i in range(rng.randint(0, 3))
+        ],
+        "meta": {_random_string(rng, alphabet) or "key": _random_scalar(rng, alphabet)},
+    }
+
+
+@pytest.mark.parametrize("alphabet", sorted(_ALPHABETS))
+def test_safe_dump_matches_pure_python_dumper(alphabet):
+    rng = random.Random(f"dump-{alphabet}")
+    for _ in range(300):
+        data = _random_frontmatter(rng, _ALPHABETS[alphabet])
+        for kwargs in ({}, {"allow_unicode": True, "sort_keys": False}):
+            expected = yaml.dump(data, Dumper=yaml.SafeDumper, **kwargs)
+            assert yaml_backend.safe_dump(data, **kwargs) == expected
+
+
+def _load_outcome(document, loader):
+    try:
+        return loader(document)
+    except yaml.YAMLError as e:
+        return type(e)
+
+
+@pytest.mark.parametrize("alphabet", sorted(_ALPHABETS))
+def test_safe_load_matches_pure_python_loader(alphabet):
+    rng = random.Random(f"load-{alphabet}")
+    for _ in range(300):
+        document = yaml.dump(_random_frontmatter(rng, _ALPHABETS[alphabet]), allow_unicode=True)
+        assert yaml_backend.safe_load(document) == yaml.load(document, Loader=yaml.SafeLoader)
+
+
+@pytest.mark.parametrize(
+    "document",
+    [
+        "m:\tx",
+        "a: [1,\t2]",
+        "k: v\t# c",
+        "k: v\t",
+        "- a\t",
+        "a:\t\n  b: 1",
+        "k: 'a\tb'",
+        'k: "a\\tb"',
+        "k: |\n  \tindented body\n",
+        "k:\n\t- x",
+    ],
+)
+def test_safe_load_matches_pure_python_loader_with_tabs(document):
+    expected = _load_outcome(document, lambda doc: yaml.load(doc, Loader=yaml.SafeLoader))
+
+    assert _load_outcome(document, yaml_backend.safe_load) == expected
+    assert _load_outcome(document.encode(), yaml_backend.safe_load) == expected
+
+
+def test_tab_separated_frontmatter_parses_like_the_pure_python_loader():
+    frontmatter, _body = parse_frontmatter("---\nname: tabbed\ndescription:\tTabbed\n---\nBody")
+
+    assert frontmatter == {}
+
+
+@pytest.mark.skipif(not yaml_backend.HAS_LIBYAML, reason="PyYAML built without libyaml")
+def test_plain_documents_use_libyaml():
+    assert yaml_backend._emits_identically({"name": "plain", "tags": ["a", "漢字"], "n": 1})
+    assert not yaml_backend._emits_identically({"tags": ["漢字"]}, limit="\x7f")
+    assert not yaml_backend._emits_identically({"description": "two\nlines"})
+    assert not yaml_backend._emits_identically({"description": "emoji 😀"})
+
+
+def test_frontmatter_errors_are_yaml_errors():
+    frontmatter, body = parse_frontmatter("---\nname: [unclosed\n---\nBody")
+
+    assert frontmatter == {}
+    assert body == "Body"
+    with pytest.raises(yaml_backend.YAMLError):
+        yaml_backend.safe_load("name: [unclosed")
+
+
+@pytest.fixture
+def pure_python_backend(monkeypatch):
+    """Reload the backend as if PyYAML had been built without libyaml."""
+    monkeypatch.delattr(yaml, "CSafeLoader")
+    monkeypatch.delattr(yaml, "CSafeDumper")
+    try:
+        yield importlib.reload(yaml_backend)
+    finally:
+        monkeypatch.undo()
+        importlib.reload(yaml_backend)
+
+
+def test_falls_back_to_pure_python_classes(pure_python_backend):
+    assert pure_python_backend.HAS_LIBYAML is False
+    assert pure_python_backend.SafeLoader is yaml.SafeLoader
+    assert pure_python_backend.SafeDumper is yaml.SafeDumper
+
+    data = {"name": "fallback", "description": "emoji 😀\nand lines"}
+    assert pure_python_backend.safe_load(pure_python_backend.safe_dump(data)) == data